@@ -14,3 +14,26 @@ class AbstractJobSearchAPI(ABC):
             Dict[str, Any]: Данные о вакансиях в формате, предоставляемом конкретным API.
         """
         pass
+
+    def get_vacancy(self, vacancy_id: str) -> Dict[str, Any]:
+        """
+        Метод для получения полного описания одной вакансии.
+        Площадки, не поддерживающие запрос описания, его не переопределяют.
+
+        Parameters:
+            vacancy_id (str): Идентификатор вакансии.
+
+        Returns:
+            Dict[str, Any]: Данные вакансии в формате, предоставляемом конкретным API.
+        """
+        raise NotImplementedError(f'{type(self).__name__} не поддерживает запрос описания вакансии.')
+
+    def get_regions(self) -> Any:
+        """
+        Метод для получения справочника регионов и городов площадки.
+        Площадки без справочника его не переопределяют.
+
+        Returns:
+            Any: Справочник в формате, предоставляемом конкретным API.
+        """
+        raise NotImplementedError(f'{type(self).__name__} не поддерживает запрос справочника регионов.')
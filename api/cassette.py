@@ -0,0 +1,300 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.abs_api import AbstractJobSearchAPI
+from api.platforms import get_platform
+from metrics.instrumentation import metrics
+from storage.locking import atomic_write
+
+CASSETTE_VERSION: int = 1
+
+
+class CassetteMiss(LookupError):
+    """
+    В кассете нет записанного ответа на запрос.
+    """
+
+
+def request_key(platform: str, method: str, argument: Any = None) -> str:
+    """
+    Возвращает ключ запроса к API в кассете: площадка, метод клиента и его аргумент
+    (параметры поиска с отсортированными ключами или идентификатор вакансии).
+
+    Parameters:
+        platform (str): Короткое имя площадки.
+        method (str): Метод клиента ('get_data', 'get_vacancy', 'get_regions').
+        argument (Any): Аргумент метода.
+
+    Returns:
+        str: Ключ запроса.
+    """
+    return json.dumps([platform, method, argument], ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+class Cassette:
+    """
+    Записанный обмен с API площадок.
+
+    Кассета хранит для каждого запроса последовательность ответов (повторный одинаковый запрос
+    получает следующий записанный ответ, а после конца последовательности — последний) вместе
+    с длительностью запросов. Тела ответов хранятся один раз по своему хэшу, поэтому одинаковые
+    ответы (например, повторно загруженный справочник) не дублируются. Файл — JSON, сжатый gzip,
+    и записывается атомарно.
+
+    Attributes:
+        filename (str): Имя файла кассеты.
+        interactions (Dict[str, List[Tuple[str, float]]]): Ключ запроса -> (хэш ответа, длительность, с).
+        bodies (Dict[str, Any]): Хэш ответа -> ответ.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.interactions: Dict[str, List[Tuple[str, float]]] = {}
+        self.bodies: Dict[str, Any] = {}
+        self._replayed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, filename: str) -> 'Cassette':
+        """
+        Загружает кассету из файла.
+
+        Parameters:
+            filename (str): Имя файла кассеты.
+
+        Returns:
+            Cassette: Кассета.
+        """
+        cassette = cls(filename)
+        with gzip.open(filename, 'rt', encoding='utf-8') as file:
+            data = json.load(file)
+        if data.get('version') != CASSETTE_VERSION:
+            raise ValueError(f"Неподдерживаемая версия кассеты {filename}: {data.get('version')}.")
+        cassette.interactions = {key: [tuple(record) for record in records]
+                                 for key, records in data['interactions'].items()}
+        cassette.bodies = data['bodies']
+        return cassette
+
+    def save(self) -> None:
+        """
+        Сохраняет кассету в файл.
+        """
+        with self._lock:
+            data = {'version': CASSETTE_VERSION, 'interactions': self.interactions, 'bodies': self.bodies}
+            payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with atomic_write(self.filename, 'wb') as file:
+            file.write(gzip.compress(payload, 9))
+
+    def record(self, key: str, body: Any, duration: float) -> None:
+        """
+        Добавляет ответ на запрос.
+
+        Parameters:
+            key (str): Ключ запроса.
+            body (Any): Ответ API.
+            duration (float): Длительность запроса в секундах.
+        """
+        digest = hashlib.blake2b(json.dumps(body, ensure_ascii=False, sort_keys=True).encode('utf-8'),
+                                 digest_size=16).hexdigest()
+        with self._lock:
+            self.bodies.setdefault(digest, body)
+            self.interactions.setdefault(key, []).append((digest, round(duration, 4)))
+
+    def replay(self, key: str) -> Tuple[Any, float]:
+        """
+        Возвращает следующий записанный ответ на запрос.
+
+        Parameters:
+            key (str): Ключ запроса.
+
+        Returns:
+            Tuple[Any, float]: Ответ API и записанная длительность запроса в секундах.
+        """
+        with self._lock:
+            records = self.interactions.get(key)
+            if not records:
+                raise CassetteMiss(f"В кассете {self.filename} нет ответа на запрос {key}.")
+            number = self._replayed.get(key, 0)
+            self._replayed[key] = number + 1
+            digest, duration = records[min(number, len(records) - 1)]
+        return self.bodies[digest], duration
+
+
+class RecordingJobSearchAPI(AbstractJobSearchAPI):
+    def __init__(self, client: AbstractJobSearchAPI, platform: str, cassette: Cassette):
+        """
+        Инициализирует клиент, который передает запросы настоящему клиенту API
+        и записывает их параметры и ответы в кассету.
+
+        Parameters:
+            client (AbstractJobSearchAPI): Клиент API площадки.
+            platform (str): Короткое имя площадки.
+            cassette (Cassette): Кассета для записи.
+        """
+        self.client = client
+        self.platform = platform
+        self.cassette = cassette
+
+    def _call(self, method: str, argument: Any = None, *args: Any) -> Any:
+        started = time.perf_counter()
+        body = getattr(self.client, method)(*args)
+        self.cassette.record(request_key(self.platform, method, argument), body, time.perf_counter() - started)
+        metrics.increment('cassette.recorded', platform=self.platform)
+        return body
+
+    def get_data(self, param: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Получает данные о вакансиях от клиента API и записывает ответ.
+
+        Parameters:
+            param (Optional[Dict[str, Any]]): Параметры запроса к API.
+
+        Returns:
+            Dict[str, Any]: Данные о вакансиях в формате, предоставляемом API.
+        """
+        return self._call('get_data', param or {}, param)
+
+    def get_vacancy(self, vacancy_id: str) -> Dict[str, Any]:
+        """
+        Получает полное описание вакансии от клиента API и записывает ответ.
+
+        Parameters:
+            vacancy_id (str): Идентификатор вакансии.
+
+        Returns:
+            Dict[str, Any]: Данные вакансии в формате, предоставляемом API.
+        """
+        return self._call('get_vacancy', str(vacancy_id), vacancy_id)
+
+    def get_regions(self) -> Any:
+        """
+        Получает справочник регионов от клиента API и записывает ответ.
+
+        Returns:
+            Any: Справочник в формате, предоставляемом API.
+        """
+        return self._call('get_regions')
+
+
+class ReplayJobSearchAPI(AbstractJobSearchAPI):
+    def __init__(self, cassette: Cassette, platform: str, latency: float = 0.0, latency_scale: float = 0.0):
+        """
+        Инициализирует клиент, который отвечает на запросы из кассеты без обращения к сети.
+        Задержка ответа равна latency плюс записанная длительность запроса, умноженная на latency_scale.
+
+        Parameters:
+            cassette (Cassette): Кассета с записанными ответами.
+            platform (str): Короткое имя площадки.
+            latency (float): Постоянная задержка ответа в секундах.
+            latency_scale (float): Множитель записанной длительности запроса (1.0 — как при записи).
+        """
+        self.cassette = cassette
+        self.platform = platform
+        self.latency = latency
+        self.latency_scale = latency_scale
+
+    def _replay(self, method: str, argument: Any = None) -> Any:
+        try:
+            body, duration = self.cassette.replay(request_key(self.platform, method, argument))
+        except CassetteMiss:
+            metrics.increment('cassette.misses', platform=self.platform)
+            raise
+        delay = self.latency + self.latency_scale * duration
+        with metrics.timer('api.request', platform=self.platform, endpoint='replay'):
+            if delay > 0:
+                time.sleep(delay)
+        metrics.increment('cassette.hits', platform=self.platform)
+        return body
+
+    def get_data(self, param: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Возвращает записанные данные о вакансиях.
+
+        Parameters:
+            param (Optional[Dict[str, Any]]): Параметры запроса к API.
+
+        Returns:
+            Dict[str, Any]: Данные о вакансиях в формате, предоставляемом API.
+        """
+        return self._replay('get_data', param or {})
+
+    def get_vacancy(self, vacancy_id: str) -> Dict[str, Any]:
+        """
+        Возвращает записанное полное описание вакансии.
+
+        Parameters:
+            vacancy_id (str): Идентификатор вакансии.
+
+        Returns:
+            Dict[str, Any]: Данные вакансии в формате, предоставляемом API.
+        """
+        return self._replay('get_vacancy', str(vacancy_id))
+
+    def get_regions(self) -> Any:
+        """
+        Возвращает записанный справочник регионов.
+
+        Returns:
+            Any: Справочник в формате, предоставляемом API.
+        """
+        return self._replay('get_regions')
+
+
+def record_api_list(api_list: List[dict], cassette: Cassette) -> List[dict]:
+    """
+    Оборачивает клиенты списка api записью в кассету.
+
+    Parameters:
+        api_list (List[dict]): Список api приложения.
+        cassette (Cassette): Кассета для записи.
+
+    Returns:
+        List[dict]: Список api с записывающими клиентами.
+    """
+    return [{**api, 'api_class': RecordingJobSearchAPI(api['api_class'], get_platform(api).slug, cassette)}
+            for api in api_list]
+
+
+def replay_api_list(api_list: List[dict], cassette: Cassette, latency: float = 0.0,
+                    latency_scale: float = 0.0) -> List[dict]:
+    """
+    Заменяет клиенты списка api воспроизведением кассеты.
+
+    Parameters:
+        api_list (List[dict]): Список api приложения.
+        cassette (Cassette): Кассета с записанными ответами.
+        latency (float): Постоянная задержка ответа в секундах.
+        latency_scale (float): Множитель записанной длительности запроса.
+
+    Returns:
+        List[dict]: Список api с воспроизводящими клиентами.
+    """
+    return [{**api, 'api_class': ReplayJobSearchAPI(cassette, get_platform(api).slug, latency, latency_scale)}
+            for api in api_list]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Командная строка кассет: сведения о записанных запросах.
+    """
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Кассеты записанного обмена с API площадок.')
+    arg_parser.add_argument('cassette')
+    args = arg_parser.parse_args(argv)
+
+    cassette = Cassette.load(args.cassette)
+    requests: Dict[str, int] = {}
+    for key, records in cassette.interactions.items():
+        platform, method, _ = json.loads(key)
+        requests[f'{platform}.{method}'] = requests.get(f'{platform}.{method}', 0) + len(records)
+    print(json.dumps({'requests': requests, 'unique_requests': len(cassette.interactions),
+                      'bodies': len(cassette.bodies)}, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from metrics.instrumentation import metrics
+
+# Попытка запроса получает оставшееся до крайнего срока время (None — без срока)
+Attempt = Callable[[Optional[float]], Any]
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Площадка не ответила до крайнего срока запроса.
+    """
+
+
+def set_deadline(slug: str, endpoint: str, deadline: Optional[float] = None,
+                 hedge_after: Optional[float] = None) -> None:
+    """
+    Меняет крайний срок и задержку дублирующего запроса для вида запросов площадки.
+
+    Parameters:
+        slug (str): Короткое имя площадки ('hh', 'superjob').
+        endpoint (str): Вид запроса ('search', 'detail', 'reference').
+        deadline (Optional[float]): Крайний срок запроса в секундах (None — не менять, 0 — без срока).
+        hedge_after (Optional[float]): Через сколько секунд без ответа отправляется дублирующий запрос
+            (None — не менять, 0 — не дублировать).
+    """
+    from api.platforms import PLATFORMS
+
+    spec = PLATFORMS[slug]
+    if deadline is not None:
+        spec.deadlines[endpoint] = deadline
+    if hedge_after is not None:
+        spec.hedge_after[endpoint] = hedge_after
+
+
+def _start(attempt: Attempt, timeout: Optional[float]) -> Future:
+    """
+    Запускает попытку запроса в отдельном потоке-демоне. Опоздавшая попытка дорабатывает в фоне
+    и не задерживает ни ответ, ни завершение приложения.
+    """
+    future: Future = Future()
+
+    def run() -> None:
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(attempt(timeout))
+            except Exception as exc:
+                future.set_exception(exc)
+
+    threading.Thread(target=run, name='api-attempt', daemon=True).start()
+    return future
+
+
+def call_with_deadline(attempt: Attempt, deadline: Optional[float] = None, hedge_after: Optional[float] = None,
+                       platform: str = '', endpoint: str = 'search') -> Any:
+    """
+    Выполняет запрос с крайним сроком и дублированием (hedged request). Если за hedge_after секунд
+    ответа нет, отправляется второй такой же запрос, и используется ответ, пришедший первым.
+    Если первая попытка завершилась ошибкой раньше, дублирующий запрос отправляется сразу.
+    Запросы к API площадок — идемпотентные GET, поэтому дублирование безопасно.
+
+    Parameters:
+        attempt (Attempt): Попытка запроса; получает оставшееся до крайнего срока время.
+        deadline (Optional[float]): Крайний срок в секундах (None — без срока).
+        hedge_after (Optional[float]): Задержка дублирующего запроса в секундах (None — не дублировать).
+        platform (str): Короткое имя площадки для меток метрик.
+        endpoint (str): Вид запроса для меток метрик.
+
+    Returns:
+        Any: Результат первой успешной попытки.
+
+    Raises:
+        DeadlineExceeded: Ни одна попытка не завершилась успешно до крайнего срока.
+    """
+    if deadline is None and hedge_after is None:
+        return attempt(None)
+
+    started = time.monotonic()
+    expires = None if deadline is None else started + deadline
+
+    def remaining() -> Optional[float]:
+        return None if expires is None else max(0.0, expires - time.monotonic())
+
+    primary = _start(attempt, remaining())
+    pending = {primary}
+    hedge: Optional[Future] = None
+    error: Optional[BaseException] = None
+
+    while True:
+        timeout = remaining()
+        if hedge is None and hedge_after is not None:
+            until_hedge = max(0.0, started + hedge_after - time.monotonic()) if pending else 0.0
+            timeout = until_hedge if timeout is None else min(timeout, until_hedge)
+
+        if pending:
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        metrics.increment('api.hedge_won', platform=platform, endpoint=endpoint)
+                    return future.result()
+                error = future.exception()
+
+        if expires is not None and time.monotonic() >= expires:
+            break
+        if hedge is None and hedge_after is not None and (not pending or time.monotonic() >= started + hedge_after):
+            hedge = _start(attempt, remaining())
+            pending.add(hedge)
+            metrics.increment('api.hedged', platform=platform, endpoint=endpoint)
+        elif not pending:
+            break
+
+    if error is not None and not pending:
+        raise error
+    metrics.increment('api.deadline_exceeded', platform=platform, endpoint=endpoint)
+    raise DeadlineExceeded(f'Нет ответа за {deadline:g} с. ({platform}, {endpoint}).')
+
+
+def gather_with_deadline(calls: Dict[str, Callable[[], Any]],
+                         deadline: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Выполняет независимые запросы (например, поиск на нескольких площадках) одновременно и ждет их
+    не дольше deadline. Запросы, которые не успели или завершились ошибкой, не мешают остальным:
+    возвращаются частичные результаты и причины отсутствия недостающих.
+
+    Parameters:
+        calls (Dict[str, Callable[[], Any]]): Имя запроса -> функция запроса.
+        deadline (Optional[float]): Общий крайний срок в секундах (None — без срока).
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, str]]: Результаты успешных запросов и причины неудачи остальных.
+    """
+    futures = {name: _start(lambda _, call=call: call(), None) for name, call in calls.items()}
+    wait(futures.values(), timeout=deadline)
+
+    results: Dict[str, Any] = {}
+    failures: Dict[str, str] = {}
+    for name, future in futures.items():
+        if not future.done():
+            failures[name] = f'Нет ответа за {deadline:g} с.'
+            metrics.increment('api.deadline_exceeded', platform=name, endpoint='gather')
+        elif future.exception() is not None:
+            failures[name] = str(future.exception()) or type(future.exception()).__name__
+        else:
+            results[name] = future.result()
+    return results, failures
@@ -0,0 +1,165 @@
+import html
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from api.platforms import get_platform
+from metrics.instrumentation import metrics
+from storage.detail_cache import DetailCache
+
+TAG_PATTERN = re.compile(r'<[^>]+>')
+SPACE_PATTERN = re.compile(r'\s+')
+
+
+def html_to_text(value: Optional[str]) -> Optional[str]:
+    """
+    Превращает HTML-описание вакансии в простой текст.
+
+    Parameters:
+        value (Optional[str]): HTML-описание.
+
+    Returns:
+        Optional[str]: Текст описания.
+    """
+    if not value:
+        return value
+    return SPACE_PATTERN.sub(' ', html.unescape(TAG_PATTERN.sub(' ', value))).strip()
+
+
+def is_vacancy_body(body: Any) -> bool:
+    """
+    Проверяет, что ответ API — описание вакансии, а не ошибка ({"errors": ...} у Head Hunter,
+    {"error": ...} у Super Job).
+
+    Parameters:
+        body (Any): Ответ API.
+
+    Returns:
+        bool: Ответ содержит описание вакансии.
+    """
+    return isinstance(body, dict) and bool(body) and 'errors' not in body and 'error' not in body
+
+
+class VacancyEnricher:
+    """
+    Дополняет вакансии полным описанием, запрашивая его у API площадки.
+
+    Запросы к API выполняются параллельно в пуле потоков, но проходят через общий
+    ограничитель частоты запросов площадки. Ответы сохраняются в DetailCache по
+    идентификатору вакансии и времени ее публикации, поэтому повторный просмотр
+    не приводит к новому запросу.
+
+    Attributes:
+        cache (DetailCache): Кэш полных описаний.
+        max_workers (int): Количество параллельных запросов.
+    """
+
+    def __init__(self, cache: Optional[DetailCache] = None, max_workers: int = 8) -> None:
+        self.cache = cache or DetailCache()
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Возвращает пул потоков, создавая его при первом обращении.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='enrichment')
+        return self._executor
+
+    def fetch_details(self, vacancy: Dict, api: dict) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает полный ответ API по вакансии из кэша или запрашивает его.
+
+        Parameters:
+            vacancy (Dict): Вакансия в кратком формате.
+            api (dict): Площадка, с которой получена вакансия.
+
+        Returns:
+            Optional[Dict[str, Any]]: Ответ API или None, если у вакансии нет идентификатора.
+        """
+        vacancy_id = vacancy.get('id')
+        if vacancy_id is None:
+            return None
+
+        platform = get_platform(api).slug
+        body = self.cache.get(platform, vacancy_id, vacancy.get('published_at'))
+        if body is None:
+            with metrics.timer('enrichment.fetch', platform=platform):
+                body = api.get('api_class').get_vacancy(vacancy_id)
+            # В кэш попадают только описания вакансий, а не ответы с ошибкой
+            if is_vacancy_body(body):
+                self.cache.put(platform, vacancy_id, vacancy.get('published_at'), body)
+            else:
+                metrics.increment('enrichment.bad_responses', platform=platform)
+        return body
+
+    def enrich_vacancy(self, vacancy: Dict, api: dict, key: Optional[str] = None) -> Dict:
+        """
+        Возвращает копию вакансии с полным описанием ('full_description').
+        Если описание уже запрашивается в фоне (prefetch), ожидает этот запрос.
+        Ошибки запроса не прерывают работу: вакансия возвращается без полного описания.
+
+        Parameters:
+            vacancy (Dict): Вакансия в кратком формате.
+            api (dict): Площадка, с которой получена вакансия.
+            key (Optional[str]): Ключ вакансии в наборе ("vacancy N"), под которым она запрошена в фоне.
+
+        Returns:
+            Dict: Вакансия с полным описанием.
+        """
+        future = self._futures.pop(key, None) if key is not None else None
+        try:
+            body = future.result() if future is not None else self.fetch_details(vacancy, api)
+        except Exception:
+            metrics.increment('enrichment.errors', platform=get_platform(api).slug)
+            return vacancy
+
+        if not is_vacancy_body(body):
+            return vacancy
+
+        node: Any = body
+        for part in get_platform(api).detail_description:
+            node = node.get(part) if isinstance(node, dict) else None
+        return {**vacancy, 'full_description': html_to_text(node)}
+
+    def prefetch(self, vacancies: Dict[str, Dict], api: dict, top: int) -> None:
+        """
+        Запускает фоновую загрузку полных описаний первых top вакансий.
+
+        Parameters:
+            vacancies (Dict[str, Dict]): Вакансии в кратком формате.
+            api (dict): Площадка, с которой получены вакансии.
+            top (int): Количество вакансий с начала списка.
+        """
+        self._futures.clear()
+        for number, (key, vacancy) in enumerate(vacancies.items()):
+            if number >= top:
+                break
+            self._futures[key] = self.executor.submit(self.fetch_details, vacancy, api)
+
+    def enrich(self, vacancies: Dict[str, Dict], api: dict, top: int) -> Dict[str, Dict]:
+        """
+        Дополняет полным описанием первые top вакансий, загружая описания параллельно.
+
+        Parameters:
+            vacancies (Dict[str, Dict]): Вакансии в кратком формате.
+            api (dict): Площадка, с которой получены вакансии.
+            top (int): Количество вакансий с начала списка.
+
+        Returns:
+            Dict[str, Dict]: Вакансии, первые top из которых содержат полное описание.
+        """
+        self.prefetch(vacancies, api, top)
+        return {key: self.enrich_vacancy(vacancy, api, key) if key in self._futures else vacancy
+                for key, vacancy in vacancies.items()}
+
+    def close(self) -> None:
+        """
+        Останавливает пул потоков.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
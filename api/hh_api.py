@@ -1,10 +1,22 @@
-import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from api.abs_api import AbstractJobSearchAPI
+from api.platforms import PLATFORMS
+from api.transport import get_json
+
+HH_API_URL: str = 'https://api.hh.ru'
 
 
 class HHJobSearchAPI(AbstractJobSearchAPI):
+    def __init__(self, base_url: str = HH_API_URL):
+        """
+        Инициализирует объект HHJobSearchAPI.
+
+        Parameters:
+            base_url (str): Адрес API Head Hunter (например, адрес локального стаб-сервера).
+        """
+        self.base_url: str = base_url.rstrip('/')
+
     def get_data(self, param: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Получает данные о вакансиях с использованием API Head Hunter.
@@ -15,14 +27,34 @@ class HHJobSearchAPI(AbstractJobSearchAPI):
         Returns:
             Dict[str, Any]: Данные о вакансиях в формате, предоставляемом API.
         """
-        pages: int = 100
-        params: Dict[str, Any] = {'only_with_salary': 'true',
-                                  'per_page': pages,
-                                  'search_field': 'name'}
+        spec = PLATFORMS['hh']
+        params: Dict[str, Any] = dict(spec.default_params)
+        params[spec.page_size_param] = spec.page_size
 
         if param:
             params.update(param)
 
-        data: Dict[str, Any] = requests.get('https://api.hh.ru/vacancies', params=params).json()
+        data: Dict[str, Any] = get_json('hh', f'{self.base_url}/vacancies', params=params)
 
         return data
+
+    def get_vacancy(self, vacancy_id: str) -> Dict[str, Any]:
+        """
+        Получает полное описание вакансии с использованием API Head Hunter.
+
+        Parameters:
+            vacancy_id (str): Идентификатор вакансии.
+
+        Returns:
+            Dict[str, Any]: Данные вакансии в формате, предоставляемом API.
+        """
+        return get_json('hh', f'{self.base_url}/vacancies/{vacancy_id}', endpoint='detail')
+
+    def get_regions(self) -> List[Dict[str, Any]]:
+        """
+        Получает дерево регионов Head Hunter (страны, регионы, города).
+
+        Returns:
+            List[Dict[str, Any]]: Дерево регионов в формате, предоставляемом API.
+        """
+        return get_json('hh', f'{self.base_url}/areas', endpoint='reference')
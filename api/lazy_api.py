@@ -0,0 +1,69 @@
+import importlib
+from typing import Optional, Dict, Any, Tuple
+
+from api.abs_api import AbstractJobSearchAPI
+
+
+class LazyJobSearchAPI(AbstractJobSearchAPI):
+    def __init__(self, module_name: str, class_name: str, *args: Any, **kwargs: Any):
+        """
+        Инициализирует ленивый клиент API: модуль клиента импортируется,
+        а сам клиент создается только при первом запросе.
+
+        Parameters:
+            module_name (str): Имя модуля с классом клиента (например, 'api.hh_api').
+            class_name (str): Имя класса клиента (например, 'HHJobSearchAPI').
+            *args (Any): Позиционные аргументы конструктора клиента.
+            **kwargs (Any): Именованные аргументы конструктора клиента.
+        """
+        self.module_name: str = module_name
+        self.class_name: str = class_name
+        self._init_args: Tuple[Any, ...] = args
+        self._init_kwargs: Dict[str, Any] = kwargs
+        self._client: Optional[AbstractJobSearchAPI] = None
+
+    @property
+    def client(self) -> AbstractJobSearchAPI:
+        """
+        Возвращает клиент API, создавая его при первом обращении.
+
+        Returns:
+            AbstractJobSearchAPI: Клиент API.
+        """
+        if self._client is None:
+            api_class = getattr(importlib.import_module(self.module_name), self.class_name)
+            self._client = api_class(*self._init_args, **self._init_kwargs)
+        return self._client
+
+    def get_data(self, param: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Получает данные о вакансиях через клиент API, создавая его при необходимости.
+
+        Parameters:
+            param (Optional[Dict[str, Any]]): Параметры запроса к API.
+
+        Returns:
+            Dict[str, Any]: Данные о вакансиях в формате, предоставляемом API.
+        """
+        return self.client.get_data(param)
+
+    def get_vacancy(self, vacancy_id: str) -> Dict[str, Any]:
+        """
+        Получает полное описание вакансии через клиент API, создавая его при необходимости.
+
+        Parameters:
+            vacancy_id (str): Идентификатор вакансии.
+
+        Returns:
+            Dict[str, Any]: Данные вакансии в формате, предоставляемом API.
+        """
+        return self.client.get_vacancy(vacancy_id)
+
+    def get_regions(self) -> Any:
+        """
+        Получает справочник регионов через клиент API, создавая его при необходимости.
+
+        Returns:
+            Any: Справочник в формате, предоставляемом API.
+        """
+        return self.client.get_regions()
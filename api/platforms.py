@@ -0,0 +1,235 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Путь к значению во вложенном ответе API, например ('salary', 'to')
+FieldPath = Tuple[str, ...]
+
+# Поля вакансии, которые извлекаются из ответа любой площадки, в порядке кортежа экстрактора
+EXTRACTED_FIELDS: Tuple[str, ...] = ('id', 'title', 'url', 'salary_from', 'salary_to', 'currency', 'description',
+                                     'city', 'published_at', 'employer_name', 'employer_url')
+
+# Поля, без которых вакансия отбрасывается при конвертации
+REQUIRED_FIELDS: Tuple[str, ...] = ('title', 'url', 'currency', 'city', 'published_at',
+                                    'employer_name', 'employer_url')
+
+
+def compile_extractor(fields: Dict[str, FieldPath]) -> Callable[[Dict[str, Any]], Tuple[Any, ...]]:
+    """
+    Компилирует описание полей в одну функцию, которая за один проход по вложенным словарям
+    возвращает кортеж значений в порядке EXTRACTED_FIELDS. Общие префиксы путей вычисляются
+    один раз, отсутствующие значения превращаются в None без обработки исключений.
+
+    Parameters:
+        fields (Dict[str, FieldPath]): Поле вакансии -> путь к нему в ответе API.
+
+    Returns:
+        Callable[[Dict[str, Any]], Tuple[Any, ...]]: Функция извлечения полей.
+    """
+    lines: List[str] = ['def extract(data):']
+    variables: Dict[FieldPath, str] = {(): 'data'}
+    values: List[str] = []
+
+    for field in EXTRACTED_FIELDS:
+        path = fields[field]
+        for depth in range(1, len(path)):
+            prefix = path[:depth]
+            if prefix not in variables:
+                name = f'node_{len(variables)}'
+                lines.append(f'    {name} = {variables[prefix[:-1]]}.get({prefix[-1]!r})')
+                lines.append(f'    {name} = {name} if {name}.__class__ is dict else EMPTY')
+                variables[prefix] = name
+        values.append(f'{variables[path[:-1]]}.get({path[-1]!r})')
+
+    lines.append(f"    return ({', '.join(values)},)")
+    namespace: Dict[str, Any] = {'EMPTY': {}}
+    exec('\n'.join(lines), namespace)
+    return namespace['extract']
+
+
+class PlatformSpec:
+    """
+    Декларативное описание площадки поиска вакансий: клиент API, разметка полей ответа,
+    параметры сортировки и постраничной выдачи. Все слои приложения обращаются к площадке
+    через это описание, поэтому новая площадка добавляется одной записью в PLATFORMS.
+
+    Attributes:
+        slug (str): Короткое имя площадки ('hh', 'superjob').
+        name (str): Отображаемое имя площадки.
+        client (Tuple[str, str]): Модуль и класс клиента API.
+        items_key (str): Ключ списка вакансий в ответе API.
+        total_key (str): Ключ общего количества найденных вакансий в ответе API.
+        fields (Dict[str, FieldPath]): Поле вакансии -> путь к нему в ответе API.
+        date_kind (str): Формат даты публикации ('iso' или 'timestamp').
+        convertible_currencies (Tuple[str, ...]): Валюты, которые пересчитываются в рубли.
+        default_params (Dict[str, Any]): Параметры, передаваемые в каждый запрос.
+        sort_params (Dict[str, Dict[str, Any]]): Параметры сортировок 'salary' и 'date'.
+        keyword_param (str): Параметр поиска по ключевому слову.
+        page_param (str): Параметр номера страницы.
+        page_size_param (str): Параметр размера страницы.
+        page_size (int): Размер страницы по умолчанию.
+        max_results (int): Максимальная глубина выдачи API.
+        rate_limit (float): Допустимое количество запросов к API в секунду (общее для всех клиентов).
+        detail_description (FieldPath): Путь к полному описанию в ответе запроса одной вакансии.
+        region_param (str): Параметр запроса, ограничивающий поиск регионом (список идентификаторов).
+        deadlines (Dict[str, float]): Вид запроса ('search', 'detail', 'reference') -> крайний срок
+            ответа в секундах. Без ответа к сроку запрос завершается DeadlineExceeded.
+        hedge_after (Dict[str, float]): Вид запроса -> через сколько секунд без ответа отправляется
+            дублирующий запрос (используется ответ, пришедший первым).
+    """
+
+    def __init__(self, slug: str, name: str, client: Tuple[str, str], items_key: str, total_key: str,
+                 fields: Dict[str, FieldPath], date_kind: str, convertible_currencies: Tuple[str, ...],
+                 default_params: Dict[str, Any], sort_params: Dict[str, Dict[str, Any]], keyword_param: str,
+                 page_param: str, page_size_param: str, page_size: int, max_results: int,
+                 rate_limit: float, detail_description: FieldPath, region_param: str,
+                 deadlines: Dict[str, float], hedge_after: Dict[str, float]) -> None:
+        self.slug = slug
+        self.name = name
+        self.client = client
+        self.items_key = items_key
+        self.total_key = total_key
+        self.fields = fields
+        self.date_kind = date_kind
+        self.convertible_currencies = frozenset(convertible_currencies)
+        self.default_params = default_params
+        self.sort_params = sort_params
+        self.keyword_param = keyword_param
+        self.page_param = page_param
+        self.page_size_param = page_size_param
+        self.page_size = page_size
+        self.max_results = max_results
+        self.rate_limit = rate_limit
+        self.detail_description = detail_description
+        self.region_param = region_param
+        self.deadlines = dict(deadlines)
+        self.hedge_after = dict(hedge_after)
+        self.extract = compile_extractor(fields)
+
+    def page_params(self, page: int, page_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Возвращает параметры запроса страницы выдачи.
+
+        Parameters:
+            page (int): Номер страницы (с нуля).
+            page_size (Optional[int]): Размер страницы (по умолчанию page_size площадки).
+
+        Returns:
+            Dict[str, Any]: Параметры постраничной выдачи.
+        """
+        return {self.page_param: page, self.page_size_param: page_size or self.page_size}
+
+    def create_client(self, *args: Any, **kwargs: Any):
+        """
+        Возвращает ленивый клиент API площадки.
+        """
+        from api.lazy_api import LazyJobSearchAPI
+
+        return LazyJobSearchAPI(self.client[0], self.client[1], *args, **kwargs)
+
+
+PLATFORMS: Dict[str, PlatformSpec] = {
+    'hh': PlatformSpec(
+        slug='hh',
+        name='Head Hunter',
+        client=('api.hh_api', 'HHJobSearchAPI'),
+        items_key='items',
+        total_key='found',
+        fields={
+            'id': ('id',),
+            'title': ('name',),
+            'url': ('alternate_url',),
+            'salary_from': ('salary', 'from'),
+            'salary_to': ('salary', 'to'),
+            'currency': ('salary', 'currency'),
+            'description': ('snippet', 'requirement'),
+            'city': ('area', 'name'),
+            'published_at': ('published_at',),
+            'employer_name': ('employer', 'name'),
+            'employer_url': ('employer', 'alternate_url'),
+        },
+        date_kind='iso',
+        convertible_currencies=('AZN', 'BYR', 'EUR', 'GEL', 'KGS', 'KZT', 'USD', 'UAH', 'UZS'),
+        default_params={'only_with_salary': 'true', 'search_field': 'name'},
+        sort_params={'salary': {'order_by': 'salary_desc'},
+                     'date': {'order_by': 'publication_time'}},
+        keyword_param='text',
+        page_param='page',
+        page_size_param='per_page',
+        page_size=100,
+        max_results=2000,
+        rate_limit=5,
+        detail_description=('description',),
+        region_param='area',
+        deadlines={'search': 8.0, 'detail': 5.0, 'reference': 30.0},
+        hedge_after={'search': 1.5, 'detail': 1.0},
+    ),
+    'superjob': PlatformSpec(
+        slug='superjob',
+        name='Super Job',
+        client=('api.superjob_api', 'SuperJobAPI'),
+        items_key='objects',
+        total_key='total',
+        fields={
+            'id': ('id',),
+            'title': ('profession',),
+            'url': ('link',),
+            'salary_from': ('payment_from',),
+            'salary_to': ('payment_to',),
+            'currency': ('currency',),
+            'description': ('candidat',),
+            'city': ('town', 'title'),
+            'published_at': ('date_published',),
+            'employer_name': ('client', 'title'),
+            'employer_url': ('client', 'link'),
+        },
+        date_kind='timestamp',
+        convertible_currencies=('UAH', 'UZS'),
+        default_params={'no_agreement': 1},
+        # Super Job по умолчанию отдает вакансии по дате публикации
+        sort_params={'salary': {'order_field': 'payment', 'order_direction': 'desc'},
+                     'date': {}},
+        keyword_param='keyword',
+        page_param='page',
+        page_size_param='count',
+        page_size=600,
+        max_results=500,
+        rate_limit=2,
+        detail_description=('vacancyRichText',),
+        region_param='t[]',
+        deadlines={'search': 8.0, 'detail': 5.0, 'reference': 30.0},
+        hedge_after={'search': 2.0, 'detail': 1.5},
+    ),
+}
+
+# Отображаемое имя площадки -> описание (api в приложении передаются словарями с ключом 'name')
+PLATFORMS_BY_NAME: Dict[str, PlatformSpec] = {spec.name: spec for spec in PLATFORMS.values()}
+
+
+def get_platform(api: Any) -> PlatformSpec:
+    """
+    Возвращает описание площадки по словарю api, отображаемому имени или короткому имени.
+
+    Parameters:
+        api (Any): Словарь api ({'name': ..., 'api_class': ...}), имя или короткое имя площадки.
+
+    Returns:
+        PlatformSpec: Описание площадки.
+    """
+    key = api.get('name') if isinstance(api, dict) else api
+    spec = PLATFORMS_BY_NAME.get(key) or PLATFORMS.get(key)
+    if spec is None:
+        raise ValueError(f"Неизвестная площадка: {key}. Доступные площадки: {', '.join(PLATFORMS)}.")
+    return spec
+
+
+def build_api_list(slugs: Optional[List[str]] = None) -> List[dict]:
+    """
+    Собирает список api для JobSearchApp из реестра площадок.
+
+    Parameters:
+        slugs (Optional[List[str]]): Короткие имена площадок (по умолчанию все).
+
+    Returns:
+        List[dict]: Список словарей {'api_class': клиент, 'name': имя площадки}.
+    """
+    return [{'api_class': PLATFORMS[slug].create_client(), 'name': PLATFORMS[slug].name}
+            for slug in (slugs or PLATFORMS)]
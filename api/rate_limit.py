@@ -0,0 +1,75 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """
+    Потокобезопасный ограничитель частоты запросов (token bucket).
+
+    Attributes:
+        rate (float): Допустимое количество запросов в секунду.
+        burst (int): Максимальное количество запросов, которые можно выполнить подряд без ожидания.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens: float = self.burst
+        self._updated_at: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Ждет, пока можно будет выполнить запрос, и занимает для него место.
+
+        Returns:
+            float: Время ожидания в секундах.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+# Короткое имя площадки -> общий ограничитель для всех клиентов этой площадки
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def set_rate_limit(slug: str, rate: float, burst: Optional[int] = None) -> None:
+    """
+    Заменяет общий ограничитель частоты запросов площадки (например, для стаб-сервера в нагрузочных тестах).
+
+    Parameters:
+        slug (str): Короткое имя площадки ('hh', 'superjob').
+        rate (float): Допустимое количество запросов в секунду.
+        burst (Optional[int]): Максимальное количество запросов подряд без ожидания.
+    """
+    with _limiters_lock:
+        _limiters[slug] = RateLimiter(rate, burst)
+
+
+def get_rate_limiter(slug: str) -> RateLimiter:
+    """
+    Возвращает общий ограничитель частоты запросов площадки.
+
+    Parameters:
+        slug (str): Короткое имя площадки ('hh', 'superjob').
+
+    Returns:
+        RateLimiter: Ограничитель частоты запросов.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(slug)
+        if limiter is None:
+            from api.platforms import PLATFORMS
+
+            limiter = _limiters[slug] = RateLimiter(PLATFORMS[slug].rate_limit)
+        return limiter
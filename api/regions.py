@@ -0,0 +1,224 @@
+import json
+import os
+import time
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from api.platforms import PLATFORMS, get_platform
+from metrics.instrumentation import metrics
+from storage.locking import atomic_write
+
+REGION_CACHE_DIR: str = os.path.join('cache', 'regions')
+
+# Справочники регионов меняются редко, поэтому по умолчанию обновляются раз в неделю
+DEFAULT_MAX_AGE: float = 7 * 24 * 60 * 60
+
+
+class RegionIndex:
+    """
+    Иерархический индекс регионов: дерево регионов Head Hunter (страна -> регион -> город)
+    и справочники городов других площадок, сопоставленные с деревом по названию.
+
+    Attributes:
+        names (Dict[str, str]): Идентификатор региона Head Hunter -> название.
+        children (Dict[str, List[str]]): Идентификатор региона -> идентификаторы вложенных регионов.
+        towns (Dict[str, Dict[str, Any]]): Площадка -> название города в нижнем регистре -> идентификатор.
+    """
+
+    def __init__(self) -> None:
+        self.names: Dict[str, str] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.towns: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        self._cities: Dict[str, FrozenSet[str]] = {}
+
+    def add_areas(self, tree: List[Dict[str, Any]]) -> None:
+        """
+        Добавляет в индекс дерево регионов Head Hunter (ответ /areas).
+
+        Parameters:
+            tree (List[Dict[str, Any]]): Дерево регионов.
+        """
+        stack = list(tree)
+        while stack:
+            area = stack.pop()
+            area_id = str(area['id'])
+            self.names[area_id] = area['name']
+            self._by_name.setdefault(area['name'].lower(), []).append(area_id)
+            self.children[area_id] = [str(child['id']) for child in area.get('areas') or []]
+            stack.extend(area.get('areas') or [])
+        self._cities.clear()
+
+    def add_towns(self, platform: str, towns: List[Dict[str, Any]]) -> None:
+        """
+        Добавляет в индекс список городов площадки (ответ /2.0/towns/ Super Job).
+
+        Parameters:
+            platform (str): Короткое имя площадки.
+            towns (List[Dict[str, Any]]): Города площадки.
+        """
+        self.towns[platform] = {town['title'].lower(): town['id'] for town in towns}
+
+    def resolve(self, region: str) -> str:
+        """
+        Возвращает идентификатор региона Head Hunter по идентификатору или названию.
+        Если одно название носят несколько регионов, выбирается самый крупный.
+
+        Parameters:
+            region (str): Идентификатор или название региона.
+
+        Returns:
+            str: Идентификатор региона.
+        """
+        if region in self.names:
+            return region
+        candidates = self._by_name.get(region.lower())
+        if not candidates:
+            raise ValueError(f"Неизвестный регион: {region}.")
+        return max(candidates, key=lambda area_id: len(self.cities(area_id)))
+
+    def cities(self, region: str) -> FrozenSet[str]:
+        """
+        Возвращает названия региона и всех вложенных в него регионов и городов.
+
+        Parameters:
+            region (str): Идентификатор или название региона.
+
+        Returns:
+            FrozenSet[str]: Названия городов региона.
+        """
+        area_id = self.resolve(region)
+        if area_id not in self._cities:
+            names = []
+            stack = [area_id]
+            while stack:
+                current = stack.pop()
+                names.append(self.names[current])
+                stack.extend(self.children.get(current, ()))
+            self._cities[area_id] = frozenset(names)
+        return self._cities[area_id]
+
+    def upstream_params(self, region: str, platform: str) -> Dict[str, Any]:
+        """
+        Возвращает параметры запроса, ограничивающие поиск площадки регионом.
+
+        Parameters:
+            region (str): Идентификатор или название региона.
+            platform (str): Короткое имя площадки.
+
+        Returns:
+            Dict[str, Any]: Параметры запроса (пустой словарь, если площадка не знает городов региона).
+        """
+        spec = PLATFORMS[platform]
+        if platform == 'hh':
+            return {spec.region_param: self.resolve(region)}
+
+        towns = self.towns.get(platform, {})
+        town_ids = sorted(towns[name.lower()] for name in self.cities(region) if name.lower() in towns)
+        return {spec.region_param: town_ids} if town_ids else {}
+
+
+def is_valid_reference(platform: str, data: Any) -> bool:
+    """
+    Проверяет, что ответ API — справочник регионов, а не ответ с ошибкой: у Head Hunter — список
+    регионов, у остальных площадок — словарь со списком городов 'objects'.
+
+    Parameters:
+        platform (str): Короткое имя площадки.
+        data (Any): Ответ API.
+
+    Returns:
+        bool: Ответ является справочником.
+    """
+    if platform == 'hh':
+        return isinstance(data, list) and all(isinstance(area, dict) and 'id' in area and 'name' in area
+                                              for area in data)
+    return isinstance(data, dict) and isinstance(data.get('objects'), list)
+
+
+class RegionService:
+    """
+    Загружает справочники регионов площадок, хранит их на диске и обновляет не чаще,
+    чем раз в max_age секунд. Если обновить справочник не удалось, используется
+    устаревшая копия.
+
+    Attributes:
+        api_list (List[dict]): Площадки приложения.
+        directory (str): Каталог кэша справочников.
+        max_age (float): Срок, после которого справочник загружается заново, в секундах.
+    """
+
+    def __init__(self, api_list: List[dict], directory: str = REGION_CACHE_DIR,
+                 max_age: float = DEFAULT_MAX_AGE) -> None:
+        self.api_list = api_list
+        self.directory = directory
+        self.max_age = max_age
+        self._index: Optional[RegionIndex] = None
+
+    def _path(self, platform: str) -> str:
+        return os.path.join(self.directory, f'{platform}.json')
+
+    def _client(self, platform: str) -> Any:
+        for api in self.api_list:
+            if get_platform(api).slug == platform:
+                return api.get('api_class')
+        return PLATFORMS[platform].create_client()
+
+    def load_reference(self, platform: str, refresh: bool = False) -> Any:
+        """
+        Возвращает справочник регионов площадки из кэша или загружает его. В кэш попадает
+        только ответ, который является справочником (см. is_valid_reference).
+
+        Parameters:
+            platform (str): Короткое имя площадки.
+            refresh (bool): Загрузить справочник заново, даже если копия в кэше свежая.
+
+        Returns:
+            Any: Справочник в формате, предоставляемом API.
+        """
+        path = self._path(platform)
+        cached = None
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                cached = json.load(file)
+        except (OSError, ValueError):
+            pass
+        if not isinstance(cached, dict) or not is_valid_reference(platform, cached.get('data')):
+            cached = None
+
+        if cached is not None and not refresh and time.time() - cached['fetched_at'] < self.max_age:
+            metrics.increment('cache.hits', cache='regions', platform=platform)
+            return cached['data']
+        metrics.increment('cache.misses', cache='regions', platform=platform)
+
+        try:
+            data = self._client(platform).get_regions()
+            if not is_valid_reference(platform, data):
+                raise ValueError(f'Площадка {platform} вернула вместо справочника регионов: {str(data)[:200]}')
+        except Exception:
+            if cached is None:
+                raise
+            metrics.increment('regions.stale', platform=platform)
+            return cached['data']
+
+        with atomic_write(path) as file:
+            json.dump({'fetched_at': time.time(), 'data': data}, file, ensure_ascii=False)
+        return data
+
+    def index_for(self, api: dict) -> RegionIndex:
+        """
+        Возвращает индекс регионов, в котором загружены дерево Head Hunter и города площадки api.
+
+        Parameters:
+            api (dict): Площадка, для которой нужен индекс.
+
+        Returns:
+            RegionIndex: Индекс регионов.
+        """
+        if self._index is None:
+            self._index = RegionIndex()
+            self._index.add_areas(self.load_reference('hh'))
+
+        platform = get_platform(api).slug
+        if platform != 'hh' and platform not in self._index.towns:
+            self._index.add_towns(platform, self.load_reference(platform).get('objects') or [])
+        return self._index
@@ -0,0 +1,106 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from api.cassette import request_key
+from api.platforms import get_platform
+from metrics.instrumentation import metrics
+
+# Сколько секунд заранее полученная выдача считается свежей
+PREFETCH_MAX_AGE: float = 300.0
+
+
+class SearchPrefetcher:
+    """
+    Заранее запрашивает первую страницу выдачи для нескольких вариантов поиска, пока пользователь
+    еще отвечает на вопросы (например, выдачу для обеих сортировок, пока выбирается сортировка).
+
+    Когда выбор сделан, выдача для выбранного варианта берется из уже выполненного (или еще
+    выполняемого) запроса, а остальные варианты отбрасываются. Вариант определяется площадкой
+    и точными параметрами запроса, поэтому выдача используется, только если приложение отправило
+    бы тот же самый запрос. Неудачный или устаревший запрос просто повторяется обычным путем.
+
+    Attributes:
+        max_age (float): Сколько секунд заранее полученная выдача считается свежей.
+        max_workers (int): Количество одновременных запросов.
+    """
+
+    def __init__(self, max_age: float = PREFETCH_MAX_AGE, max_workers: int = 2) -> None:
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Tuple[float, Future]] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Возвращает пул потоков, создавая его при первом обращении.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='speculation')
+        return self._executor
+
+    def start(self, api: dict, variants: Iterable[Dict[str, Any]]) -> None:
+        """
+        Запускает фоновые запросы выдачи для вариантов поиска. Варианты прошлого запуска отбрасываются.
+
+        Parameters:
+            api (dict): Площадка.
+            variants (Iterable[Dict[str, Any]]): Параметры запроса каждого варианта.
+        """
+        self.discard()
+        platform = get_platform(api).slug
+        for params in variants:
+            key = request_key(platform, 'get_data', params)
+            if key not in self._futures:
+                self._futures[key] = (time.monotonic(), self.executor.submit(api.get('api_class').get_data, dict(params)))
+                metrics.increment('speculation.started', platform=platform)
+
+    def take(self, api: dict, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает заранее запрошенную выдачу для параметров запроса, дождавшись ее при необходимости.
+        Остальные варианты отбрасываются.
+
+        Parameters:
+            api (dict): Площадка.
+            params (Dict[str, Any]): Параметры запроса.
+
+        Returns:
+            Optional[Dict[str, Any]]: Ответ API или None, если такой выдачи не запрашивалось,
+            запрос завершился ошибкой или выдача устарела.
+        """
+        if not self._futures:
+            return None
+        platform = get_platform(api).slug
+        started, future = self._futures.pop(request_key(platform, 'get_data', params), (0.0, None))
+        self.discard()
+
+        if future is None or time.monotonic() - started > self.max_age:
+            metrics.increment('speculation.misses', platform=platform)
+            return None
+        with metrics.timer('speculation.wait', platform=platform):
+            try:
+                response = future.result()
+            except Exception:
+                metrics.increment('speculation.failed', platform=platform)
+                return None
+        metrics.increment('speculation.hits', platform=platform)
+        return response
+
+    def discard(self) -> None:
+        """
+        Отбрасывает все заранее запрошенные варианты. Еще не начатые запросы отменяются.
+        """
+        for _, future in self._futures.values():
+            future.cancel()
+            metrics.increment('speculation.discarded')
+        self._futures.clear()
+
+    def close(self) -> None:
+        """
+        Отбрасывает варианты и останавливает пул потоков.
+        """
+        self.discard()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
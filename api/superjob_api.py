@@ -1,17 +1,37 @@
-import requests
 from typing import Optional, Dict, Any
 
 from api.abs_api import AbstractJobSearchAPI
+from api.platforms import PLATFORMS
+from api.transport import get_json
+
+SUPERJOB_API_URL: str = 'https://api.superjob.ru'
+
 
 class SuperJobAPI(AbstractJobSearchAPI):
-    def __init__(self, api_token: str):
+    def __init__(self, api_token: Optional[str] = None, base_url: str = SUPERJOB_API_URL):
         """
         Инициализирует объект SuperJobAPI.
 
         Parameters:
-            api_token (str): Токен для доступа к API Super Job.
+            api_token (Optional[str]): Токен для доступа к API Super Job.
+                Если не указан, берется из переменной окружения API_KEY при первом запросе.
+            base_url (str): Адрес API Super Job (например, адрес локального стаб-сервера).
+        """
+        self._api_token: Optional[str] = api_token
+        self.base_url: str = base_url.rstrip('/')
+
+    @property
+    def api_token(self) -> Optional[str]:
         """
-        self.api_token: str = api_token
+        Возвращает токен для доступа к API Super Job, загружая его из окружения при необходимости.
+
+        Returns:
+            Optional[str]: Токен для доступа к API Super Job.
+        """
+        if self._api_token is None:
+            from implemented import get_api_key
+            self._api_token = get_api_key()
+        return self._api_token
 
     def get_data(self, param: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -24,13 +44,38 @@ class SuperJobAPI(AbstractJobSearchAPI):
             Dict[str, Any]: Данные о вакансиях в формате, предоставляемом API.
         """
         headers: Dict[str, str] = {'X-Api-App-Id': self.api_token}
-        pages: int = 600
-        params: Dict[str, Any] = {'count': pages,
-                                  'no_agreement': 1}
+        spec = PLATFORMS['superjob']
+        params: Dict[str, Any] = dict(spec.default_params)
+        params[spec.page_size_param] = spec.page_size
 
         if param:
             params.update(param)
 
-        data: Dict[str, Any] = requests.get('https://api.superjob.ru/2.0/vacancies/', headers=headers, params=params).json()
+        data: Dict[str, Any] = get_json('superjob', f'{self.base_url}/2.0/vacancies/', params=params, headers=headers)
 
         return data
+
+    def get_vacancy(self, vacancy_id: str) -> Dict[str, Any]:
+        """
+        Получает полное описание вакансии с использованием API Super Job.
+
+        Parameters:
+            vacancy_id (str): Идентификатор вакансии.
+
+        Returns:
+            Dict[str, Any]: Данные вакансии в формате, предоставляемом API.
+        """
+        headers: Dict[str, str] = {'X-Api-App-Id': self.api_token}
+        return get_json('superjob', f'{self.base_url}/2.0/vacancies/{vacancy_id}/', headers=headers,
+                        endpoint='detail')
+
+    def get_regions(self) -> Dict[str, Any]:
+        """
+        Получает список всех городов Super Job.
+
+        Returns:
+            Dict[str, Any]: Список городов в формате, предоставляемом API.
+        """
+        headers: Dict[str, str] = {'X-Api-App-Id': self.api_token}
+        return get_json('superjob', f'{self.base_url}/2.0/towns/', params={'all': 1}, headers=headers,
+                        endpoint='reference')
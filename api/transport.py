@@ -0,0 +1,56 @@
+from typing import Any, Dict, Optional
+
+from api.deadlines import call_with_deadline
+from api.rate_limit import get_rate_limiter
+from lazy_import import lazy_import
+from metrics.instrumentation import metrics
+
+# requests импортируется при первом запросе, чтобы не замедлять запуск приложения
+requests = lazy_import('requests')
+
+
+def get_json(platform: str, url: str, params: Optional[Dict[str, Any]] = None,
+             headers: Optional[Dict[str, str]] = None, endpoint: str = 'search') -> Any:
+    """
+    Выполняет GET-запрос к API площадки с учетом общего ограничения частоты запросов
+    и возвращает декодированный JSON. Время запроса, декодирования и объем ответа
+    записываются в метрики.
+
+    Запрос ограничен крайним сроком площадки для этого вида запросов, а если ответ задерживается,
+    отправляется дублирующий запрос (см. PlatformSpec.deadlines и PlatformSpec.hedge_after).
+
+    Parameters:
+        platform (str): Короткое имя площадки ('hh', 'superjob').
+        url (str): Адрес запроса.
+        params (Optional[Dict[str, Any]]): Параметры запроса.
+        headers (Optional[Dict[str, str]]): Заголовки запроса.
+        endpoint (str): Вид запроса для меток метрик ('search', 'detail', 'reference').
+
+    Returns:
+        Any: Ответ API.
+
+    Raises:
+        DeadlineExceeded: Площадка не ответила до крайнего срока.
+        requests.HTTPError: Площадка ответила ошибкой.
+    """
+    from api.platforms import PLATFORMS
+
+    spec = PLATFORMS[platform]
+
+    def attempt(timeout: Optional[float]) -> Any:
+        metrics.observe('api.rate_limit_wait', get_rate_limiter(platform).acquire(), platform=platform)
+
+        with metrics.timer('api.request', platform=platform, endpoint=endpoint):
+            response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        metrics.increment('api.requests', platform=platform, endpoint=endpoint)
+        metrics.increment('api.bytes_fetched', len(response.content), platform=platform, endpoint=endpoint)
+        # Ответ с ошибкой (4xx/5xx, капча) — исключение, а не данные: он не кэшируется и не выигрывает дублирование
+        if not response.ok:
+            metrics.increment('api.errors', platform=platform, endpoint=endpoint, status=str(response.status_code))
+        response.raise_for_status()
+
+        with metrics.timer('api.decode', platform=platform, endpoint=endpoint):
+            return response.json()
+
+    return call_with_deadline(attempt, spec.deadlines.get(endpoint) or None, spec.hedge_after.get(endpoint) or None,
+                              platform, endpoint)
@@ -1,11 +1,50 @@
-from colorama import Fore, Style
-from typing import List
-
-from api.hh_api import HHJobSearchAPI
-from api.superjob_api import SuperJobAPI
-from implemented import api_key
+from contextlib import nullcontext
+from functools import cached_property, partial
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from api.platforms import PLATFORMS, build_api_list, get_platform
+from lazy_import import lazy_import
+from metrics.instrumentation import configure_metrics, metrics, serve_from_env
+from metrics.profiling import RunProfiler
+from model.comparison import VacancyComparison
+from model.result_set import ResultCursor, ResultSet
 from model.vacancies import VacancyFilter, Vacancy, VacancyOutput
+from storage.dimensions import VacancyDimensions
 from storage.json_handler import JSONHandler, Converter
+from storage.locking import prune_session_files, session_filename
+from text_messages import TEXT_MESSAGES
+
+if TYPE_CHECKING:
+    import argparse
+
+    from api.enrichment import VacancyEnricher
+    from api.regions import RegionService
+    from api.speculation import SearchPrefetcher
+    from model.alerts import SubscriptionIndex
+    from model.similarity import SimilarityIndex
+    from storage.snapshots import SnapshotStore
+
+# Тяжелые и редко нужные модули импортируются при первом использовании
+Fore = lazy_import('colorama', 'Fore')
+Style = lazy_import('colorama', 'Style')
+exporters = lazy_import('storage.exporters')
+requests = lazy_import('requests')
+
+# Наибольший размер страницы списка вакансий
+MAX_PAGE_SIZE: int = 100
+
+# Команды перехода по страницам списка вакансий
+PAGE_COMMANDS = ('>', '<')
+
+# Команда сравнения группы вакансий: "=" — текущая страница, "=1-30,45" — выбранные номера
+COMPARE_COMMAND: str = '='
+
+# Количество похожих вакансий, которые показываются для выбранной вакансии
+SIMILAR_TOP: int = 5
+
+# Изменения, по которым вакансия заново сопоставляется с подписками: у измененной вакансии могли
+# поменяться название или город, поэтому 'updated' тоже проверяется
+ALERT_CHANGE_KINDS = ('new', 'salary_changed', 'updated')
 
 
 class TextStyle:
@@ -90,6 +129,36 @@ class InputChecker:
         self.text_style.print_error(f"Введите число в диапазоне от {counts[0]} до {counts[-1]}.")
         return False
 
+    def parse_selection(self, string: str, limit: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Функция разбирает список номеров вида "1-30,45". Номера больше limit отбрасываются.
+
+        Parameters:
+        - string (str): введенное значение.
+        - limit (Optional[int]): наибольший номер вакансии в выдаче.
+
+        Returns:
+        - Optional[List[int]]: номера без повторов в порядке ввода или None, если ввод некорректен.
+        """
+        positions: Dict[int, None] = {}
+        for part in string.replace(' ', '').split(','):
+            first, _, last = part.partition('-')
+            if not first.isdigit() or (last and not last.isdigit()) or int(first) < 1:
+                self.text_style.print_error('Введите номера вакансий через запятую или диапазоном, например 1-30,45.')
+                return None
+            first, last = int(first), int(last or first)
+            if last < first:
+                self.text_style.print_error(f'В диапазоне {part} начало больше конца.')
+                return None
+            if limit is not None:
+                last = min(last, limit)
+            for position in range(first, last + 1):
+                positions[position] = None
+        if not positions:
+            self.text_style.print_error(f'В выдаче не больше {limit} вакансий.')
+            return None
+        return list(positions)
+
 
 class JobSearchApp:
     """
@@ -97,18 +166,102 @@ class JobSearchApp:
 
     Attributes:
     - api_list (List[dict]): перечисление api которые используются.
+    - export_format (Optional[str]): формат экспорта результатов поиска ('ndjson', 'csv', 'columnar').
+    - export_filename (Optional[str]): имя файла экспорта (по умолчанию export.<расширение формата>).
+    - profiler (Optional[RunProfiler]): профилировщик запусков поиска (по умолчанию из переменных окружения).
+    - snapshots (Optional[SnapshotStore]): хранилище снимков для ленты изменений между запусками.
+    - subscriptions (Optional[SubscriptionIndex]): индекс сохраненных поисков для оповещений.
+    - archive_filename (Optional[str]): архив формата VARC, в который дописываются результаты поиска.
+    - save_filename (Optional[str]): файл результатов (по умолчанию свой для каждого сеанса в каталоге results,
+      где хранятся файлы последних сеансов).
+    - speculative (bool): в диалоге заранее запрашивать выдачу для обеих сортировок, пока пользователь
+      выбирает сортировку и количество вакансий.
     """
 
-    def __init__(self, api_list: List[dict]) -> None:
+    def __init__(self, api_list: List[dict], export_format: Optional[str] = None,
+                 export_filename: Optional[str] = None, profiler: Optional[RunProfiler] = None,
+                 snapshots: Optional['SnapshotStore'] = None,
+                 subscriptions: Optional['SubscriptionIndex'] = None,
+                 archive_filename: Optional[str] = None, save_filename: Optional[str] = None,
+                 speculative: bool = True) -> None:
         self.api_list = api_list
-        self.json_handler = JSONHandler()
-        self.text_messages = self.json_handler.load_from_file('text_messages.json')
+        self.text_messages = TEXT_MESSAGES
         self.text_style = TextStyle()
-        self.input_checker = InputChecker()
-        self.vacancy_filter = VacancyFilter()
-        self.converter = Converter()
-        self.save_filename = 'optimize_data.json'
-        self.vacancy_output = VacancyOutput()
+        # Каждый сеанс пишет свой файл результатов, поэтому параллельные сеансы не мешают друг другу
+        self.save_filename = save_filename or session_filename()
+        if save_filename is None:
+            # Файлы прошлых сеансов не копятся: остаются только последние
+            prune_session_files()
+        self.export_format = export_format
+        self.export_filename = export_filename
+        self.profiler = profiler or RunProfiler.from_env()
+        self.snapshots = snapshots
+        self.last_changes: List[dict] = []
+        self.subscriptions = subscriptions
+        self.last_alerts: Dict[str, List[str]] = {}
+        self.archive_filename = archive_filename
+        self.last_found = 0
+        self.seen_vacancies: set = set()
+        self.missed_platforms: Dict[str, str] = {}
+        self.speculative = speculative
+
+    # Вспомогательные объекты создаются при первом обращении, чтобы первый вопрос появлялся сразу
+
+    @cached_property
+    def dimensions(self) -> VacancyDimensions:
+        return VacancyDimensions()
+
+    @cached_property
+    def json_handler(self) -> JSONHandler:
+        return JSONHandler(self.dimensions)
+
+    @cached_property
+    def input_checker(self) -> InputChecker:
+        return InputChecker()
+
+    @cached_property
+    def vacancy_filter(self) -> VacancyFilter:
+        return VacancyFilter(self.dimensions)
+
+    @cached_property
+    def converter(self) -> Converter:
+        return Converter(self.dimensions)
+
+    @cached_property
+    def vacancy_output(self) -> VacancyOutput:
+        return VacancyOutput()
+
+    @cached_property
+    def regions(self) -> 'RegionService':
+        from api.regions import RegionService
+        return RegionService(self.api_list)
+
+    @cached_property
+    def enricher(self) -> 'VacancyEnricher':
+        from api.enrichment import VacancyEnricher
+        return VacancyEnricher()
+
+    @cached_property
+    def prefetcher(self) -> 'SearchPrefetcher':
+        from api.speculation import SearchPrefetcher
+        return SearchPrefetcher()
+
+    @cached_property
+    def similarity(self) -> 'SimilarityIndex':
+        # Индекс похожести использует NumPy, поэтому создается только при первом поиске похожих вакансий
+        from model.similarity import SimilarityIndex
+        return SimilarityIndex()
+
+    def close(self) -> None:
+        """
+        Функция останавливает фоновые запросы: заранее запрошенную выдачу и загрузку полных описаний.
+        Без этого потоки их пулов задерживают выход из программы до завершения начатых запросов.
+        """
+        # Вспомогательные объекты закрываются, только если они были созданы
+        for name in ('prefetcher', 'enricher'):
+            helper = self.__dict__.get(name)
+            if helper is not None:
+                helper.close()
 
     def user_interaction(self) -> None:
         """
@@ -141,6 +294,11 @@ class JobSearchApp:
                 # Добавление сортировки по ключевому слову
                 self.vacancy_filter.sort_with_keyword(keyword, api)
 
+            # Площадка и ключевое слово известны: пока пользователь отвечает на остальные вопросы,
+            # заранее запрашиваем выдачу для обеих сортировок
+            if self.speculative:
+                self.prefetcher.start(api, self.get_sort_variants(api))
+
             # Выбор сортировки которую хочет пользователь
             print('')
             self.text_style.print_yellow_bold(self.text_messages.get("sort_selection"))
@@ -158,39 +316,26 @@ class JobSearchApp:
             self.text_style.print_yellow_bold(self.text_messages.get("top_selection"))
             data_top = self.get_top_input()
 
-            # Получаем данные от api с примененными сортировками и конвертируем в короткий вид
-            response_from_api = self.vacancy_filter.get_sort_data(api)
-            response_after_convertation = self.converter.convert_vacancy_in_short_format(response_from_api, api)
-
-            # Убираем ненужные вакансии
-            response_after_clean = self.vacancy_filter.remove_bad_vacancies(response_after_convertation)
-
-            # Сохраняем короткую информацию о вакансиях (в будущем можно сделать доп. функционал за счет JSON файла)
-            self.json_handler.clear_json_file(self.save_filename)
-            self.json_handler.save_to_file(response_after_clean, self.save_filename)
-
-            # Получаем итоговый список вакансий
-            vacancies_response = self.json_handler.load_from_file(self.save_filename)
+            # Получаем итоговый список вакансий, следующие страницы выдачи загрузятся при пролистывании
+            try:
+                vacancies_response = self.get_result_set(api)
+            except (TimeoutError, requests.RequestException) as exc:
+                self.text_style.print_error(f'{exc} Попробуйте повторить поиск.')
+                continue
 
-            if vacancies_response == {}:
+            if len(vacancies_response) == 0:
                 self.text_style.print_error('По вашему запросу ничего не найдено.')
                 continue
 
-            while True:
-                # Выводим итоговый список вакансий
-                print('')
-                self.text_style.print_yellow_bold(
-                    f"Вот ваши Топ-{data_top} {name_sort} на платформе {api.get('name')}.")
-                self.vacancy_output.data_short_output(vacancies_response, data_top)
+            cursor = ResultCursor(vacancies_response, int(data_top))
 
-                # Даем пользователю выбрать любую вакансию из предложенного списка
-                print('')
-                self.text_style.print_yellow_bold(self.text_messages.get('num_view_vacancy'))
-                data_first_vacancy = self.get_view_vacancy(data_top)
+            while True:
+                # Выводим страницу списка вакансий и даем пользователю выбрать любую вакансию или пролистать список
+                data_first_vacancy = self.browse_vacancies(cursor, api, name_sort, 'num_view_vacancy')
 
                 # Получаем данные первой выбранной вакансии пользователем
-                vacancy_item = list(vacancies_response.items())[int(data_first_vacancy) - 1]
-                vacancy_1 = Vacancy(vacancy_item[1])
+                vacancy_item = vacancies_response.item(int(data_first_vacancy) - 1)
+                vacancy_1 = Vacancy(self.enricher.enrich_vacancy(vacancy_item[1], api, vacancy_item[0]))
 
                 # Выводим выбранную вакансию
                 print('')
@@ -207,20 +352,14 @@ class JobSearchApp:
 
                     # Пользователь выбирает сравнить 1 вакансию с другой
                     if data_first_menu == '1':
-                        # Еще раз выводим список вакансий
-                        print('')
-                        self.text_style.print_yellow_bold(
-                            f"Вот ваши Топ-{data_top} {name_sort} на платформе {api.get('name')}.")
-                        self.vacancy_output.data_short_output(vacancies_response, data_top)
-
-                        # Даем пользователю выбрать 2-ую вакансию из предложенного списка
-                        print('')
-                        self.text_style.print_yellow_bold(self.text_messages.get('num_second_view_vacancy'))
-                        data_second_vacancy = self.get_view_vacancy_for_comparison(data_top, data_first_vacancy)
+                        # Еще раз выводим список вакансий и даем пользователю выбрать 2-ую вакансию
+                        data_second_vacancy = self.browse_vacancies(cursor, api, name_sort, 'num_second_view_vacancy',
+                                                                    data_first_vacancy)
 
                         # Получаем данные второй выбранной вакансии пользователем
-                        second_vacancy_item = list(vacancies_response.items())[int(data_second_vacancy) - 1]
-                        vacancy_2 = Vacancy(second_vacancy_item[1])
+                        second_vacancy_item = vacancies_response.item(int(data_second_vacancy) - 1)
+                        vacancy_2 = Vacancy(
+                            self.enricher.enrich_vacancy(second_vacancy_item[1], api, second_vacancy_item[0]))
 
                         # Выводим 2 выбранную вакансию
                         print('')
@@ -258,17 +397,449 @@ class JobSearchApp:
                             if data_second_menu == '5':
                                 exit()
 
-                    # Пользователь выбирает, чтобы вернуться к вакансиям
+                    # Пользователь выбирает, чтобы посмотреть похожие вакансии
                     if data_first_menu == '2':
+                        print('')
+                        self.show_similar_vacancies(vacancies_response, vacancy_item[0], vacancy_1.data_vacancy)
+                        print('')
+                        self.text_style.print_yellow_bold(self.text_messages.get('menu_selection'))
+                        data_first_menu = self.get_first_menu()
+                        continue
+
+                    # Пользователь выбирает, чтобы вернуться к вакансиям
+                    if data_first_menu == '3':
                         break
 
                     # Пользователь выбирает выход из программы
-                    if data_first_menu == '3':
+                    if data_first_menu == '4':
                         exit()
 
                     if rollback == True:
                         break
 
+    def browse_vacancies(self, cursor: ResultCursor, api: dict, name_sort: str, message: str,
+                         selected_num: Optional[str] = None) -> str:
+        """
+        Функция выводит страницы списка вакансий, пока пользователь не выберет вакансию.
+
+        Parameters:
+        - cursor (ResultCursor): курсор списка вакансий.
+        - api (dict): выбранная площадка.
+        - name_sort (str): название сортировки для заголовка.
+        - message (str): ключ текста приглашения к выбору.
+        - selected_num (Optional[str]): номер уже выбранной вакансии при выборе второй вакансии.
+
+        Returns:
+        - str: номер выбранной вакансии в выдаче.
+        """
+        while True:
+            page = cursor.page()
+            first, last = page[0][0], page[-1][0]
+
+            # Пока пользователь смотрит страницу, в фоне загружаем полные описания показанных вакансий
+            if selected_num is None:
+                self.enricher.prefetch({key: vacancy for _, key, vacancy in page}, api, len(page))
+
+            print('')
+            self.text_style.print_yellow_bold(
+                f"Вот ваши Топ {first}-{last} {name_sort} на платформе {api.get('name')}.")
+            self.vacancy_output.page_output(page)
+
+            print('')
+            self.text_style.print_yellow_bold(self.text_messages.get(message))
+            if selected_num is None:
+                data_vacancy = self.get_view_vacancy(cursor)
+            else:
+                data_vacancy = self.get_view_vacancy_for_comparison(cursor, selected_num)
+
+            if data_vacancy.startswith(COMPARE_COMMAND):
+                self.show_comparison(cursor, data_vacancy[len(COMPARE_COMMAND):].strip())
+            elif data_vacancy == '>':
+                if cursor.next():
+                    continue
+                if cursor.results.timed_out:
+                    self.text_style.print_error('Площадка не ответила, попробуйте пролистать еще раз.')
+                else:
+                    self.text_style.print_error('Это последняя страница.')
+            elif data_vacancy == '<':
+                if not cursor.prev():
+                    self.text_style.print_error('Это первая страница.')
+            else:
+                return data_vacancy
+
+    def show_comparison(self, cursor: ResultCursor, selection: str) -> None:
+        """
+        Функция выводит таблицу сравнения группы вакансий: текущей страницы или выбранных номеров.
+        Недостающие страницы выдачи догружаются.
+
+        Parameters:
+        - cursor (ResultCursor): курсор списка вакансий.
+        - selection (str): номера вакансий вида "1-30,45" (пустая строка — текущая страница).
+        """
+        results = cursor.results
+        positions = self.input_checker.parse_selection(selection, results.limit) if selection else cursor.positions()
+        if not positions:
+            return
+        results.ensure(max(positions))
+        chosen = [(position, results[position - 1]) for position in positions if position <= len(results)]
+        if len(chosen) < 2:
+            self.text_style.print_error('Для сравнения нужно выбрать хотя бы 2 вакансии.')
+            return
+
+        print('')
+        self.vacancy_output.comparison_output(VacancyComparison(chosen, self.dimensions))
+        print('')
+        self.vacancy_output.continue_program_enter()
+
+    def show_similar_vacancies(self, results: ResultSet, key: str, vacancy: dict) -> None:
+        """
+        Функция выводит вакансии выдачи, наиболее похожие на выбранную. Индекс похожести
+        дополняется вакансиями, загруженными с прошлого обращения.
+
+        Parameters:
+        - results (ResultSet): набор результатов поиска.
+        - key (str): ключ выбранной вакансии.
+        - vacancy (dict): данные выбранной вакансии (с полным описанием, если оно загружено).
+        """
+        self.similarity.add_many(dict(results.loaded(len(self.similarity))))
+        similar = self.similarity.similar_to(vacancy, SIMILAR_TOP, exclude=(key,))
+        if not similar:
+            self.text_style.print_error('Похожих вакансий среди загруженных не найдено.')
+            return
+
+        self.text_style.print_yellow_bold(f'Похожие вакансии среди загруженных ({len(results)}):')
+        self.vacancy_output.similar_output([(results.position(similar_key) + 1, results[results.position(similar_key)],
+                                             score) for similar_key, score in similar])
+        print('')
+        self.vacancy_output.continue_program_enter()
+
+    def get_result_set(self, api: dict) -> ResultSet:
+        """
+        Функция выполняет поиск и возвращает набор результатов, следующие страницы
+        выдачи которого загружаются из api при пролистывании.
+
+        Parameters:
+        - api (dict): выбранная площадка.
+
+        Returns:
+        - ResultSet: набор результатов поиска.
+        """
+        vacancies = self.get_vacancies(api)
+        # Индекс похожести относится к прежней выдаче и будет создан заново при обращении
+        self.__dict__.pop('similarity', None)
+        spec = get_platform(api)
+        has_more = self.last_found > spec.page_size and spec.page_size < spec.max_results
+        results = ResultSet(vacancies, lambda page: self.load_result_page(api, page, results), has_more,
+                            spec.max_results)
+        return results
+
+    def load_result_page(self, api: dict, page: int, results: ResultSet) -> Tuple[dict, bool]:
+        """
+        Функция загружает следующую страницу выдачи api, конвертирует ее и убирает вакансии,
+        уже встреченные на прошлых страницах. Файл результатов дополняется новой страницей.
+
+        Parameters:
+        - api (dict): выбранная площадка.
+        - page (int): номер страницы выдачи (с нуля).
+        - results (ResultSet): набор результатов, который дополняется страницей.
+
+        Returns:
+        - Tuple[dict, bool]: вакансии страницы и признак того, что у выдачи есть следующие страницы.
+        """
+        spec = get_platform(api)
+        with metrics.timer('pipeline.stage', stage='fetch_page'):
+            response_from_api = api.get('api_class').get_data({**self.vacancy_filter.sort_params,
+                                                                **spec.page_params(page)})
+        items = response_from_api.get(spec.items_key) or []
+        response_after_convertation = self.converter.convert_vacancy_in_short_format(
+            response_from_api, api, start=page * spec.page_size + 1)
+        vacancies = self.vacancy_filter.remove_bad_vacancies(response_after_convertation, self.seen_vacancies)
+
+        self.json_handler.save_vacancies({**results.to_dict(), **vacancies}, self.save_filename)
+
+        found = min(response_from_api.get(spec.total_key) or 0, spec.max_results)
+        return vacancies, bool(items) and (page + 1) * spec.page_size < found
+
+    def get_vacancies(self, api: dict) -> dict:
+        """
+        Функция получает вакансии от api с примененными сортировками, конвертирует их
+        в короткий вид, убирает ненужные, сохраняет и при необходимости экспортирует.
+
+        Parameters:
+        - api (dict): выбранная площадка.
+
+        Returns:
+        - dict: итоговый список вакансий.
+        """
+        run_profile = self.profiler.profile('search') if self.profiler else nullcontext()
+        with run_profile, metrics.timer('pipeline.search', platform=get_platform(api).slug):
+            # Получаем данные от api с примененными сортировками и конвертируем в короткий вид
+            with metrics.timer('pipeline.stage', stage='fetch'):
+                # Выдача могла быть запрошена заранее, пока пользователь выбирал сортировку
+                response_from_api = self.prefetcher.take(api, self.vacancy_filter.sort_params) \
+                    if self.speculative else None
+                if response_from_api is None:
+                    response_from_api = self.vacancy_filter.get_sort_data(api)
+            with metrics.timer('pipeline.stage', stage='convert'):
+                response_after_convertation = self.converter.convert_vacancy_in_short_format(response_from_api, api)
+
+            # Убираем ненужные вакансии, запоминая их для следующих страниц выдачи
+            self.last_found = response_from_api.get(get_platform(api).total_key) or 0
+            self.seen_vacancies = set()
+            with metrics.timer('pipeline.stage', stage='dedup'):
+                response_after_clean = self.vacancy_filter.remove_bad_vacancies(response_after_convertation,
+                                                                                self.seen_vacancies)
+
+            return self.store_vacancies(response_after_clean, get_platform(api).slug,
+                                        self.vacancy_filter.sort_params)
+
+    def get_sort_variants(self, api: dict) -> List[dict]:
+        """
+        Функция возвращает параметры запроса к api для каждой сортировки с учетом уже выбранных параметров.
+
+        Parameters:
+        - api (dict): выбранная площадка.
+
+        Returns:
+        - List[dict]: параметры запроса для сортировки по зарплате и по дате публикации.
+        """
+        variants = []
+        for sort in (VacancyFilter.sort_top_salary_vacancies, VacancyFilter.sort_top_last_published_vacancies):
+            variant = VacancyFilter(self.dimensions)
+            variant.sort_params = dict(self.vacancy_filter.sort_params)
+            sort(variant, api)
+            variants.append(variant.sort_params)
+        return variants
+
+    def get_vacancies_from_platforms(self, keyword: Optional[str] = None, data_sort: str = '1',
+                                     region: Optional[str] = None, deadline: Optional[float] = None) -> dict:
+        """
+        Функция ищет вакансии одновременно на всех площадках. Площадка, не ответившая до крайнего
+        срока или для которой не удалось определить регион, пропускается: возвращаются вакансии
+        остальных, а пропущенные площадки и причины запоминаются в missed_platforms. Снимок поиска при неполном результате не обновляется,
+        чтобы вакансии пропущенной площадки не попали в ленту изменений как снятые.
+
+        Parameters:
+        - keyword (Optional[str]): ключевое слово для поиска.
+        - data_sort (str): сортировка ('1' — по зарплате, '2' — по дате публикации).
+        - region (Optional[str]): регион (название или идентификатор региона Head Hunter).
+        - deadline (Optional[float]): общий крайний срок поиска в секундах
+          (по умолчанию наибольший крайний срок поиска среди площадок).
+
+        Returns:
+        - dict: итоговый список вакансий.
+        """
+        from api.deadlines import gather_with_deadline
+
+        # У каждой площадки свои параметры запроса, поэтому и свой фильтр
+        searches: Dict[str, Tuple[dict, VacancyFilter]] = {}
+        region_failures: Dict[str, str] = {}
+        for api in self.api_list:
+            slug = get_platform(api).slug
+            vacancy_filter = VacancyFilter(self.dimensions)
+            if keyword:
+                vacancy_filter.sort_with_keyword(keyword, api)
+            if data_sort == '1':
+                vacancy_filter.sort_top_salary_vacancies(api)
+            elif data_sort == '2':
+                vacancy_filter.sort_top_last_published_vacancies(api)
+            if region:
+                # Неизвестный площадке регион или недоступный справочник городов не мешают остальным площадкам
+                try:
+                    vacancy_filter.sort_with_region(region, api, self.regions.index_for(api))
+                except Exception as error:
+                    region_failures[slug] = f'Не удалось определить регион: {str(error) or type(error).__name__}.'
+                    continue
+            searches[slug] = (api, vacancy_filter)
+        if deadline is None:
+            deadline = max((get_platform(api).deadlines.get('search') or 0 for api, _ in searches.values()),
+                           default=0) or None
+
+        run_profile = self.profiler.profile('search') if self.profiler else nullcontext()
+        with run_profile, metrics.timer('pipeline.search', platform='all'):
+            with metrics.timer('pipeline.stage', stage='fetch'):
+                responses, self.missed_platforms = gather_with_deadline(
+                    {slug: partial(vacancy_filter.get_sort_data, api)
+                     for slug, (api, vacancy_filter) in searches.items()}, deadline)
+                self.missed_platforms.update(region_failures)
+
+            # Ключи "vacancy N" нумеруются сквозь все площадки
+            vacancies: dict = {}
+            start = 1
+            self.last_found = 0
+            self.seen_vacancies = set()
+            for slug, (api, _) in searches.items():
+                if slug not in responses:
+                    continue
+                spec = get_platform(api)
+                with metrics.timer('pipeline.stage', stage='convert'):
+                    converted = self.converter.convert_vacancy_in_short_format(responses[slug], api, start=start)
+                start += len(responses[slug].get(spec.items_key) or [])
+                self.last_found += responses[slug].get(spec.total_key) or 0
+                with metrics.timer('pipeline.stage', stage='dedup'):
+                    vacancies.update(self.vacancy_filter.remove_bad_vacancies(converted, self.seen_vacancies))
+
+            return self.store_vacancies(vacancies, 'all',
+                                        {slug: vacancy_filter.sort_params
+                                         for slug, (_, vacancy_filter) in searches.items()},
+                                        complete=not self.missed_platforms)
+
+    def store_vacancies(self, vacancies: dict, platform: str, sort_params: dict, complete: bool = True) -> dict:
+        """
+        Функция сохраняет найденные вакансии, сравнивает их с прошлым запуском, сопоставляет
+        с подписками, дописывает в архив и при необходимости экспортирует.
+
+        Parameters:
+        - vacancies (dict): вакансии в коротком виде.
+        - platform (str): короткое имя площадки для имени снимка ('all' — все площадки).
+        - sort_params (dict): параметры поиска для имени снимка.
+        - complete (bool): ответили ли все площадки поиска (неполный результат не обновляет снимок).
+
+        Returns:
+        - dict: итоговый список вакансий.
+        """
+        # Сохраняем короткую информацию о вакансиях (в будущем можно сделать доп. функционал за счет JSON файла)
+        with metrics.timer('pipeline.stage', stage='save'):
+            self.json_handler.save_vacancies(vacancies, self.save_filename)
+
+        # Сравниваем результат с прошлым запуском того же поиска
+        self.last_changes = []
+        alert_changes = None
+        if self.snapshots is not None:
+            with metrics.timer('pipeline.stage', stage='diff'):
+                name = self.snapshots.snapshot_name(platform, sort_params)
+                if complete:
+                    self.last_changes = alert_changes = self.snapshots.record(name, vacancies)
+                else:
+                    # Неполный результат снимок не обновляет, но для оповещений сравнивается с прошлым снимком,
+                    # чтобы полученные вакансии не остались без оповещений
+                    alert_changes = self.snapshots.compare(name, vacancies)
+
+        # Сопоставляем вакансии с сохраненными поисками
+        if self.subscriptions is not None:
+            with metrics.timer('pipeline.stage', stage='alerts'):
+                self.last_alerts = self.match_subscriptions(vacancies, alert_changes)
+
+        # Дописываем результаты в архив обходов
+        if self.archive_filename:
+            with metrics.timer('pipeline.stage', stage='archive'):
+                from storage.archive import VacancyArchive
+                VacancyArchive(self.archive_filename).append(vacancies)
+
+        # Выгружаем результаты в машиночитаемом формате
+        if self.export_format:
+            with metrics.timer('pipeline.stage', stage='export'):
+                self.export_vacancies(vacancies)
+
+        with metrics.timer('pipeline.stage', stage='load'):
+            return self.json_handler.load_vacancies(self.save_filename)
+
+    def match_subscriptions(self, vacancies: dict, changes: Optional[List[dict]] = None) -> Dict[str, List[str]]:
+        """
+        Функция находит сохраненные поиски, которым подходят вакансии. Если переданы изменения
+        относительно прошлого снимка, сопоставляются только новые и измененные вакансии (ALERT_CHANGE_KINDS).
+
+        Parameters:
+        - vacancies (dict): вакансии в коротком виде.
+        - changes (Optional[List[dict]]): изменения относительно прошлого снимка (None — сопоставить все вакансии).
+
+        Returns:
+        - Dict[str, List[str]]: идентификатор подписки -> ключи подходящих вакансий.
+        """
+        if changes is not None:
+            from storage.snapshots import vacancy_identity
+
+            changed = {change['key'] for change in changes if change['op'] in ALERT_CHANGE_KINDS}
+            vacancies = {key: vacancy for key, vacancy in vacancies.items() if vacancy_identity(vacancy) in changed}
+        return self.subscriptions.match_many(vacancies)
+
+    def export_vacancies(self, vacancies: dict) -> str:
+        """
+        Функция выгружает вакансии в выбранном формате экспорта.
+
+        Parameters:
+        - vacancies (dict): вакансии в коротком виде.
+
+        Returns:
+        - str: имя файла экспорта.
+        """
+        filename = self.get_export_filename()
+        exporters.get_exporter(self.export_format).export(vacancies, filename)
+        return filename
+
+    def get_export_filename(self) -> str:
+        """
+        Функция возвращает имя файла экспорта для выбранного формата.
+        """
+        return self.export_filename or f'export.{exporters.get_exporter(self.export_format).extension}'
+
+    def run_headless(self, api: Optional[dict], keyword: Optional[str] = None, data_sort: str = '1',
+                     region: Optional[str] = None, salary_min: Optional[int] = None,
+                     salary_max: Optional[int] = None, guaranteed: Optional[int] = None,
+                     deadline: Optional[float] = None) -> dict:
+        """
+        Функция выполняет поиск без диалога с пользователем.
+
+        Parameters:
+        - api (Optional[dict]): выбранная площадка (None — все площадки одновременно).
+        - keyword (Optional[str]): ключевое слово для поиска.
+        - data_sort (str): сортировка ('1' — по зарплате, '2' — по дате публикации).
+        - region (Optional[str]): регион (название или идентификатор региона Head Hunter).
+        - salary_min (Optional[int]): нижняя граница диапазона зарплаты, с которым должна пересекаться вилка.
+        - salary_max (Optional[int]): верхняя граница этого диапазона.
+        - guaranteed (Optional[int]): минимальная гарантированная зарплата (нижняя граница вилки).
+        - deadline (Optional[float]): крайний срок поиска на всех площадках в секундах.
+
+        Returns:
+        - dict: итоговый список вакансий.
+        """
+        region_index = None
+        if api is None:
+            vacancies_response = self.get_vacancies_from_platforms(keyword, data_sort, region, deadline)
+            # Индекс городов общий для всех площадок, поэтому берется у любой площадки, для которой регион определен
+            if region:
+                region_index = next((self.regions.index_for(platform_api) for platform_api in self.api_list
+                                     if get_platform(platform_api).slug not in self.missed_platforms), None)
+            for slug, reason in self.missed_platforms.items():
+                self.text_style.print_error(f'{PLATFORMS[slug].name}: {reason} Показаны результаты остальных площадок.')
+        else:
+            if keyword:
+                self.vacancy_filter.sort_with_keyword(keyword, api)
+
+            if data_sort == '1':
+                self.vacancy_filter.sort_top_salary_vacancies(api)
+            elif data_sort == '2':
+                self.vacancy_filter.sort_top_last_published_vacancies(api)
+
+            # Регион ограничивается в запросе к API, а затем результат проверяется по индексу городов
+            if region:
+                try:
+                    region_index = self.regions.index_for(api)
+                    self.vacancy_filter.sort_with_region(region, api, region_index)
+                except Exception as error:
+                    self.text_style.print_error(f"{api.get('name')}: не удалось определить регион {region}: {error}")
+                    return {}
+
+            vacancies_response = self.get_vacancies(api)
+
+        if region_index is not None:
+            vacancies_response = self.vacancy_filter.filter_by_region(vacancies_response, region, region_index)
+        if salary_min is not None or salary_max is not None or guaranteed is not None:
+            vacancies_response = self.vacancy_filter.filter_by_salary(vacancies_response, salary_min, salary_max,
+                                                                      guaranteed)
+        self.text_style.print_message(f'Найдено вакансий: {len(vacancies_response)}.')
+        if self.export_format:
+            self.text_style.print_message(f'Результаты выгружены в {self.get_export_filename()}.')
+        if self.snapshots is not None:
+            counts = {op: sum(1 for change in self.last_changes if change['op'] == op)
+                      for op in ('new', 'removed', 'salary_changed')}
+            self.text_style.print_message(f"Новых: {counts['new']}, снятых: {counts['removed']}, "
+                                          f"с измененной зарплатой: {counts['salary_changed']}.")
+        if self.subscriptions is not None:
+            for search_id, keys in self.last_alerts.items():
+                self.text_style.print_message(f'Подписка {search_id}: подходящих вакансий {len(keys)}.')
+        return vacancies_response
+
     def get_platform_input(self) -> str:
         """
         Функция для выбора площадки специализированной на поиске вакансий.
@@ -328,43 +899,60 @@ class JobSearchApp:
         while True:
             data_top = input()
 
-            items = 30
-            if not self.input_checker.check_range_input(data_top, list(range(2, items + 1))):
+            if not self.input_checker.check_range_input(data_top, list(range(2, MAX_PAGE_SIZE + 1))):
                 continue
 
             break
 
         return data_top
 
-    def get_view_vacancy(self, data_top: str) -> str:
+    def get_view_vacancy(self, cursor: ResultCursor) -> str:
         """
-        Функция для опции выбора первой вакансии.
+        Функция для опции выбора первой вакансии или перехода по страницам.
 
         Parameters:
-        - data_top (str): количество вакансий в списке.
+        - cursor (ResultCursor): курсор на текущей странице списка.
+
+        Returns:
+        - str: номер вакансии в выдаче, '>', '<' или команда сравнения ('=' или '=1-30,45').
         """
         while True:
-            num_vacancy = input()
+            num_vacancy = input().strip()
+
+            if num_vacancy in PAGE_COMMANDS:
+                break
 
-            if not self.input_checker.check_range_input(num_vacancy, list(range(1, int(data_top) + 1))):
+            if num_vacancy.startswith(COMPARE_COMMAND):
+                selection = num_vacancy[len(COMPARE_COMMAND):].strip()
+                if selection and self.input_checker.parse_selection(selection, cursor.results.limit) is None:
+                    continue
+                break
+
+            if not self.input_checker.check_range_input(num_vacancy, cursor.positions()):
                 continue
 
             break
 
         return num_vacancy
 
-    def get_view_vacancy_for_comparison(self, data_top: str, selected_num: str) -> str:
+    def get_view_vacancy_for_comparison(self, cursor: ResultCursor, selected_num: str) -> str:
         """
-        Функция для опции выбора второй вакансии.
+        Функция для опции выбора второй вакансии или перехода по страницам.
 
         Parameters:
-        - data_top (str): количество вакансий в списке.
+        - cursor (ResultCursor): курсор на текущей странице списка.
         - selected_num (str): номер уже выбранной вакансии.
+
+        Returns:
+        - str: номер вакансии в выдаче, '>' или '<'.
         """
         while True:
-            num_vacancy = input()
+            num_vacancy = input().strip()
 
-            if not self.input_checker.check_range_input(num_vacancy, list(range(1, int(data_top) + 1))):
+            if num_vacancy in PAGE_COMMANDS:
+                break
+
+            if not self.input_checker.check_range_input(num_vacancy, cursor.positions()):
                 continue
 
             if num_vacancy == selected_num:
@@ -380,13 +968,14 @@ class JobSearchApp:
         1 функция для выбора нужных опций пользователю.
         """
         self.text_style.print_message('  1. Сравнить эту вакансию с другой.')
-        self.text_style.print_message('  2. Вернуться обратно к вакансиям.')
-        self.text_style.print_message('  3. Выйти из программы.')
+        self.text_style.print_message('  2. Показать похожие вакансии.')
+        self.text_style.print_message('  3. Вернуться обратно к вакансиям.')
+        self.text_style.print_message('  4. Выйти из программы.')
 
         while True:
             data_choice = input()
 
-            if not self.input_checker.check_range_input(data_choice, [1, 2, 3]):
+            if not self.input_checker.check_range_input(data_choice, [1, 2, 3, 4]):
                 continue
 
             break
@@ -414,8 +1003,125 @@ class JobSearchApp:
         return data_choice
 
 
+def parse_args(argv: Optional[List[str]] = None) -> 'argparse.Namespace':
+    """
+    Функция разбирает аргументы командной строки.
+
+    Parameters:
+    - argv (Optional[List[str]]): аргументы (по умолчанию sys.argv).
+    """
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Поиск вакансий на Head Hunter и Super Job.')
+    arg_parser.add_argument('--headless', action='store_true',
+                            help='выполнить поиск без диалога с пользователем')
+    arg_parser.add_argument('--platform', choices=[*PLATFORMS, 'all'], default='hh',
+                            help='площадка для поиска в режиме --headless (all — все площадки одновременно)')
+    arg_parser.add_argument('--keyword', help='ключевое слово для поиска в режиме --headless')
+    arg_parser.add_argument('--sort', choices=['salary', 'date'], default='salary',
+                            help='сортировка в режиме --headless')
+    arg_parser.add_argument('--region', help='регион или город для поиска в режиме --headless')
+    arg_parser.add_argument('--salary-min', type=int,
+                            help='в режиме --headless: вилка зарплаты пересекается с диапазоном от этой суммы')
+    arg_parser.add_argument('--salary-max', type=int,
+                            help='в режиме --headless: вилка зарплаты пересекается с диапазоном до этой суммы')
+    arg_parser.add_argument('--guaranteed', type=int,
+                            help='в режиме --headless: нижняя граница вилки не меньше этой суммы')
+    arg_parser.add_argument('--deadline', type=float,
+                            help='крайний срок ответа площадки на поиск, секунды (0 — без срока)')
+    arg_parser.add_argument('--hedge-after', type=float,
+                            help='через сколько секунд без ответа повторять запрос поиска (0 — не повторять)')
+    arg_parser.add_argument('--export', choices=['ndjson', 'csv', 'columnar'],
+                            help='выгрузить результаты поиска в машиночитаемом формате')
+    arg_parser.add_argument('--output', help='имя файла экспорта')
+    arg_parser.add_argument('--metrics', choices=['off', 'memory', 'log', 'prometheus'],
+                            help='приемник метрик (по умолчанию из переменной окружения JOBSEARCH_METRICS)')
+    arg_parser.add_argument('--metrics-port', type=int,
+                            help='порт HTTP-эндпоинта /metrics для приемника prometheus')
+    arg_parser.add_argument('--profile', action='store_true',
+                            help='профилировать запуски поиска (cProfile и tracemalloc)')
+    arg_parser.add_argument('--profile-dir', default='profiles', help='каталог для результатов профилирования')
+    arg_parser.add_argument('--profile-sample', type=float, default=1.0,
+                            help='доля профилируемых запусков от 0 до 1')
+    arg_parser.add_argument('--save-file', metavar='FILE',
+                            help='файл результатов поиска (по умолчанию свой для каждого сеанса в каталоге results, '
+                                 'где хранятся файлы последних 20 сеансов)')
+    arg_parser.add_argument('--archive', metavar='FILE',
+                            help='дописывать результаты поиска в сжатый архив (python -m storage.archive)')
+    arg_parser.add_argument('--subscriptions', metavar='FILE',
+                            help='JSON-файл сохраненных поисков, которым сопоставляются найденные вакансии')
+    arg_parser.add_argument('--snapshots', metavar='DIR',
+                            help='каталог снимков: сравнивать результат с прошлым запуском и вести ленту изменений')
+    cassette_group = arg_parser.add_mutually_exclusive_group()
+    cassette_group.add_argument('--record', metavar='FILE',
+                                help='записывать запросы к API и ответы в кассету (python -m api.cassette)')
+    cassette_group.add_argument('--replay', metavar='FILE',
+                                help='отвечать на запросы к API из кассеты, без обращения к сети')
+    arg_parser.add_argument('--replay-latency', type=float, default=0.0,
+                            help='постоянная задержка ответа при --replay, секунды')
+    arg_parser.add_argument('--replay-latency-scale', type=float, default=0.0,
+                            help='при --replay задерживать ответ на записанную длительность запроса, умноженную на это число')
+    arg_parser.add_argument('--no-speculative', dest='speculative', action='store_false',
+                            help='не запрашивать выдачу заранее, пока в диалоге выбирается сортировка')
+    return arg_parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    hh_api = {"api_class": HHJobSearchAPI(), "name": "Head Hunter"}
-    super_job_api = {"api_class": SuperJobAPI(api_key), "name": "Super Job"}
-    job_search_app = JobSearchApp([hh_api, super_job_api])
-    job_search_app.user_interaction()
+    args = parse_args()
+    if args.metrics:
+        if args.metrics == 'log':
+            import logging
+            logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+        configure_metrics(args.metrics, args.metrics_port)
+    else:
+        # Приемник из переменных окружения подключен при импорте, а эндпоинт запускается только здесь
+        serve_from_env()
+
+    if args.deadline is not None or args.hedge_after is not None:
+        from api.deadlines import set_deadline
+        for slug in PLATFORMS:
+            set_deadline(slug, 'search', args.deadline, args.hedge_after)
+
+    api_list = build_api_list()
+    if args.record:
+        import atexit
+        from api.cassette import Cassette, record_api_list
+        cassette = Cassette(args.record)
+        api_list = record_api_list(api_list, cassette)
+        # Кассета сохраняется при любом завершении, в том числе через пункт меню "Выйти"
+        atexit.register(cassette.save)
+    elif args.replay:
+        from api.cassette import Cassette, replay_api_list
+        api_list = replay_api_list(api_list, Cassette.load(args.replay), args.replay_latency,
+                                   args.replay_latency_scale)
+    run_profiler = RunProfiler(args.profile_dir, args.profile_sample) if args.profile else None
+    snapshot_store = None
+    if args.snapshots:
+        from storage.snapshots import SnapshotStore
+        snapshot_store = SnapshotStore(args.snapshots)
+    subscription_index = None
+    if args.subscriptions:
+        from model.alerts import SubscriptionStore
+        subscription_index = SubscriptionStore(args.subscriptions).load()
+    job_search_app = JobSearchApp(api_list, export_format=args.export, export_filename=args.output,
+                                  profiler=run_profiler, snapshots=snapshot_store,
+                                  subscriptions=subscription_index, archive_filename=args.archive,
+                                  save_filename=args.save_file, speculative=args.speculative)
+
+    try:
+        if args.headless:
+            platform_api = None if args.platform == 'all' else api_list[list(PLATFORMS).index(args.platform)]
+            job_search_app.run_headless(platform_api, args.keyword, '1' if args.sort == 'salary' else '2',
+                                        args.region, args.salary_min, args.salary_max, args.guaranteed,
+                                        args.deadline or None)
+
+            # В режиме без диалога накопленные метрики выводятся в stderr
+            if hasattr(metrics.sink, 'snapshot'):
+                import json
+                import sys
+                print(json.dumps(metrics.sink.snapshot(), ensure_ascii=False), file=sys.stderr)
+        else:
+            job_search_app.user_interaction()
+    finally:
+        # Выход через пункт меню "Выйти" (exit()) тоже проходит здесь
+        job_search_app.close()
@@ -0,0 +1,196 @@
+"""
+Фикстуры ответов API Head Hunter и Super Job для бенчмарков.
+
+Фикстуры хранятся в benchmarks/fixtures/ в «сыром» формате API. Их можно:
+    - записать с живого API:  python -m benchmarks.fixtures record [--pages 2]
+    - собрать из образца optimize_data.json без сети:  python -m benchmarks.fixtures build
+
+Для замеров на больших объемах payload размножается функцией scale_payload.
+"""
+import argparse
+import copy
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from api.platforms import PLATFORMS
+
+ROOT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR: str = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures')
+SAMPLE_FILE: str = os.path.join(ROOT_DIR, 'optimize_data.json')
+
+# Ключ списка вакансий в ответе API каждой площадки
+ITEMS_KEY: Dict[str, str] = {slug: spec.items_key for slug, spec in PLATFORMS.items()}
+
+# Идентификаторы городов, используемые при сборке фикстур из образца
+CITY_IDS: Dict[str, int] = {'Москва': 1, 'Санкт-Петербург': 2, 'Екатеринбург': 3, 'Казань': 88,
+                            'Самара': 78, 'Краснодар': 53, 'Сочи': 237, 'Адлер': 1438,
+                            'Киев': 115, 'Ташкент': 2759, 'ОАЭ': 2780}
+
+
+def fixture_path(platform: str) -> str:
+    """
+    Возвращает путь к файлу фикстуры площадки.
+    """
+    return os.path.join(FIXTURES_DIR, f'{platform}_vacancies.json')
+
+
+def load_fixture(platform: str) -> Dict[str, Any]:
+    """
+    Загружает фикстуру ответа API площадки.
+
+    Parameters:
+        platform (str): Площадка ('hh' или 'superjob').
+
+    Returns:
+        Dict[str, Any]: Ответ API в сыром формате.
+    """
+    with open(fixture_path(platform), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_fixture(platform: str, payload: Dict[str, Any]) -> None:
+    """
+    Сохраняет фикстуру ответа API площадки.
+    """
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    with open(fixture_path(platform), 'w', encoding='utf-8') as file:
+        json.dump(payload, file, ensure_ascii=False)
+
+
+def scale_payload(payload: Dict[str, Any], platform: str, records: int) -> Dict[str, Any]:
+    """
+    Размножает вакансии фикстуры до нужного количества, выдавая копиям новые идентификаторы.
+
+    Parameters:
+        payload (Dict[str, Any]): Ответ API в сыром формате.
+        platform (str): Площадка ('hh' или 'superjob').
+        records (int): Нужное количество вакансий.
+
+    Returns:
+        Dict[str, Any]: Ответ API с records вакансиями.
+    """
+    items_key = ITEMS_KEY[platform]
+    source: List[Dict] = payload[items_key]
+    items: List[Dict] = []
+    for number in range(records):
+        item = copy.deepcopy(source[number % len(source)])
+        copy_number = number // len(source)
+        if copy_number:
+            item['id'] = f"{item['id']}{copy_number:04d}" if platform == 'hh' else int(item['id']) * 10000 + copy_number
+            if platform == 'hh':
+                item['name'] = f"{item['name']} #{copy_number}"
+            else:
+                item['profession'] = f"{item['profession']} #{copy_number}"
+        items.append(item)
+
+    scaled = {key: value for key, value in payload.items() if key != items_key}
+    scaled[items_key] = items
+    if platform == 'hh':
+        scaled.update({'found': records, 'pages': 1, 'page': 0, 'per_page': records})
+    else:
+        scaled.update({'total': records, 'more': False})
+    return scaled
+
+
+def build_from_sample(sample_file: str = SAMPLE_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Собирает фикстуры обеих площадок из образца вакансий в кратком формате.
+    Часть вакансий намеренно получает валюту, отличную от рубля, или остается без зарплаты,
+    чтобы замеры проходили через все ветки адаптеров.
+
+    Parameters:
+        sample_file (str): Файл с вакансиями в кратком формате.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Ответы API по площадкам.
+    """
+    with open(sample_file, 'r', encoding='utf-8') as file:
+        sample: Dict[str, Dict] = json.load(file)
+
+    hh_items: List[Dict] = []
+    superjob_items: List[Dict] = []
+    for number, vacancy in enumerate(sample.values()):
+        vacancy_id = int(vacancy['url'].rstrip('/').rsplit('/', 1)[-1])
+        employer_id = int(vacancy['employer']['url'].rstrip('/').rsplit('/', 1)[-1])
+        city_id = CITY_IDS.get(vacancy['city'], 1)
+        published = datetime.strptime(vacancy['published_at'], '%Y-%m-%d %H:%M:%S')
+        currency = 'USD' if number % 10 == 3 else 'RUR'
+        salary = vacancy['salary'] if currency == 'RUR' else vacancy['salary'] // 89
+        salary_from = salary // 2 if number % 3 else None
+        salary_to = None if number % 4 == 1 else salary
+
+        hh_items.append({
+            'id': str(vacancy_id),
+            'name': vacancy['title'],
+            'alternate_url': vacancy['url'],
+            'url': f'https://api.hh.ru/vacancies/{vacancy_id}',
+            'salary': None if number % 17 == 5 else {'from': salary_from, 'to': salary_to,
+                                                     'currency': currency, 'gross': False},
+            'snippet': {'requirement': vacancy['description'], 'responsibility': None},
+            'area': {'id': str(city_id), 'name': vacancy['city'],
+                     'url': f'https://api.hh.ru/areas/{city_id}'},
+            'published_at': published.strftime('%Y-%m-%dT%H:%M:%S+0300'),
+            'employer': {'id': str(employer_id), 'name': vacancy['employer']['name'],
+                         'alternate_url': vacancy['employer']['url']},
+        })
+        superjob_items.append({
+            'id': vacancy_id,
+            'profession': vacancy['title'],
+            'link': f'https://www.superjob.ru/vakansii/{vacancy_id}.html',
+            'payment_from': salary_from or 0,
+            'payment_to': 0 if number % 17 == 5 else (salary_to or 0),
+            'currency': 'rub',
+            'candidat': vacancy['description'],
+            'town': {'id': city_id, 'title': vacancy['city']},
+            'date_published': int(published.timestamp()),
+            'client': {'id': employer_id, 'title': vacancy['employer']['name'],
+                       'link': f'https://www.superjob.ru/clients/{employer_id}.html'},
+        })
+
+    return {
+        'hh': {'items': hh_items, 'found': len(hh_items), 'pages': 1, 'page': 0, 'per_page': len(hh_items)},
+        'superjob': {'objects': superjob_items, 'total': len(superjob_items), 'more': False},
+    }
+
+
+def record(pages: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+    Записывает фикстуры с живых API площадок.
+
+    Parameters:
+        pages (int): Количество страниц каждой площадки.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Ответы API по площадкам.
+    """
+    from api.hh_api import HHJobSearchAPI
+    from api.superjob_api import SuperJobAPI
+
+    clients = {'hh': HHJobSearchAPI(), 'superjob': SuperJobAPI()}
+    payloads: Dict[str, Dict[str, Any]] = {}
+    for platform, client in clients.items():
+        items: List[Dict] = []
+        payload: Dict[str, Any] = {}
+        for page in range(pages):
+            payload = client.get_data({'page': page})
+            items.extend(payload[ITEMS_KEY[platform]])
+            time.sleep(0.5)
+        payload[ITEMS_KEY[platform]] = items
+        payloads[platform] = payload
+    return payloads
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Подготовка фикстур для бенчмарков.')
+    arg_parser.add_argument('command', choices=['build', 'record'],
+                            help='build — собрать из optimize_data.json, record — записать с живого API')
+    arg_parser.add_argument('--pages', type=int, default=1, help='количество страниц для record')
+    args = arg_parser.parse_args()
+
+    result = build_from_sample() if args.command == 'build' else record(args.pages)
+    for platform_name, platform_payload in result.items():
+        save_fixture(platform_name, platform_payload)
+        print(f'{fixture_path(platform_name)}: {len(platform_payload[ITEMS_KEY[platform_name]])} вакансий')
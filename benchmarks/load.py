@@ -0,0 +1,278 @@
+"""
+Нагрузочный тест конвейера поиска: много одновременных пользователей ищут вакансии.
+
+Каждый виртуальный пользователь — отдельный JobSearchApp (как отдельный сеанс приложения)
+в своем потоке. Пользователь выполняет несколько поисков со случайной площадкой, ключевым словом
+и сортировкой из заданной смеси и пролистывает несколько страниц выдачи, поэтому нагружается
+весь путь fetch -> convert -> dedup -> save -> load и догрузка страниц. Ответы отдает локальный
+стаб-сервер, сеть не нужна.
+
+Отчет:
+    throughput    — поисков и вакансий в секунду за все время теста;
+    latency       — перцентили длительности одного поиска (с пролистыванием страниц);
+    memory        — RSS процесса в начале, в конце и пиковый, рост на 1000 поисков;
+    upstream      — запросы к стаб-серверу: всего, по видам и на один поиск пользователя.
+
+Параметр --stragglers задерживает долю ответов, чтобы проверить, как дублирующие запросы
+и крайние сроки (--hedge-after, --deadline) срезают хвост распределения задержек.
+
+Пример:
+    python -m benchmarks.load --users 50 --searches 10 --records 2000 --latency 0.05
+    python -m benchmarks.load --latency 0.05 --stragglers 0.02 3 --hedge-after 0.3
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from api.deadlines import set_deadline
+from api.hh_api import HHJobSearchAPI
+from api.platforms import PLATFORMS, get_platform
+from api.rate_limit import set_rate_limit
+from api.superjob_api import SuperJobAPI
+from app import JobSearchApp
+from benchmarks.fixtures import ROOT_DIR, load_fixture, scale_payload
+from benchmarks.run import git_revision
+from benchmarks.stats import summarize
+from benchmarks.stub_server import StubAPIServer
+
+DEFAULT_OUTPUT: str = os.path.join(ROOT_DIR, 'benchmarks', 'results', 'load.json')
+
+# Интервал замера RSS процесса, секунды
+MEMORY_SAMPLE_INTERVAL: float = 0.05
+
+
+def current_rss() -> int:
+    """
+    Возвращает резидентную память процесса в байтах (на Linux — текущую, иначе — пиковую).
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemorySampler:
+    """
+    Фоновый замер RSS процесса на время теста.
+
+    Attributes:
+        start (int): RSS в начале теста, байты.
+        peak (int): Наибольший замеренный RSS, байты.
+    """
+
+    def __init__(self, interval: float = MEMORY_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.start = current_rss()
+        self.peak = self.start
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self) -> 'MemorySampler':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+def run_user(user: int, searches: int, mix: Dict[str, List[str]], pages: List[int], api_list: List[dict],
+             directory: str, seed: int) -> List[Dict[str, Any]]:
+    """
+    Выполняет поиски одного виртуального пользователя.
+
+    Parameters:
+        user (int): Номер пользователя.
+        searches (int): Количество поисков.
+        mix (Dict[str, List[str]]): Варианты 'platforms', 'keywords' и 'sorts' (повтор варианта — его вес).
+        pages (List[int]): Наименьшее и наибольшее количество просматриваемых страниц выдачи.
+        api_list (List[dict]): Площадки (общие клиенты стаб-сервера).
+        directory (str): Каталог файлов результатов пользователей.
+        seed (int): Начальное значение генератора случайных чисел.
+
+    Returns:
+        List[Dict[str, Any]]: Замер каждого поиска.
+    """
+    rng = random.Random(seed + user)
+    apis = {get_platform(api).slug: api for api in api_list}
+    app = JobSearchApp(api_list, save_filename=os.path.join(directory, f'user{user}.json'))
+    samples = []
+
+    for _ in range(searches):
+        slug = rng.choice(mix['platforms'])
+        api = apis[slug]
+        keyword = rng.choice(mix['keywords'])
+        sort = rng.choice(mix['sorts'])
+        browsed = rng.randint(pages[0], pages[-1])
+
+        app.vacancy_filter.sort_params = {}
+        if keyword:
+            app.vacancy_filter.sort_with_keyword(keyword, api)
+        if sort == 'salary':
+            app.vacancy_filter.sort_top_salary_vacancies(api)
+        else:
+            app.vacancy_filter.sort_top_last_published_vacancies(api)
+
+        start = time.perf_counter()
+        error = None
+        loaded = 0
+        try:
+            results = app.get_result_set(api)
+            results.ensure(browsed * PLATFORMS[slug].page_size)
+            loaded = len(results)
+        except Exception as exc:
+            error = type(exc).__name__
+        samples.append({'platform': slug, 'seconds': time.perf_counter() - start, 'records': loaded,
+                        'pages': browsed, 'error': error})
+    return samples
+
+
+def run(users: int, searches: int, records: int, latency: float, mix: Dict[str, List[str]], pages: List[int],
+        rate_limit: bool, seed: int, stragglers: Optional[List[float]] = None, hedge_after: Optional[float] = None,
+        deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Выполняет нагрузочный тест.
+
+    Parameters:
+        users (int): Количество одновременных пользователей.
+        searches (int): Количество поисков каждого пользователя.
+        records (int): Количество вакансий в выдаче каждой площадки стаб-сервера.
+        latency (float): Задержка ответа стаб-сервера в секундах.
+        mix (Dict[str, List[str]]): Смесь площадок, ключевых слов и сортировок.
+        pages (List[int]): Наименьшее и наибольшее количество просматриваемых страниц.
+        rate_limit (bool): Соблюдать ограничения частоты запросов площадок.
+        seed (int): Начальное значение генератора случайных чисел.
+        stragglers (Optional[List[float]]): Доля медленных ответов стаб-сервера и их дополнительная задержка.
+        hedge_after (Optional[float]): Задержка дублирующего запроса поиска (0 — не дублировать).
+        deadline (Optional[float]): Крайний срок запроса поиска (0 — без срока).
+
+    Returns:
+        Dict[str, Any]: Результаты в машиночитаемом виде.
+    """
+    payloads = {slug: scale_payload(load_fixture(slug), slug, records) for slug in PLATFORMS}
+    if not rate_limit:
+        # Стаб-сервер не ограничивает частоту, поэтому замеряется сам конвейер, а не ожидание лимита
+        for slug in PLATFORMS:
+            set_rate_limit(slug, 1e9)
+    for slug in PLATFORMS:
+        set_deadline(slug, 'search', deadline, hedge_after)
+
+    straggler_rate, straggler_latency = stragglers or (0.0, 0.0)
+    with StubAPIServer(payloads, latency, straggler_rate, straggler_latency) as server, tempfile.TemporaryDirectory() as directory:
+        api_list = [{'api_class': HHJobSearchAPI(base_url=server.url), 'name': PLATFORMS['hh'].name},
+                    {'api_class': SuperJobAPI(api_token='load', base_url=server.url),
+                     'name': PLATFORMS['superjob'].name}]
+
+        with MemorySampler() as memory, ThreadPoolExecutor(max_workers=users) as executor:
+            started = time.perf_counter()
+            futures = [executor.submit(run_user, user, searches, mix, pages, api_list, directory, seed)
+                       for user in range(users)]
+            samples = [sample for future in futures for sample in future.result()]
+            elapsed = time.perf_counter() - started
+        upstream = server.requests_served
+        upstream_by_kind = server.requests_by_kind
+
+    succeeded = [sample for sample in samples if sample['error'] is None]
+    errors: Dict[str, int] = {}
+    for sample in samples:
+        if sample['error'] is not None:
+            errors[sample['error']] = errors.get(sample['error'], 0) + 1
+    end_rss = current_rss()
+    loaded_records = sum(sample['records'] for sample in succeeded)
+    browsed_pages = sum(sample['pages'] for sample in samples)
+
+    return {
+        'meta': {
+            'commit': git_revision(),
+            'python': platform.python_version(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'users': users,
+            'searches_per_user': searches,
+            'records': records,
+            'latency_s': latency,
+            'mix': mix,
+            'pages': pages,
+            'rate_limit': rate_limit,
+            'stragglers': stragglers,
+            'search_deadline_s': {slug: spec.deadlines.get('search') for slug, spec in PLATFORMS.items()},
+            'search_hedge_after_s': {slug: spec.hedge_after.get('search') for slug, spec in PLATFORMS.items()},
+        },
+        'throughput': {
+            'elapsed_s': round(elapsed, 3),
+            'searches': len(samples),
+            'errors': errors,
+            'searches_per_sec': round(len(succeeded) / elapsed, 2) if elapsed else 0.0,
+            'records_per_sec': round(loaded_records / elapsed, 1) if elapsed else 0.0,
+        },
+        'latency': summarize([sample['seconds'] for sample in succeeded]) if succeeded else {},
+        'memory': {
+            'rss_start_mb': round(memory.start / 2 ** 20, 1),
+            'rss_end_mb': round(end_rss / 2 ** 20, 1),
+            'rss_peak_mb': round(memory.peak / 2 ** 20, 1),
+            'growth_per_1000_searches_mb': round((end_rss - memory.start) / 2 ** 20 / len(samples) * 1000, 2)
+            if samples else 0.0,
+        },
+        'upstream': {
+            'requests': upstream,
+            'by_kind': upstream_by_kind,
+            'per_search': round(upstream / len(samples), 3) if samples else 0.0,
+            'per_browsed_page': round(upstream / browsed_pages, 3) if browsed_pages else 0.0,
+        },
+    }
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',')]
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Нагрузочный тест конвейера поиска вакансий.')
+    arg_parser.add_argument('--users', type=int, default=20, help='одновременных пользователей')
+    arg_parser.add_argument('--searches', type=int, default=5, help='поисков каждого пользователя')
+    arg_parser.add_argument('--records', type=int, default=1000, help='вакансий в выдаче каждой площадки')
+    arg_parser.add_argument('--latency', type=float, default=0.0, help='задержка стаб-сервера, секунды')
+    arg_parser.add_argument('--platforms', type=parse_list, default=list(PLATFORMS),
+                            help='площадки через запятую (повтор площадки увеличивает ее долю)')
+    arg_parser.add_argument('--keywords', type=parse_list, default=['', 'python', 'менеджер', 'водитель'],
+                            help='ключевые слова через запятую (пустое — поиск без ключевого слова)')
+    arg_parser.add_argument('--sorts', type=parse_list, default=['salary', 'date'], help='сортировки через запятую')
+    arg_parser.add_argument('--pages', type=int, nargs=2, default=[1, 3], metavar=('MIN', 'MAX'),
+                            help='сколько страниц выдачи просматривает пользователь')
+    arg_parser.add_argument('--rate-limit', action='store_true',
+                            help='соблюдать ограничения частоты запросов площадок')
+    arg_parser.add_argument('--stragglers', type=float, nargs=2, metavar=('RATE', 'SECONDS'),
+                            help='доля медленных ответов стаб-сервера и их дополнительная задержка')
+    arg_parser.add_argument('--hedge-after', type=float,
+                            help='через сколько секунд без ответа повторять запрос поиска (0 — не повторять)')
+    arg_parser.add_argument('--deadline', type=float, help='крайний срок запроса поиска, секунды (0 — без срока)')
+    arg_parser.add_argument('--seed', type=int, default=1, help='начальное значение генератора случайных чисел')
+    arg_parser.add_argument('--output', default=DEFAULT_OUTPUT, help='файл для результатов в формате JSON')
+    args = arg_parser.parse_args()
+
+    unknown = [slug for slug in args.platforms if slug not in PLATFORMS]
+    if unknown:
+        arg_parser.error(f"неизвестные площадки: {', '.join(unknown)}")
+    results = run(args.users, args.searches, args.records, args.latency,
+                  {'platforms': args.platforms, 'keywords': args.keywords, 'sorts': args.sorts},
+                  args.pages, args.rate_limit, args.seed, args.stragglers, args.hedge_after, args.deadline)
+    with open(args.output, 'w') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
@@ -0,0 +1,191 @@
+"""
+Сквозной бенчмарк конвейера поиска вакансий на записанных фикстурах.
+
+Ответы API отдаются локальным стаб-сервером, поэтому сеть не нужна. Замеряются этапы:
+    fetch.<площадка>    — запрос к API через клиент (HTTP + декодирование JSON);
+    convert.<площадка>  — Converter.convert_vacancy_in_short_format;
+    dedup.<площадка>    — VacancyFilter.remove_bad_vacancies;
+    save / load         — JSONHandler.save_vacancies / load_vacancies;
+    render              — вывод короткого списка и карточек вакансий.
+
+Результаты пишутся в JSON, два файла результатов можно сравнить:
+    python -m benchmarks.run --records 5000 --output bench.json
+    python -m benchmarks.run --compare old.json new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from api.hh_api import HHJobSearchAPI
+from api.platforms import PLATFORMS
+from api.superjob_api import SuperJobAPI
+from benchmarks.fixtures import ITEMS_KEY, ROOT_DIR, load_fixture, scale_payload
+from benchmarks.stats import summarize
+from benchmarks.stub_server import StubAPIServer
+from model.vacancies import Vacancy, VacancyFilter, VacancyOutput
+from storage.dimensions import VacancyDimensions
+from storage.json_handler import Converter, JSONHandler
+
+DEFAULT_OUTPUT: str = os.path.join(ROOT_DIR, 'benchmarks', 'results', 'pipeline.json')
+
+# Площадка фикстуры -> отображаемое имя площадки
+PLATFORM_NAMES: Dict[str, str] = {slug: spec.name for slug, spec in PLATFORMS.items()}
+
+
+def measure(function: Callable[[], Any], repeat: int, records: int) -> Dict[str, float]:
+    """
+    Выполняет функцию repeat раз и возвращает статистику задержки и пропускной способности.
+
+    Parameters:
+        function (Callable[[], Any]): Замеряемая функция.
+        repeat (int): Количество повторов.
+        records (int): Количество вакансий, обрабатываемых за один вызов.
+
+    Returns:
+        Dict[str, float]: Статистика этапа.
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+
+    result: Dict[str, float] = {'runs': repeat, 'records': records}
+    result.update(summarize(samples))
+    median = result['median_ms'] / 1000
+    result['records_per_sec'] = round(records / median, 1) if median else 0.0
+    return result
+
+
+def git_revision() -> Optional[str]:
+    """
+    Возвращает хеш текущего коммита, если репозиторий доступен.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def render(vacancies: Dict[str, Dict], top: int) -> None:
+    """
+    Выводит короткий список и карточки top вакансий (вывод перенаправляется вызывающим).
+    """
+    page = [(position, key, vacancy) for position, (key, vacancy) in enumerate(vacancies.items(), start=1)][:top]
+    VacancyOutput().page_output(page)
+    for _, _, vacancy_data in page:
+        Vacancy(vacancy_data).__str__()
+
+
+def run(records: int, repeat: int, latency: float) -> Dict[str, Any]:
+    """
+    Выполняет все этапы бенчмарка.
+
+    Parameters:
+        records (int): Количество вакансий в ответе каждой площадки.
+        repeat (int): Количество повторов каждого этапа.
+        latency (float): Искусственная задержка ответа стаб-сервера в секундах.
+
+    Returns:
+        Dict[str, Any]: Результаты в машиночитаемом виде.
+    """
+    payloads = {name: scale_payload(load_fixture(name), name, records) for name in PLATFORM_NAMES}
+    dimensions = VacancyDimensions()
+    converter = Converter(dimensions)
+    vacancy_filter = VacancyFilter(dimensions)
+    json_handler = JSONHandler(dimensions)
+    stages: Dict[str, Dict[str, float]] = {}
+    cleaned: Dict[str, Dict] = {}
+
+    with StubAPIServer(payloads, latency=latency) as server:
+        clients = {'hh': HHJobSearchAPI(base_url=server.url),
+                   'superjob': SuperJobAPI(api_token='benchmark', base_url=server.url)}
+        # Один ответ сервера должен содержать все вакансии фикстуры
+        page_params = {slug: PLATFORMS[slug].page_params(0, records) for slug in clients}
+
+        for name, client in clients.items():
+            stages[f'fetch.{name}'] = measure(lambda: client.get_data(page_params[name]), repeat, records)
+
+    for name, payload in payloads.items():
+        api = {'name': PLATFORM_NAMES[name]}
+        converted = converter.convert_vacancy_in_short_format(payload, api)
+        stages[f'convert.{name}'] = measure(
+            lambda: converter.convert_vacancy_in_short_format(payload, api), repeat, len(payload[ITEMS_KEY[name]]))
+        stages[f'dedup.{name}'] = measure(lambda: vacancy_filter.remove_bad_vacancies(converted), repeat,
+                                          len(converted))
+        cleaned.update({f'{name} {key}': value for key, value in
+                        vacancy_filter.remove_bad_vacancies(converted).items()})
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.path.join(temp_dir, 'bench_data.json')
+        stages['save'] = measure(lambda: json_handler.save_vacancies(cleaned, filename), repeat, len(cleaned))
+        stages['load'] = measure(lambda: json_handler.load_vacancies(filename), repeat, len(cleaned))
+        stages['save']['bytes'] = os.path.getsize(filename)
+
+    top = min(30, len(cleaned))
+    with contextlib.redirect_stdout(io.StringIO()):
+        stages['render'] = measure(lambda: render(cleaned, top), repeat, top)
+
+    return {
+        'meta': {
+            'commit': git_revision(),
+            'python': platform.python_version(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'records': records,
+            'repeat': repeat,
+            'latency_s': latency,
+        },
+        'stages': stages,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """
+    Сравнивает медианы этапов двух запусков.
+
+    Parameters:
+        old (Dict[str, Any]): Результаты базового запуска.
+        new (Dict[str, Any]): Результаты нового запуска.
+
+    Returns:
+        List[str]: Строки отчета.
+    """
+    lines = [f"{'stage':<18}{'old ms':>12}{'new ms':>12}{'change':>10}"]
+    for stage, stats in new['stages'].items():
+        if stage not in old['stages']:
+            continue
+        old_median = old['stages'][stage]['median_ms']
+        new_median = stats['median_ms']
+        change = (new_median - old_median) / old_median * 100 if old_median else 0.0
+        lines.append(f'{stage:<18}{old_median:>12.3f}{new_median:>12.3f}{change:>+9.1f}%')
+    return lines
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Сквозной бенчмарк конвейера поиска вакансий.')
+    arg_parser.add_argument('--records', type=int, default=1000, help='вакансий в ответе каждой площадки')
+    arg_parser.add_argument('--repeat', type=int, default=10, help='повторов каждого этапа')
+    arg_parser.add_argument('--latency', type=float, default=0.0, help='задержка стаб-сервера, секунды')
+    arg_parser.add_argument('--output', default=DEFAULT_OUTPUT, help='файл для результатов в формате JSON')
+    arg_parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='сравнить два файла результатов')
+    args = arg_parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as old_file, open(args.compare[1]) as new_file:
+            print('\n'.join(compare(json.load(old_file), json.load(new_file))))
+        sys.exit(0)
+
+    results = run(args.records, args.repeat, args.latency)
+    with open(args.output, 'w') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
@@ -0,0 +1,79 @@
+"""
+Бенчмарк запуска приложения: время импорта app.py и время до первого вопроса пользователю.
+
+Запуск из корня репозитория:
+    python -m benchmarks.startup [--runs 20] [--output benchmarks/results/startup.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict
+
+from benchmarks.stats import summarize
+
+ROOT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT: str = os.path.join(ROOT_DIR, 'benchmarks', 'results', 'startup.json')
+
+IMPORT_SNIPPET: str = 'import time; start = time.perf_counter(); import app; print(time.perf_counter() - start)'
+
+
+def measure_interpreter() -> float:
+    """
+    Измеряет время запуска пустого интерпретатора (базовая линия).
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], cwd=ROOT_DIR, check=True)
+    return time.perf_counter() - start
+
+
+def measure_import() -> float:
+    """
+    Измеряет время импорта модуля app в свежем интерпретаторе.
+    """
+    result = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], cwd=ROOT_DIR,
+                            check=True, capture_output=True, text=True)
+    return float(result.stdout.strip())
+
+
+def measure_first_prompt() -> float:
+    """
+    Измеряет время от запуска процесса app.py до появления первого вопроса пользователю.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-u', 'app.py'], cwd=ROOT_DIR,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        process.stdout.readline()
+        return time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+
+
+def run(runs: int) -> Dict:
+    """
+    Выполняет все замеры и возвращает результаты.
+    """
+    return {
+        'python': platform.python_version(),
+        'runs': runs,
+        'interpreter': summarize([measure_interpreter() for _ in range(runs)]),
+        'import_app': summarize([measure_import() for _ in range(runs)]),
+        'time_to_first_prompt': summarize([measure_first_prompt() for _ in range(runs)]),
+    }
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Бенчмарк запуска приложения.')
+    arg_parser.add_argument('--runs', type=int, default=20, help='количество запусков')
+    arg_parser.add_argument('--output', default=DEFAULT_OUTPUT, help='файл для результатов в формате JSON')
+    args = arg_parser.parse_args()
+
+    results = run(args.runs)
+    with open(args.output, 'w') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
@@ -0,0 +1,40 @@
+"""
+Общие функции статистики для бенчмарков.
+"""
+import statistics
+from typing import Dict, List, Sequence
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """
+    Возвращает перцентиль отсортированной выборки (ближайший ранг).
+
+    Parameters:
+        ordered (Sequence[float]): Отсортированная выборка.
+        fraction (float): Доля от 0 до 1 (например, 0.95).
+
+    Returns:
+        float: Значение перцентиля.
+    """
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Считает сводную статистику по замерам (в секундах) и возвращает ее в миллисекундах.
+
+    Parameters:
+        samples (List[float]): Замеры в секундах.
+
+    Returns:
+        Dict[str, float]: Медиана, минимум, среднее и перцентили p90/p95/p99.
+    """
+    ordered = sorted(samples)
+    return {
+        'median_ms': round(statistics.median(ordered) * 1000, 3),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'p90_ms': round(percentile(ordered, 0.90) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+    }
@@ -0,0 +1,206 @@
+"""
+Локальный стаб-сервер, отдающий записанные ответы API Head Hunter и Super Job.
+
+Сервер повторяет пути настоящих API (/vacancies и /2.0/vacancies/) и учитывает
+параметры размера страницы (per_page / count) и номера страницы (page). Запрос одной
+вакансии (/vacancies/{id} и /2.0/vacancies/{id}/) возвращает ее запись из фикстуры
+с полным HTML-описанием. Доля ответов stragglers задерживается дополнительно на
+straggler_latency секунд — так имитируются редкие медленные ответы настоящих API.
+
+Пример:
+    with StubAPIServer({'hh': hh_payload, 'superjob': superjob_payload}) as server:
+        HHJobSearchAPI(base_url=server.url).get_data()
+"""
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from api.platforms import PLATFORMS
+
+# Путь запроса -> площадка
+ROUTES: Dict[str, str] = {'/vacancies': 'hh', '/2.0/vacancies/': 'superjob', '/2.0/vacancies': 'superjob'}
+
+# Пути запроса одной вакансии: (шаблон, площадка)
+DETAIL_ROUTES = [(re.compile(r'^/vacancies/([^/]+)$'), 'hh'),
+                 (re.compile(r'^/2\.0/vacancies/([^/]+)/?$'), 'superjob')]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: '_StubHTTPServer'
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        platform = ROUTES.get(parsed.path)
+        if platform is not None and platform in self.server.payloads:
+            query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+            response = self.server.page(platform, query)
+            self.server.count(f'{platform}.search')
+        else:
+            response = self.server.detail(parsed.path)
+            if response is None:
+                self.send_error(404)
+                return
+            self.server.count('detail')
+
+        body = json.dumps(response, ensure_ascii=False).encode('utf-8')
+
+        delay = self.server.latency
+        if self.server.stragglers and random.random() < self.server.stragglers:
+            delay += self.server.straggler_latency
+            self.server.count('straggler', served=False)
+        if delay:
+            time.sleep(delay)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Логи запросов только мешают замерам
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, payloads: Dict[str, Dict[str, Any]], latency: float, stragglers: float = 0.0,
+                 straggler_latency: float = 0.0) -> None:
+        super().__init__(('127.0.0.1', 0), _StubHandler)
+        self.payloads = payloads
+        self.latency = latency
+        self.stragglers = stragglers
+        self.straggler_latency = straggler_latency
+        self.requests_served = 0
+        self.requests_by_kind: Dict[str, int] = {}
+        self._details: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._count_lock = threading.Lock()
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Клиент, не дождавшийся задержанного ответа, закрывает соединение — это не ошибка сервера
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def count(self, kind: str, served: bool = True) -> None:
+        """
+        Учитывает обслуженный запрос (обработчики работают в разных потоках). Событие
+        с served=False (задержанный ответ) учитывается только в своем виде.
+        """
+        with self._count_lock:
+            self.requests_served += served
+            self.requests_by_kind[kind] = self.requests_by_kind.get(kind, 0) + 1
+
+    def page(self, platform: str, query: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Вырезает страницу из записанного ответа по параметрам запроса.
+        """
+        spec = PLATFORMS[platform]
+        payload = self.payloads[platform]
+        items = payload[spec.items_key]
+        size = int(query.get(spec.page_size_param, len(items)) or len(items))
+        number = int(query.get(spec.page_param, 0))
+        chunk = items[number * size:(number + 1) * size]
+
+        result = {key: value for key, value in payload.items() if key != spec.items_key}
+        result[spec.items_key] = chunk
+        if platform == 'hh':
+            result.update({'found': len(items), 'page': number, 'per_page': size,
+                           'pages': (len(items) + size - 1) // size})
+        else:
+            result.update({'total': len(items), 'more': (number + 1) * size < len(items)})
+        return result
+
+    def detail(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает запись одной вакансии с полным описанием или None, если путь или вакансия не найдены.
+        """
+        for pattern, platform in DETAIL_ROUTES:
+            match = pattern.match(path)
+            if match is None or platform not in self.payloads:
+                continue
+            if platform not in self._details:
+                items = self.payloads[platform][PLATFORMS[platform].items_key]
+                self._details[platform] = {str(item['id']): item for item in items}
+            item = self._details[platform].get(match.group(1))
+            if item is None:
+                return None
+            if platform == 'hh':
+                requirement = (item.get('snippet') or {}).get('requirement') or ''
+                return {**item, 'description': f'<p><strong>Требования:</strong> {requirement}</p>'}
+            return {**item, 'vacancyRichText': f"<p>{item.get('candidat') or ''}</p>"}
+        return None
+
+
+class StubAPIServer:
+    """
+    Стаб-сервер API в отдельном потоке.
+
+    Attributes:
+        payloads (Dict[str, Dict[str, Any]]): Ответы API по площадкам ('hh', 'superjob').
+        latency (float): Искусственная задержка каждого ответа в секундах.
+        stragglers (float): Доля ответов с дополнительной задержкой (от 0 до 1).
+        straggler_latency (float): Дополнительная задержка медленных ответов в секундах.
+    """
+
+    def __init__(self, payloads: Dict[str, Dict[str, Any]], latency: float = 0.0, stragglers: float = 0.0,
+                 straggler_latency: float = 0.0) -> None:
+        self.payloads = payloads
+        self.latency = latency
+        self.stragglers = stragglers
+        self.straggler_latency = straggler_latency
+        self._server: Optional[_StubHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        Возвращает базовый адрес запущенного сервера.
+        """
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def requests_served(self) -> int:
+        """
+        Возвращает количество обслуженных запросов.
+        """
+        return self._server.requests_served if self._server else 0
+
+    @property
+    def requests_by_kind(self) -> Dict[str, int]:
+        """
+        Возвращает количество обслуженных запросов по видам ('hh.search', 'superjob.search', 'detail')
+        и количество задержанных ответов ('straggler').
+        """
+        return dict(self._server.requests_by_kind) if self._server else {}
+
+    def start(self) -> 'StubAPIServer':
+        """
+        Запускает сервер в фоновом потоке.
+        """
+        self._server = _StubHTTPServer(self.payloads, self.latency, self.stragglers, self.straggler_latency)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Останавливает сервер.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+
+    def __enter__(self) -> 'StubAPIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -1,6 +1,22 @@
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Any, Optional
 
-# Загружает переменные окружения из файла .env и возвращает значение API_KEY.
-load_dotenv()
-api_key: str = os.getenv('API_KEY')
+
+@lru_cache(maxsize=None)
+def get_api_key() -> Optional[str]:
+    """
+    Загружает переменные окружения из файла .env и возвращает значение API_KEY.
+    dotenv импортируется при первом вызове, чтобы не замедлять запуск приложения.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.getenv('API_KEY')
+
+
+def __getattr__(name: str) -> Any:
+    # Обратная совместимость: `from implemented import api_key` загружает ключ лениво.
+    if name == 'api_key':
+        return get_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,53 @@
+import importlib
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyImport:
+    """
+    Прокси для модуля (или его атрибута), который импортируется при первом обращении.
+
+    Attributes:
+    - module_name (str): имя модуля.
+    - attribute (Optional[str]): имя атрибута модуля (например, 'Fore' у colorama).
+    """
+
+    def __init__(self, module_name: str, attribute: Optional[str] = None) -> None:
+        self.__dict__['_module_name'] = module_name
+        self.__dict__['_attribute'] = attribute
+        self.__dict__['_target'] = None
+
+    def _load(self) -> Any:
+        """
+        Функция импортирует модуль при первом обращении и кэширует результат.
+        """
+        target = self.__dict__['_target']
+        if target is None:
+            module: ModuleType = importlib.import_module(self.__dict__['_module_name'])
+            attribute = self.__dict__['_attribute']
+            target = getattr(module, attribute) if attribute else module
+            self.__dict__['_target'] = target
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._load(), name, value)
+
+    def __repr__(self) -> str:
+        return f"<LazyImport {self.__dict__['_module_name']} {self.__dict__['_attribute'] or ''}>"
+
+
+def lazy_import(module_name: str, attribute: Optional[str] = None) -> Any:
+    """
+    Функция возвращает прокси модуля, откладывающий импорт до первого использования.
+
+    Parameters:
+    - module_name (str): имя модуля.
+    - attribute (Optional[str]): имя атрибута модуля.
+
+    Returns:
+    - Any: прокси модуля или атрибута.
+    """
+    return LazyImport(module_name, attribute)
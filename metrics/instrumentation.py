@@ -0,0 +1,156 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from metrics.sinks import AbstractMetricsSink, InMemorySink, LogSink, NullSink, PrometheusSink
+
+# Переменные окружения для включения инструментирования без изменения кода
+METRICS_ENV: str = 'JOBSEARCH_METRICS'
+METRICS_PORT_ENV: str = 'JOBSEARCH_METRICS_PORT'
+
+logger = logging.getLogger('jobsearch.metrics')
+
+METRICS_SINKS = {
+    'off': NullSink,
+    'memory': InMemorySink,
+    'log': LogSink,
+    'prometheus': PrometheusSink,
+}
+
+
+class Metrics:
+    """
+    Точка инструментирования: таймеры и счетчики, передаваемые в подключаемый приемник.
+
+    Attributes:
+        sink (AbstractMetricsSink): Приемник измерений.
+    """
+
+    def __init__(self, sink: Optional[AbstractMetricsSink] = None) -> None:
+        self.sink: AbstractMetricsSink = sink or NullSink()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Возвращает True, если измерения куда-то записываются.
+        """
+        return not isinstance(self.sink, NullSink)
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Увеличивает счетчик.
+
+        Parameters:
+            name (str): Имя счетчика.
+            value (float): Приращение.
+            **labels (Any): Метки (например, platform='Head Hunter').
+        """
+        if value:
+            self.sink.record('counter', name, value, labels)
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """
+        Записывает длительность операции.
+
+        Parameters:
+            name (str): Имя таймера.
+            seconds (float): Длительность в секундах.
+            **labels (Any): Метки.
+        """
+        self.sink.record('timer', name, seconds, labels)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """
+        Контекстный менеджер, замеряющий длительность блока кода.
+
+        Parameters:
+            name (str): Имя таймера.
+            **labels (Any): Метки.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+
+def create_sink(kind: str, port: Optional[int] = None) -> AbstractMetricsSink:
+    """
+    Создает приемник метрик по названию.
+
+    Parameters:
+        kind (str): Вид приемника ('off', 'memory', 'log' или 'prometheus').
+        port (Optional[int]): Порт HTTP-эндпоинта /metrics для приемника 'prometheus'.
+
+    Returns:
+        AbstractMetricsSink: Приемник метрик.
+    """
+    try:
+        sink = METRICS_SINKS[kind]()
+    except KeyError:
+        raise ValueError(f"Неизвестный приемник метрик: {kind}. "
+                         f"Доступные приемники: {', '.join(METRICS_SINKS)}.") from None
+
+    if isinstance(sink, PrometheusSink) and port is not None:
+        sink.serve(port)
+    return sink
+
+
+def configure_metrics(kind: str, port: Optional[int] = None) -> Metrics:
+    """
+    Подключает к глобальному объекту metrics приемник указанного вида. Если порт эндпоинта
+    /metrics занят или недоступен, метрики отключаются с предупреждением, а приложение продолжает работу.
+
+    Parameters:
+        kind (str): Вид приемника ('off', 'memory', 'log' или 'prometheus').
+        port (Optional[int]): Порт HTTP-эндпоинта /metrics для приемника 'prometheus'.
+
+    Returns:
+        Metrics: Глобальный объект metrics.
+    """
+    try:
+        metrics.sink = create_sink(kind, port)
+    except OSError as error:
+        logger.warning('Не удалось запустить эндпоинт метрик на порту %s: %s. Метрики отключены.', port, error)
+        metrics.sink = NullSink()
+    return metrics
+
+
+def _sink_from_env() -> AbstractMetricsSink:
+    """
+    Создает приемник по переменной окружения JOBSEARCH_METRICS. Вызывается при импорте модуля,
+    поэтому не запускает HTTP-эндпоинт (это делает serve_from_env) и не завершается ошибкой:
+    при неизвестном приемнике метрики отключаются с предупреждением.
+    """
+    kind = os.getenv(METRICS_ENV, 'off')
+    try:
+        return create_sink(kind)
+    except ValueError as error:
+        logger.warning('%s Метрики отключены.', error)
+        return NullSink()
+
+
+def serve_from_env() -> Optional[int]:
+    """
+    Запускает HTTP-эндпоинт /metrics на порту из переменной окружения JOBSEARCH_METRICS_PORT,
+    если глобальный приемник — 'prometheus'. Если порт задан неверно или занят, приложение
+    продолжает работу без эндпоинта, а в журнал пишется предупреждение.
+
+    Returns:
+        Optional[int]: Фактический порт эндпоинта или None, если эндпоинт не запущен.
+    """
+    port = os.getenv(METRICS_PORT_ENV)
+    if not port or not isinstance(metrics.sink, PrometheusSink):
+        return None
+    try:
+        return metrics.sink.serve(int(port))
+    except (ValueError, OSError) as error:
+        logger.warning('Не удалось запустить эндпоинт метрик на порту %s: %s', port, error)
+        return None
+
+
+# Глобальный объект инструментирования, используемый всеми слоями приложения
+metrics: Metrics = Metrics(_sink_from_env())
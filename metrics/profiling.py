@@ -0,0 +1,176 @@
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from metrics.instrumentation import metrics
+
+# Переменные окружения для включения профилирования без изменения кода
+PROFILE_ENV: str = 'JOBSEARCH_PROFILE'
+PROFILE_DIR_ENV: str = 'JOBSEARCH_PROFILE_DIR'
+PROFILE_SAMPLE_ENV: str = 'JOBSEARCH_PROFILE_SAMPLE'
+
+DEFAULT_PROFILE_DIR: str = 'profiles'
+
+# Классы горячего пути, которые выделяются в отчете: (модуль, класс)
+FOCUS_CLASSES: List[Tuple[str, str]] = [
+    ('storage.json_handler', 'Converter'),
+    ('model.vacancies', 'VacancyFilter'),
+    ('storage.json_handler', 'JSONHandler'),
+]
+
+# Ключ функции в статистике cProfile: (файл, строка, имя)
+FunctionKey = Tuple[str, int, str]
+
+
+def focus_functions() -> Dict[FunctionKey, str]:
+    """
+    Сопоставляет ключи функций cProfile с квалифицированными именами методов классов горячего пути.
+
+    Returns:
+        Dict[FunctionKey, str]: Ключ функции -> 'Класс.метод'.
+    """
+    import importlib
+
+    functions: Dict[FunctionKey, str] = {}
+    for module_name, class_name in FOCUS_CLASSES:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        for attribute_name, attribute in vars(cls).items():
+            function = getattr(attribute, '__func__', attribute)
+            code = getattr(function, '__code__', None)
+            if code is not None:
+                functions[(code.co_filename, code.co_firstlineno, code.co_name)] = f'{class_name}.{attribute_name}'
+    return functions
+
+
+class RunProfiler:
+    """
+    Опциональное профилирование запусков поиска через cProfile и tracemalloc.
+
+    Для каждого попавшего в выборку запуска в отдельный каталог сохраняются:
+        profile.prof          — статистика cProfile (открывается pstats или snakeviz);
+        allocations.snapshot  — снимок tracemalloc;
+        summary.txt           — отчет по самым затратным функциям и строкам с выделениями памяти,
+                                отдельно для Converter, VacancyFilter и JSONHandler.
+
+    Attributes:
+        directory (str): Каталог для результатов профилирования.
+        sample_rate (float): Доля профилируемых запусков от 0 до 1.
+        trace_memory (bool): Снимать ли снимки выделений памяти.
+        top (int): Количество строк в каждом разделе отчета.
+    """
+
+    def __init__(self, directory: str = DEFAULT_PROFILE_DIR, sample_rate: float = 1.0,
+                 trace_memory: bool = True, top: int = 20) -> None:
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.trace_memory = trace_memory
+        self.top = top
+
+    @classmethod
+    def from_env(cls) -> Optional['RunProfiler']:
+        """
+        Создает профилировщик по переменным окружения или возвращает None, если профилирование выключено.
+
+        Returns:
+            Optional[RunProfiler]: Профилировщик или None.
+        """
+        if os.getenv(PROFILE_ENV, '').lower() not in ('1', 'true', 'yes', 'on'):
+            return None
+        return cls(directory=os.getenv(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR),
+                   sample_rate=float(os.getenv(PROFILE_SAMPLE_ENV, '1')))
+
+    @contextmanager
+    def profile(self, run_name: str = 'search') -> Iterator[Optional[str]]:
+        """
+        Профилирует блок кода, если запуск попал в выборку.
+
+        Parameters:
+            run_name (str): Название запуска (часть имени каталога с результатами).
+
+        Yields:
+            Optional[str]: Каталог с результатами или None, если запуск не профилируется.
+        """
+        import random
+
+        if random.random() >= self.sample_rate:
+            yield None
+            return
+
+        import cProfile
+        import tracemalloc
+
+        run_dir = os.path.join(self.directory,
+                               f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{os.getpid()}-{run_name}")
+        os.makedirs(run_dir, exist_ok=True)
+
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(10)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield run_dir
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot() if self.trace_memory and tracemalloc.is_tracing() else None
+            if started_tracing:
+                tracemalloc.stop()
+            self._dump(run_dir, profiler, snapshot)
+            metrics.increment('profiling.runs', run=run_name)
+
+    def _dump(self, run_dir: str, profiler, snapshot) -> None:
+        """
+        Сохраняет профиль, снимок памяти и сводный отчет запуска.
+        """
+        import pstats
+
+        profiler.dump_stats(os.path.join(run_dir, 'profile.prof'))
+        stats = pstats.Stats(profiler)
+        lines: List[str] = self._function_report(stats)
+
+        if snapshot is not None:
+            snapshot.dump(os.path.join(run_dir, 'allocations.snapshot'))
+            lines.extend(self._allocation_report(snapshot))
+
+        with open(os.path.join(run_dir, 'summary.txt'), 'w', encoding='utf-8') as file:
+            file.write('\n'.join(lines) + '\n')
+
+    def _function_report(self, stats) -> List[str]:
+        """
+        Формирует разделы отчета по функциям: общий топ и топ методов классов горячего пути.
+        """
+        focus = focus_functions()
+        rows = [(key, values) for key, values in stats.stats.items()]
+
+        lines = [f'Топ-{self.top} функций по суммарному времени (cumtime):',
+                 f"{'ncalls':>10}{'tottime':>12}{'cumtime':>12}  функция"]
+        for key, (_, ncalls, tottime, cumtime, _) in sorted(rows, key=lambda row: row[1][3], reverse=True)[:self.top]:
+            name = focus.get(key) or f'{os.path.basename(key[0])}:{key[1]}({key[2]})'
+            lines.append(f'{ncalls:>10}{tottime:>12.6f}{cumtime:>12.6f}  {name}')
+
+        lines.extend(['', 'Методы Converter, VacancyFilter и JSONHandler:',
+                      f"{'ncalls':>10}{'tottime':>12}{'cumtime':>12}  метод"])
+        focus_rows = [(focus[key], values) for key, values in rows if key in focus]
+        for name, (_, ncalls, tottime, cumtime, _) in sorted(focus_rows, key=lambda row: row[1][3], reverse=True):
+            lines.append(f'{ncalls:>10}{tottime:>12.6f}{cumtime:>12.6f}  {name}')
+        return lines
+
+    def _allocation_report(self, snapshot) -> List[str]:
+        """
+        Формирует разделы отчета по выделениям памяти: общий топ и строки модулей горячего пути.
+        """
+        import importlib
+        import tracemalloc
+
+        focus_files = {importlib.import_module(module).__file__ for module, _ in FOCUS_CLASSES}
+        filters = [tracemalloc.Filter(True, filename) for filename in focus_files]
+
+        lines = ['', f'Топ-{self.top} строк по объему выделенной памяти:']
+        for stat in snapshot.statistics('lineno')[:self.top]:
+            lines.append(f'{stat.size / 1024:>10.1f} KiB {stat.count:>8} блоков  {stat.traceback}')
+
+        lines.extend(['', 'Выделения памяти в модулях Converter, VacancyFilter и JSONHandler:'])
+        for stat in snapshot.filter_traces(filters).statistics('lineno')[:self.top]:
+            lines.append(f'{stat.size / 1024:>10.1f} KiB {stat.count:>8} блоков  {stat.traceback}')
+        return lines
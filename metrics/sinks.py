@@ -0,0 +1,213 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+# Ключ метрики: имя и отсортированные метки
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def make_key(name: str, labels: Dict[str, Any]) -> MetricKey:
+    """
+    Формирует ключ метрики из имени и меток.
+
+    Parameters:
+        name (str): Имя метрики.
+        labels (Dict[str, Any]): Метки метрики.
+
+    Returns:
+        MetricKey: Ключ метрики.
+    """
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class AbstractMetricsSink(ABC):
+    @abstractmethod
+    def record(self, kind: str, name: str, value: float, labels: Dict[str, Any]) -> None:
+        """
+        Абстрактный метод для приема одного измерения.
+
+        Parameters:
+            kind (str): Вид метрики ('counter' или 'timer').
+            name (str): Имя метрики.
+            value (float): Значение (приращение счетчика или длительность в секундах).
+            labels (Dict[str, Any]): Метки метрики.
+        """
+        pass
+
+
+class NullSink(AbstractMetricsSink):
+    """
+    Приемник, который отбрасывает все измерения (инструментирование выключено).
+    """
+
+    def record(self, kind: str, name: str, value: float, labels: Dict[str, Any]) -> None:
+        pass
+
+
+class InMemorySink(AbstractMetricsSink):
+    """
+    Приемник, накапливающий счетчики и статистику таймеров в памяти (удобен для тестов).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters: Dict[MetricKey, float] = {}
+        # Для таймеров: [количество, сумма, минимум, максимум]
+        self.timers: Dict[MetricKey, List[float]] = {}
+
+    def record(self, kind: str, name: str, value: float, labels: Dict[str, Any]) -> None:
+        key = make_key(name, labels)
+        with self._lock:
+            if kind == 'counter':
+                self.counters[key] = self.counters.get(key, 0) + value
+                return
+            stats = self.timers.get(key)
+            if stats is None:
+                self.timers[key] = [1, value, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                stats[2] = min(stats[2], value)
+                stats[3] = max(stats[3], value)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        """
+        Возвращает значение счетчика (0, если измерений не было).
+        """
+        return self.counters.get(make_key(name, labels), 0)
+
+    def timer_stats(self, name: str, **labels: Any) -> Optional[Dict[str, float]]:
+        """
+        Возвращает статистику таймера или None, если измерений не было.
+        """
+        stats = self.timers.get(make_key(name, labels))
+        if stats is None:
+            return None
+        return {'count': stats[0], 'sum': stats[1], 'min': stats[2], 'max': stats[3]}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Возвращает копию всех накопленных метрик.
+        """
+        with self._lock:
+            return {
+                'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                             for (name, labels), value in self.counters.items()],
+                'timers': [{'name': name, 'labels': dict(labels), 'count': stats[0], 'sum': stats[1],
+                            'min': stats[2], 'max': stats[3]}
+                           for (name, labels), stats in self.timers.items()],
+            }
+
+    def reset(self) -> None:
+        """
+        Сбрасывает все накопленные метрики.
+        """
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+
+class LogSink(AbstractMetricsSink):
+    """
+    Приемник, записывающий каждое измерение строкой в лог.
+    """
+
+    def __init__(self, logger_name: str = 'jobsearch.metrics') -> None:
+        import logging
+
+        self.logger = logging.getLogger(logger_name)
+
+    def record(self, kind: str, name: str, value: float, labels: Dict[str, Any]) -> None:
+        labels_text = ' '.join(f'{key}={value}' for key, value in sorted(labels.items()))
+        if kind == 'timer':
+            self.logger.info('timer %s %.3fms %s', name, value * 1000, labels_text)
+        else:
+            self.logger.info('counter %s +%g %s', name, value, labels_text)
+
+
+class PrometheusSink(InMemorySink):
+    """
+    Приемник, отдающий накопленные метрики в текстовом формате Prometheus.
+    Счетчики выводятся как counter, таймеры — как summary (_count и _sum в секундах).
+    """
+
+    def __init__(self, prefix: str = 'jobsearch') -> None:
+        super().__init__()
+        self.prefix = prefix
+        self._server = None
+
+    def _metric_name(self, name: str) -> str:
+        return f"{self.prefix}_{name.replace('.', '_').replace('-', '_')}"
+
+    @staticmethod
+    def _labels_text(labels: Tuple[Tuple[str, str], ...]) -> str:
+        if not labels:
+            return ''
+        escaped = (value.replace('\\', '\\\\').replace('"', '\\"') for _, value in labels)
+        return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+    def render(self) -> str:
+        """
+        Возвращает метрики в текстовом формате Prometheus.
+        """
+        lines: List[str] = []
+        with self._lock:
+            typed: set = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = self._metric_name(name) + '_total'
+                if metric not in typed:
+                    lines.append(f'# TYPE {metric} counter')
+                    typed.add(metric)
+                lines.append(f'{metric}{self._labels_text(labels)} {value:g}')
+            for (name, labels), stats in sorted(self.timers.items()):
+                metric = self._metric_name(name) + '_seconds'
+                if metric not in typed:
+                    lines.append(f'# TYPE {metric} summary')
+                    typed.add(metric)
+                lines.append(f'{metric}_count{self._labels_text(labels)} {stats[0]:g}')
+                lines.append(f'{metric}_sum{self._labels_text(labels)} {stats[1]:.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> int:
+        """
+        Запускает HTTP-эндпоинт /metrics в фоновом потоке.
+
+        Parameters:
+            port (int): Порт (0 — выбрать свободный).
+            host (str): Адрес для прослушивания.
+
+        Returns:
+            int: Фактический порт эндпоинта.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        sink = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = sink.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+    def shutdown(self) -> None:
+        """
+        Останавливает HTTP-эндпоинт, если он запущен.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
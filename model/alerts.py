@@ -0,0 +1,219 @@
+import json
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from metrics.instrumentation import metrics
+from storage.locking import atomic_write
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    """
+    Разбивает текст на множество слов в нижнем регистре.
+
+    Аргументы:
+        text (Optional[str]): Текст.
+
+    Возвращает:
+        Set[str]: Слова текста.
+    """
+    return set(WORD_PATTERN.findall(text.lower())) if text else set()
+
+
+class SavedSearch:
+    def __init__(self, search_id: str, keyword: Optional[str] = None, city: Optional[str] = None,
+                 min_salary: Optional[int] = None, platform: Optional[str] = None):
+        """
+        Инициализирует сохраненный поиск. Незаполненные условия подходят к любой вакансии.
+
+        Аргументы:
+            search_id (str): Идентификатор подписки.
+            keyword (Optional[str]): Ключевые слова, которые должны встретиться в названии вакансии.
+            city (Optional[str]): Город.
+            min_salary (Optional[int]): Минимальная зарплата в рублях.
+            platform (Optional[str]): Короткое имя площадки ('hh', 'superjob').
+        """
+        self.search_id = search_id
+        self.keyword = keyword
+        self.city = city
+        self.min_salary = min_salary
+        self.platform = platform
+        self.tokens = tokenize(keyword)
+
+    def matches(self, vacancy: dict) -> bool:
+        """
+        Проверяет вакансию на соответствие поиску без индекса.
+
+        Аргументы:
+            vacancy (dict): Вакансия в кратком формате.
+
+        Возвращает:
+            bool: Подходит ли вакансия.
+        """
+        return (self.tokens <= tokenize(vacancy.get('title'))
+                and (self.city is None or self.city == vacancy.get('city'))
+                and (self.platform is None or self.platform == vacancy.get('platform'))
+                and (self.min_salary is None or (vacancy.get('salary') or 0) >= self.min_salary))
+
+    def to_dict(self) -> dict:
+        return {'id': self.search_id, 'keyword': self.keyword, 'city': self.city,
+                'min_salary': self.min_salary, 'platform': self.platform}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SavedSearch':
+        return cls(data['id'], data.get('keyword'), data.get('city'), data.get('min_salary'), data.get('platform'))
+
+
+class SubscriptionIndex:
+    """
+    Индекс сохраненных поисков для обратного поиска: не вакансии ищутся по запросу,
+    а для каждой вакансии находятся все подходящие ей подписки.
+
+    Подписки с ключевыми словами индексируются по словам: кандидатами для вакансии становятся
+    подписки, все слова которых встретились в ее названии, и у каждого кандидата проверяются
+    город, площадка и зарплата. Подписки без ключевых слов разложены по группам с одинаковыми
+    городом и площадкой (None — любые), а внутри группы отсортированы по минимальной зарплате.
+    Вакансии подходят ровно четыре группы, и в каждой подходящие подписки — префикс до порога,
+    найденного бинарным поиском. Поэтому стоимость сопоставления зависит от числа подходящих
+    подписок и кандидатов по словам, а не от общего числа подписок.
+    """
+
+    def __init__(self):
+        self.searches: Dict[str, SavedSearch] = {}
+        self._by_token: Dict[str, Set[str]] = {}
+        # (город, площадка) -> минимальные зарплаты подписок без ключевых слов по возрастанию
+        # и идентификаторы подписок в том же порядке
+        self._without_keyword: Dict[Tuple[Optional[str], Optional[str]], Tuple[List[int], List[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.searches)
+
+    def add(self, search: SavedSearch):
+        """
+        Добавляет подписку в индекс (подписка с тем же идентификатором заменяется).
+
+        Аргументы:
+            search (SavedSearch): Сохраненный поиск.
+        """
+        if search.search_id in self.searches:
+            self.remove(search.search_id)
+
+        self.searches[search.search_id] = search
+        if search.tokens:
+            for token in search.tokens:
+                self._by_token.setdefault(token, set()).add(search.search_id)
+        else:
+            salary_values, search_ids = self._without_keyword.setdefault((search.city, search.platform), ([], []))
+            position = bisect_right(salary_values, search.min_salary or 0)
+            salary_values.insert(position, search.min_salary or 0)
+            search_ids.insert(position, search.search_id)
+
+    def remove(self, search_id: str):
+        """
+        Удаляет подписку из индекса.
+
+        Аргументы:
+            search_id (str): Идентификатор подписки.
+        """
+        search = self.searches.pop(search_id)
+        for token in search.tokens:
+            self._by_token[token].discard(search_id)
+        if not search.tokens:
+            salary_values, search_ids = self._without_keyword[(search.city, search.platform)]
+            position = search_ids.index(search_id)
+            del salary_values[position]
+            del search_ids[position]
+
+    def match(self, vacancy: dict) -> List[str]:
+        """
+        Возвращает идентификаторы подписок, которым подходит вакансия.
+
+        Аргументы:
+            vacancy (dict): Вакансия в кратком формате.
+
+        Возвращает:
+            List[str]: Идентификаторы подписок.
+        """
+        city = vacancy.get('city')
+        platform = vacancy.get('platform')
+        salary = vacancy.get('salary') or 0
+
+        # Подписка с ключевыми словами — кандидат, если в названии встретились все ее слова;
+        # у кандидатов остальные условия проверяются напрямую
+        hits: Dict[str, int] = {}
+        for token in tokenize(vacancy.get('title')):
+            for search_id in self._by_token.get(token, ()):
+                hits[search_id] = hits.get(search_id, 0) + 1
+        matched = []
+        for search_id, count in hits.items():
+            search = self.searches[search_id]
+            if (count == len(search.tokens) and search.city in (None, city) and search.platform in (None, platform)
+                    and (search.min_salary or 0) <= salary):
+                matched.append(search_id)
+
+        # Подписки без ключевых слов: в каждой подходящей группе берутся подписки с порогом зарплаты
+        # не выше зарплаты вакансии
+        for group in {(city, platform), (city, None), (None, platform), (None, None)}:
+            salary_values, search_ids = self._without_keyword.get(group, ((), ()))
+            matched.extend(search_ids[:bisect_right(salary_values, salary)])
+        return sorted(matched)
+
+    def match_many(self, vacancies: dict) -> Dict[str, List[str]]:
+        """
+        Сопоставляет набор вакансий со всеми подписками.
+
+        Аргументы:
+            vacancies (dict): Вакансии в кратком формате.
+
+        Возвращает:
+            Dict[str, List[str]]: Идентификатор подписки -> ключи подходящих вакансий.
+        """
+        alerts: Dict[str, List[str]] = {}
+        with metrics.timer('alerts.match'):
+            for vacancy_key, vacancy in vacancies.items():
+                for search_id in self.match(vacancy):
+                    alerts.setdefault(search_id, []).append(vacancy_key)
+
+        metrics.increment('alerts.matches', sum(len(keys) for keys in alerts.values()))
+        return alerts
+
+
+class SubscriptionStore:
+    def __init__(self, filename: str = 'subscriptions.json'):
+        """
+        Инициализирует хранилище сохраненных поисков в JSON-файле.
+
+        Аргументы:
+            filename (str): Имя файла.
+        """
+        self.filename = filename
+
+    def load(self) -> SubscriptionIndex:
+        """
+        Загружает подписки и строит по ним индекс.
+
+        Возвращает:
+            SubscriptionIndex: Индекс подписок (пустой, если файла нет).
+        """
+        index = SubscriptionIndex()
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return index
+
+        for item in data:
+            index.add(SavedSearch.from_dict(item))
+        return index
+
+    def save(self, searches: Iterable[SavedSearch]):
+        """
+        Сохраняет подписки в файл.
+
+        Аргументы:
+            searches (Iterable[SavedSearch]): Сохраненные поиски.
+        """
+        with atomic_write(self.filename) as file:
+            json.dump([search.to_dict() for search in searches], file, ensure_ascii=False, indent=2)
@@ -0,0 +1,114 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from lazy_import import lazy_import
+from metrics.instrumentation import metrics
+from storage.dimensions import VacancyDimensions
+
+# NumPy нужен только для сравнения вакансий, поэтому импортируется при первом обращении
+np = lazy_import('numpy')
+
+
+def salary_ranks(salaries: 'np.ndarray') -> 'np.ndarray':
+    """
+    Возвращает место каждой зарплаты по убыванию (1 — самая высокая). Одинаковые зарплаты
+    делят одно место.
+
+    Аргументы:
+        salaries (np.ndarray): Зарплаты.
+
+    Возвращает:
+        np.ndarray: Места зарплат.
+    """
+    ordered = np.sort(salaries)
+    return 1 + len(salaries) - np.searchsorted(ordered, salaries, side='right')
+
+
+def group_percentiles(values: 'np.ndarray', groups: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Возвращает для каждого значения долю значений его группы, не превышающих его (в процентах),
+    и размер группы. Значения и группы сворачиваются в один отсортированный ключ
+    (группа, место значения), поэтому все проценты считаются двумя двоичными поисками по массиву.
+
+    Аргументы:
+        values (np.ndarray): Значения.
+        groups (np.ndarray): Идентификаторы групп значений.
+
+    Возвращает:
+        Tuple[np.ndarray, np.ndarray]: Проценты и размеры групп.
+    """
+    count = len(values)
+    _, value_ranks = np.unique(values, return_inverse=True)
+    _, group_index = np.unique(groups, return_inverse=True)
+    value_ranks, group_index = value_ranks.ravel(), group_index.ravel()
+
+    keys = group_index.astype(np.int64) * (count + 1) + value_ranks
+    ordered = np.sort(keys)
+    at_most = np.searchsorted(ordered, keys, side='right')
+    group_start = np.searchsorted(ordered, group_index.astype(np.int64) * (count + 1), side='left')
+    sizes = np.bincount(group_index)[group_index]
+    return 100.0 * (at_most - group_start) / sizes, sizes
+
+
+class VacancyComparison:
+    def __init__(self, selection: List[Tuple[int, dict]], dimensions: Optional[VacancyDimensions] = None):
+        """
+        Сравнивает группу вакансий. Для каждой вакансии считаются место по зарплате в группе,
+        отличие от медианной зарплаты группы и процент вакансий того же города и того же
+        работодателя в группе с зарплатой не выше. Все показатели считаются операциями над массивами.
+
+        Аргументы:
+            selection (List[Tuple[int, dict]]): Номер вакансии в выдаче и данные вакансии.
+            dimensions (Optional[VacancyDimensions]): Таблицы измерений, по идентификаторам которых
+                вакансии группируются по городам и работодателям.
+        """
+        self.dimensions = dimensions or VacancyDimensions()
+        self.positions = [position for position, _ in selection]
+        self.vacancies = [vacancy for _, vacancy in selection]
+
+        with metrics.timer('compare'):
+            for vacancy in self.vacancies:
+                if 'city_id' not in vacancy or 'employer_id' not in vacancy:
+                    self.dimensions.intern_vacancy(vacancy)
+            self.salaries = np.fromiter(((vacancy.get('salary') or 0) for vacancy in self.vacancies),
+                                        dtype=np.float64, count=len(self.vacancies))
+            city_ids = np.fromiter((vacancy['city_id'] for vacancy in self.vacancies), dtype=np.int64,
+                                   count=len(self.vacancies))
+            employer_ids = np.fromiter((vacancy['employer_id'] for vacancy in self.vacancies), dtype=np.int64,
+                                       count=len(self.vacancies))
+
+            self.median = float(np.median(self.salaries)) if len(self.vacancies) else 0.0
+            self.ranks = salary_ranks(self.salaries)
+            self.median_differences = self.salaries - self.median
+            self.city_percentiles, self.city_sizes = group_percentiles(self.salaries, city_ids)
+            self.employer_percentiles, self.employer_sizes = group_percentiles(self.salaries, employer_ids)
+
+    def __len__(self) -> int:
+        return len(self.vacancies)
+
+    def rows(self, order_by_rank: bool = True) -> Iterator[Dict]:
+        """
+        Возвращает строки таблицы сравнения.
+
+        Аргументы:
+            order_by_rank (bool): Упорядочить строки по месту зарплаты (иначе — по номеру в выдаче).
+
+        Возвращает:
+            Iterator[Dict]: Строки таблицы.
+        """
+        order = np.argsort(self.ranks, kind='stable') if order_by_rank else np.arange(len(self.vacancies))
+        for index in order.tolist():
+            vacancy = self.vacancies[index]
+            yield {
+                'position': self.positions[index],
+                'title': vacancy.get('title'),
+                'salary': int(self.salaries[index]),
+                'currency': vacancy.get('currency'),
+                'rank': int(self.ranks[index]),
+                'median_difference': int(self.median_differences[index]),
+                'city': vacancy.get('city'),
+                'city_percentile': float(self.city_percentiles[index]),
+                'city_size': int(self.city_sizes[index]),
+                'employer': (vacancy.get('employer') or {}).get('name'),
+                'employer_percentile': float(self.employer_percentiles[index]),
+                'employer_size': int(self.employer_sizes[index]),
+            }
@@ -0,0 +1,203 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lazy_import import lazy_import
+from metrics.instrumentation import metrics
+
+requests = lazy_import('requests')
+
+# Загрузчик следующей страницы выдачи: номер страницы -> (вакансии страницы, есть ли еще страницы)
+PageLoader = Callable[[int], Tuple[Dict[str, dict], bool]]
+
+
+class ResultSet:
+    def __init__(self, vacancies: dict, loader: Optional[PageLoader] = None, has_more: bool = True,
+                 limit: Optional[int] = None):
+        """
+        Инициализирует набор результатов поиска с доступом к вакансиям по номеру за O(1).
+        Следующие страницы выдачи загружаются через loader только тогда, когда к ним обращаются.
+
+        Аргументы:
+            vacancies (dict): Уже загруженные вакансии (первая страница выдачи).
+            loader (Optional[PageLoader]): Загрузчик следующих страниц выдачи.
+            has_more (bool): Есть ли у выдачи следующие страницы.
+            limit (Optional[int]): Наибольшее количество вакансий, которое площадка отдает по одному запросу.
+        """
+        self._items: List[Tuple[str, dict]] = list(vacancies.items())
+        self._positions: Dict[str, int] = {key: position for position, (key, _) in enumerate(self._items)}
+        self._loader = loader
+        self._next_page = 1
+        self.limit = limit
+        self.exhausted = loader is None or not has_more
+        # Последняя догрузка не уложилась в крайний срок площадки или завершилась ошибкой сети
+        # или API: выдача не закончена, но пока показываются только уже загруженные вакансии
+        self.timed_out = False
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество уже загруженных вакансий.
+        """
+        return len(self._items)
+
+    def __getitem__(self, position: int) -> dict:
+        return self.item(position)[1]
+
+    def load_more(self) -> int:
+        """
+        Загружает следующую страницу выдачи. Если площадка не ответила до крайнего срока или
+        запрос завершился ошибкой (ответ с ошибкой, капча, обрыв соединения), страница не добавляется
+        и выставляется timed_out; следующее обращение повторит загрузку.
+
+        Возвращает:
+            int: Количество добавленных вакансий.
+        """
+        if self.exhausted:
+            return 0
+        try:
+            vacancies, has_more = self._loader(self._next_page)
+        except TimeoutError:
+            self.timed_out = True
+            metrics.increment('results.pages_timed_out')
+            return 0
+        except requests.RequestException:
+            self.timed_out = True
+            metrics.increment('results.pages_failed')
+            return 0
+        self.timed_out = False
+        self._next_page += 1
+        for key, vacancy in vacancies.items():
+            self._positions[key] = len(self._items)
+            self._items.append((key, vacancy))
+        self.exhausted = not has_more
+        metrics.increment('results.pages_loaded')
+        return len(vacancies)
+
+    def ensure(self, count: int) -> bool:
+        """
+        Догружает страницы выдачи, пока вакансий меньше count или пока выдача не закончится.
+
+        Аргументы:
+            count (int): Нужное количество вакансий.
+
+        Возвращает:
+            bool: Загружено ли не меньше count вакансий.
+        """
+        while len(self._items) < count and not self.exhausted:
+            self.load_more()
+            if self.timed_out:
+                break
+        return len(self._items) >= count
+
+    def item(self, position: int) -> Tuple[str, dict]:
+        """
+        Возвращает ключ и данные вакансии по ее позиции (с нуля), догружая выдачу при необходимости.
+
+        Аргументы:
+            position (int): Позиция вакансии.
+
+        Возвращает:
+            Tuple[str, dict]: Ключ вакансии и ее данные.
+        """
+        self.ensure(position + 1)
+        return self._items[position]
+
+    def page(self, number: int, size: int) -> List[Tuple[int, str, dict]]:
+        """
+        Возвращает страницу вакансий.
+
+        Аргументы:
+            number (int): Номер страницы (с нуля).
+            size (int): Размер страницы.
+
+        Возвращает:
+            List[Tuple[int, str, dict]]: Номер вакансии в выдаче (с единицы), ключ и данные вакансии.
+        """
+        start = number * size
+        self.ensure(start + size)
+        return [(start + offset + 1, key, vacancy)
+                for offset, (key, vacancy) in enumerate(self._items[start:start + size])]
+
+    def position(self, key: str) -> int:
+        """
+        Возвращает позицию (с нуля) загруженной вакансии по ее ключу.
+
+        Аргументы:
+            key (str): Ключ вакансии.
+
+        Возвращает:
+            int: Позиция вакансии.
+        """
+        return self._positions[key]
+
+    def loaded(self, start: int = 0) -> List[Tuple[str, dict]]:
+        """
+        Возвращает уже загруженные вакансии, начиная с позиции start, без догрузки выдачи.
+
+        Аргументы:
+            start (int): Позиция первой вакансии.
+
+        Возвращает:
+            List[Tuple[str, dict]]: Ключи и данные вакансий.
+        """
+        return self._items[start:]
+
+    def to_dict(self) -> dict:
+        """
+        Возвращает загруженные вакансии словарем.
+        """
+        return dict(self._items)
+
+
+class ResultCursor:
+    def __init__(self, results: ResultSet, page_size: int):
+        """
+        Инициализирует курсор постраничного просмотра набора результатов.
+
+        Аргументы:
+            results (ResultSet): Набор результатов.
+            page_size (int): Количество вакансий на странице.
+        """
+        self.results = results
+        self.page_size = page_size
+        self.page_number = 0
+
+    def page(self) -> List[Tuple[int, str, dict]]:
+        """
+        Возвращает текущую страницу.
+        """
+        return self.results.page(self.page_number, self.page_size)
+
+    def positions(self) -> List[int]:
+        """
+        Возвращает номера вакансий текущей страницы (с единицы).
+        """
+        return [position for position, _, _ in self.page()]
+
+    def has_next(self) -> bool:
+        return self.results.ensure((self.page_number + 1) * self.page_size + 1)
+
+    def has_prev(self) -> bool:
+        return self.page_number > 0
+
+    def next(self) -> bool:
+        """
+        Переходит на следующую страницу.
+
+        Возвращает:
+            bool: Удалось ли перейти.
+        """
+        if not self.has_next():
+            return False
+        self.page_number += 1
+        return True
+
+    def prev(self) -> bool:
+        """
+        Переходит на предыдущую страницу.
+
+        Возвращает:
+            bool: Удалось ли перейти.
+        """
+        if not self.has_prev():
+            return False
+        self.page_number -= 1
+        return True
@@ -0,0 +1,383 @@
+import math
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lazy_import import lazy_import
+from metrics.instrumentation import metrics
+from model.alerts import WORD_PATTERN
+
+# NumPy нужен только для поиска похожих вакансий, поэтому импортируется при первом обращении
+np = lazy_import('numpy')
+
+# Размер пространства хэшированных признаков (степень двойки)
+FEATURE_BITS: int = 18
+
+# Слова заголовка важнее слов описания
+TITLE_WEIGHT: int = 2
+
+# Длина шингла (в словах) для MinHash и число хэш-функций сигнатуры
+SHINGLE_SIZE: int = 3
+NUM_PERMUTATIONS: int = 64
+
+# Простое число больше 2**32: (a * x + b) mod p для 32-битных хэшей помещается в uint64
+MINHASH_PRIME: int = 4294967311
+
+MINHASH_SEED: int = 20231115
+
+
+def _hash(token: str) -> int:
+    # crc32 не зависит от PYTHONHASHSEED, поэтому признаки одинаковы во всех процессах
+    return zlib.crc32(token.encode('utf-8'))
+
+
+def vacancy_text(vacancy: Dict) -> Tuple[List[str], List[str]]:
+    """
+    Возвращает слова заголовка и описания вакансии в нижнем регистре. Если к вакансии
+    загружено полное описание, используется оно.
+
+    Аргументы:
+        vacancy (Dict): Вакансия в кратком формате.
+
+    Возвращает:
+        Tuple[List[str], List[str]]: Слова заголовка и слова описания.
+    """
+    title = vacancy.get('title') or ''
+    description = vacancy.get('full_description') or vacancy.get('description') or ''
+    return WORD_PATTERN.findall(title.lower()), WORD_PATTERN.findall(description.lower())
+
+
+def hashed_features(vacancy: Dict, bits: int = FEATURE_BITS) -> Dict[int, float]:
+    """
+    Переводит заголовок и описание вакансии в разреженный вектор частот хэшированных признаков:
+    слова и пары соседних слов заголовка, слова описания. Частота сглаживается как 1 + log(tf).
+
+    Аргументы:
+        vacancy (Dict): Вакансия в кратком формате.
+        bits (int): Размер пространства признаков в битах.
+
+    Возвращает:
+        Dict[int, float]: Номер признака -> вес.
+    """
+    mask = (1 << bits) - 1
+    title, description = vacancy_text(vacancy)
+    counts: Counter = Counter()
+    for word in title:
+        counts[_hash(word) & mask] += TITLE_WEIGHT
+    for first, second in zip(title, title[1:]):
+        counts[_hash(first + ' ' + second) & mask] += TITLE_WEIGHT
+    for word in description:
+        counts[_hash(word) & mask] += 1
+    return {feature: 1.0 + math.log(count) for feature, count in counts.items()}
+
+
+def shingles(vacancy: Dict, size: int = SHINGLE_SIZE) -> List[int]:
+    """
+    Возвращает хэши шинглов вакансии — последовательностей из size слов заголовка и описания.
+
+    Аргументы:
+        vacancy (Dict): Вакансия в кратком формате.
+        size (int): Длина шингла в словах.
+
+    Возвращает:
+        List[int]: Хэши шинглов без повторов.
+    """
+    title, description = vacancy_text(vacancy)
+    words = title + description
+    if len(words) < size:
+        return [_hash(' '.join(words))] if words else []
+    return list({_hash(' '.join(words[start:start + size])) for start in range(len(words) - size + 1)})
+
+
+class SimilarityIndex:
+    """
+    Индекс похожих вакансий.
+
+    Вакансии хранятся строками разреженной матрицы хэшированных признаков (формат CSR на массивах
+    NumPy, которые дописываются по мере поступления вакансий), рядом ведется число документов
+    с каждым признаком. Похожесть — косинус между векторами TF-IDF: веса IDF и нормы строк
+    пересчитываются одним векторным проходом по ненулевым элементам матрицы, поэтому добавление
+    вакансий не требует перестройки матрицы.
+
+    Для поиска почти одинаковых вакансий каждой вакансии сопоставляется MinHash-сигнатура
+    множества ее шинглов, а кандидаты в дубликаты находятся по совпадению полос сигнатуры (LSH).
+
+    Attributes:
+        keys (List[str]): Ключи вакансий в порядке строк матрицы.
+    """
+
+    def __init__(self, bits: int = FEATURE_BITS, num_permutations: int = NUM_PERMUTATIONS) -> None:
+        self.bits = bits
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._row_ids = np.zeros(0, dtype=np.int32)
+        self._data = np.zeros(0, dtype=np.float32)
+        self._nnz = 0
+        self._df = np.zeros(1 << bits, dtype=np.int32)
+
+        random_state = np.random.RandomState(MINHASH_SEED)
+        self._hash_a = random_state.randint(1, 1 << 32, size=num_permutations, dtype=np.uint64)
+        self._hash_b = random_state.randint(0, 1 << 32, size=num_permutations, dtype=np.uint64)
+        self._signatures = np.zeros((0, num_permutations), dtype=np.uint64)
+        self._has_shingles = np.zeros(0, dtype=bool)
+
+        # Веса TF-IDF и нормы строк, посчитанные для текущего числа вакансий
+        self._weights_cache: Optional[Tuple[int, object, object, object]] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def _reserve(self, rows: int, nnz: int) -> None:
+        """
+        Увеличивает массивы вдвое, если в них не помещаются еще rows строк и nnz элементов.
+        """
+        if self._nnz + nnz > len(self._indices):
+            capacity = max(2 * len(self._indices), self._nnz + nnz, 1024)
+            for name in ('_indices', '_row_ids', '_data'):
+                old = getattr(self, name)
+                new = np.zeros(capacity, dtype=old.dtype)
+                new[:self._nnz] = old[:self._nnz]
+                setattr(self, name, new)
+        count = len(self.keys)
+        if count + rows > len(self._signatures):
+            capacity = max(2 * len(self._signatures), count + rows, 256)
+            signatures = np.zeros((capacity, self._signatures.shape[1]), dtype=np.uint64)
+            signatures[:count] = self._signatures[:count]
+            has_shingles = np.zeros(capacity, dtype=bool)
+            has_shingles[:count] = self._has_shingles[:count]
+            indptr = np.zeros(capacity + 1, dtype=np.int64)
+            indptr[:count + 1] = self._indptr[:count + 1]
+            self._signatures, self._has_shingles, self._indptr = signatures, has_shingles, indptr
+
+    def signature(self, hashes: List[int]) -> 'np.ndarray':
+        """
+        Возвращает MinHash-сигнатуру множества хэшей шинглов: минимум (a * x + b) mod p
+        по всем шинглам для каждой из хэш-функций.
+
+        Аргументы:
+            hashes (List[int]): Хэши шинглов.
+
+        Возвращает:
+            np.ndarray: Сигнатура длиной num_permutations.
+        """
+        values = np.asarray(hashes, dtype=np.uint64)
+        products = (self._hash_a[:, None] * values[None, :] + self._hash_b[:, None]) % np.uint64(MINHASH_PRIME)
+        return products.min(axis=1)
+
+    def add(self, key: str, vacancy: Dict) -> bool:
+        """
+        Добавляет вакансию в индекс.
+
+        Аргументы:
+            key (str): Ключ вакансии.
+            vacancy (Dict): Вакансия в кратком формате.
+
+        Возвращает:
+            bool: Добавлена ли вакансия (False, если ключ уже есть в индексе).
+        """
+        if key in self._rows:
+            return False
+        features = hashed_features(vacancy, self.bits)
+        row = len(self.keys)
+        self._reserve(1, len(features))
+
+        start, end = self._nnz, self._nnz + len(features)
+        indices = np.fromiter(features.keys(), dtype=np.int32, count=len(features))
+        self._indices[start:end] = indices
+        self._data[start:end] = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+        self._row_ids[start:end] = row
+        self._df[indices] += 1
+        self._nnz = end
+        self._indptr[row + 1] = end
+
+        hashes = shingles(vacancy)
+        if hashes:
+            self._signatures[row] = self.signature(hashes)
+            self._has_shingles[row] = True
+
+        self._rows[key] = row
+        self.keys.append(key)
+        self._weights_cache = None
+        return True
+
+    def add_many(self, vacancies: Dict[str, Dict]) -> int:
+        """
+        Добавляет в индекс вакансии, которых в нем еще нет.
+
+        Аргументы:
+            vacancies (Dict[str, Dict]): Ключ вакансии -> вакансия.
+
+        Возвращает:
+            int: Количество добавленных вакансий.
+        """
+        with metrics.timer('similarity.add'):
+            added = sum(1 for key, vacancy in vacancies.items() if self.add(key, vacancy))
+        metrics.increment('similarity.records_added', added)
+        return added
+
+    def _weights(self) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Возвращает IDF признаков, веса TF-IDF ненулевых элементов и нормы строк.
+        """
+        count = len(self.keys)
+        if self._weights_cache is None or self._weights_cache[0] != count:
+            idf = (np.log((count + 1) / (self._df + 1.0)) + 1.0).astype(np.float32)
+            weights = self._data[:self._nnz] * idf[self._indices[:self._nnz]]
+            norms = np.sqrt(np.bincount(self._row_ids[:self._nnz], weights=weights * weights, minlength=count))
+            self._weights_cache = (count, idf, weights, norms)
+        _, idf, weights, norms = self._weights_cache
+        return idf, weights, norms
+
+    def _top(self, features: Dict[int, float], k: int, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """
+        Возвращает k строк индекса с наибольшей косинусной похожестью на вектор признаков.
+        """
+        count = len(self.keys)
+        if count == 0 or k <= 0:
+            return []
+        with metrics.timer('similarity.query'):
+            idf, weights, norms = self._weights()
+
+            query = np.zeros(1 << self.bits, dtype=np.float32)
+            if features:
+                indices = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+                query[indices] = np.fromiter(features.values(), dtype=np.float32, count=len(features)) * idf[indices]
+                query_norm = np.linalg.norm(query[indices])
+                if query_norm:
+                    query /= query_norm
+
+            # Скалярные произведения запроса со всеми строками — один проход по ненулевым элементам матрицы
+            dots = np.bincount(self._row_ids[:self._nnz], weights=weights * query[self._indices[:self._nnz]],
+                               minlength=count)
+            scores = np.divide(dots, norms, out=np.zeros(count), where=norms > 0)
+            for key in exclude:
+                row = self._rows.get(key)
+                if row is not None:
+                    scores[row] = 0.0
+
+            k = min(k, count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.keys[row], float(scores[row])) for row in top.tolist() if scores[row] > 0]
+
+    def similar_to(self, vacancy: Dict, k: int = 5, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """
+        Возвращает k вакансий индекса, наиболее похожих на данную вакансию.
+
+        Аргументы:
+            vacancy (Dict): Вакансия в кратком формате (может отсутствовать в индексе).
+            k (int): Количество похожих вакансий.
+            exclude (Iterable[str]): Ключи вакансий, которые не попадают в ответ.
+
+        Возвращает:
+            List[Tuple[str, float]]: Ключи вакансий и косинусная похожесть по убыванию похожести.
+        """
+        return self._top(hashed_features(vacancy, self.bits), k, exclude)
+
+    def similar(self, key: str, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Возвращает k вакансий, наиболее похожих на вакансию индекса с ключом key.
+
+        Аргументы:
+            key (str): Ключ вакансии.
+            k (int): Количество похожих вакансий.
+
+        Возвращает:
+            List[Tuple[str, float]]: Ключи вакансий и косинусная похожесть по убыванию похожести.
+        """
+        row = self._rows[key]
+        start, end = int(self._indptr[row]), int(self._indptr[row + 1])
+        features = dict(zip(self._indices[start:end].tolist(), self._data[start:end].tolist()))
+        return self._top(features, k, (key,))
+
+    def near_duplicates(self, threshold: float = 0.8, bands: int = 16) -> List[List[str]]:
+        """
+        Группирует почти одинаковые вакансии. Сигнатуры делятся на полосы: вакансии, у которых
+        совпала хотя бы одна полоса, становятся кандидатами, а в группу попадают кандидаты,
+        у которых доля совпавших значений сигнатуры (оценка сходства Жаккара) не меньше threshold.
+        Каждый кандидат сравнивается с первой вакансией своей корзины, поэтому большие корзины
+        не дают квадратичного числа сравнений.
+
+        Аргументы:
+            threshold (float): Минимальная оценка сходства Жаккара.
+            bands (int): Количество полос сигнатуры (делитель числа хэш-функций).
+
+        Возвращает:
+            List[List[str]]: Группы ключей из двух и более вакансий, самые большие первыми.
+        """
+        rows = np.flatnonzero(self._has_shingles[:len(self.keys)])
+        signatures = self._signatures[rows]
+        width = signatures.shape[1] // bands
+        parent = list(range(len(rows)))
+
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        with metrics.timer('similarity.near_duplicates'):
+            for band in range(bands):
+                band_values = np.ascontiguousarray(signatures[:, band * width:(band + 1) * width])
+                buckets = band_values.view(np.dtype((np.void, band_values.dtype.itemsize * width))).ravel()
+                _, inverse, counts = np.unique(buckets, return_inverse=True, return_counts=True)
+                inverse = inverse.ravel()
+                order = np.argsort(inverse, kind='stable')
+                bounds = np.concatenate(([0], np.cumsum(counts)))
+                for bucket in np.flatnonzero(counts > 1).tolist():
+                    members = order[bounds[bucket]:bounds[bucket + 1]]
+                    first = members[0]
+                    agreement = (signatures[members[1:]] == signatures[first]).mean(axis=1)
+                    for member in members[1:][agreement >= threshold].tolist():
+                        root_first, root_member = find(int(first)), find(member)
+                        if root_first != root_member:
+                            parent[root_member] = root_first
+
+        groups: Dict[int, List[str]] = {}
+        for position, row in enumerate(rows.tolist()):
+            groups.setdefault(find(position), []).append(self.keys[row])
+        clusters = sorted((group for group in groups.values() if len(group) > 1), key=len, reverse=True)
+        metrics.increment('similarity.duplicate_groups', len(clusters))
+        return clusters
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Командная строка поиска похожих вакансий и почти одинаковых вакансий в архиве.
+    """
+    import argparse
+    import json
+
+    from storage.archive import VacancyArchive
+    from storage.snapshots import vacancy_identity
+
+    arg_parser = argparse.ArgumentParser(description='Похожие вакансии в архиве формата VARC.')
+    arg_parser.add_argument('archive')
+    arg_parser.add_argument('--like', metavar='IDENTITY', help='вакансия (площадка:id), для которой ищутся похожие')
+    arg_parser.add_argument('--top', type=int, default=10, help='количество похожих вакансий')
+    arg_parser.add_argument('--duplicates', action='store_true', help='вывести группы почти одинаковых вакансий')
+    arg_parser.add_argument('--threshold', type=float, default=0.8, help='порог сходства для --duplicates')
+    args = arg_parser.parse_args(argv)
+
+    vacancies = {vacancy_identity(vacancy): vacancy for vacancy in VacancyArchive(args.archive).read_range()}
+    index = SimilarityIndex()
+    index.add_many(vacancies)
+
+    if args.like:
+        if args.like not in index:
+            raise SystemExit(f"Вакансии {args.like} нет в архиве.")
+        for identity, score in index.similar(args.like, args.top):
+            print(json.dumps({'identity': identity, 'score': round(score, 4),
+                              'title': vacancies[identity].get('title')}, ensure_ascii=False))
+    if args.duplicates:
+        for group in index.near_duplicates(args.threshold):
+            print(json.dumps(group, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,18 @@
-from typing import Type
+from typing import Dict, Hashable, List, Optional, Tuple, Type, TYPE_CHECKING
 
-from colorama import Fore, Style
+from api.platforms import get_platform
+from lazy_import import lazy_import
+from metrics.instrumentation import metrics
+from storage.dimensions import DIMENSION_FIELDS, VacancyDimensions
+from storage.salary_index import SalaryIntervalIndex, salary_bounds
+
+if TYPE_CHECKING:
+    from api.regions import RegionIndex
+    from model.comparison import VacancyComparison
+
+# colorama импортируется при первом выводе цветного текста
+Fore = lazy_import('colorama', 'Fore')
+Style = lazy_import('colorama', 'Style')
 
 
 class Vacancy:
@@ -16,7 +28,9 @@ class Vacancy:
         self.url = data_vacancy.get('url', 'Нет информации')
         self.currency = data_vacancy.get('currency', 'Нет информации')
         self.salary = data_vacancy.get('salary', 'Нет информации')
+        self.salary_from, self.salary_to = salary_bounds(data_vacancy)
         self.description = data_vacancy.get('description', 'Нет информации')
+        self.full_description = data_vacancy.get('full_description')
         self.city = data_vacancy.get('city', 'Нет информации')
         self.published_at = data_vacancy.get('published_at', 'Нет информации')
         self.employer = data_vacancy['employer'].get('name', 'Нет информации')
@@ -31,10 +45,12 @@ class Vacancy:
         """
         print('__________________________________________________________________________________')
         print(Fore.BLUE + Style.BRIGHT + "Название: " + Fore.CYAN + self.title + Style.RESET_ALL)
-        print(Fore.BLUE + Style.BRIGHT + "Оплата: " + Fore.GREEN + str(
-            self.salary) + Fore.BLUE + ' ' + self.currency + Style.RESET_ALL)
+        print(Fore.BLUE + Style.BRIGHT + "Оплата: " + Fore.GREEN + self.salary_range() + Fore.BLUE + ' '
+              + self.currency + Style.RESET_ALL)
         print(Fore.BLUE + Style.BRIGHT + "Дата публикации: " + Style.RESET_ALL + self.published_at)
-        if self.description is not None:
+        if self.full_description:
+            print(Fore.BLUE + Style.BRIGHT + "Описание: " + Style.RESET_ALL + self.full_description)
+        elif self.description is not None:
             truncated_description = self.description[:100] if len(self.description) > 100 else self.description
             print(
                 Fore.BLUE + Style.BRIGHT + "Описание: " + Style.RESET_ALL + truncated_description + '...' + Style.RESET_ALL + Fore.RED + '\n(Читать подробнее по ссылке на вакансию)' + Style.RESET_ALL)
@@ -49,6 +65,23 @@ class Vacancy:
         print('__________________________________________________________________________________')
         print('')
 
+    def salary_range(self) -> str:
+        """
+        Возвращает вилку зарплаты для вывода.
+
+        Возвращает:
+            str: Вилка вида "от X до Y", "от X", "до Y" или одно значение.
+        """
+        if self.salary_from is not None and self.salary_to is not None:
+            if self.salary_from == self.salary_to:
+                return str(self.salary_from)
+            return f"от {self.salary_from} до {self.salary_to}"
+        if self.salary_from is not None:
+            return f"от {self.salary_from}"
+        if self.salary_to is not None:
+            return f"до {self.salary_to}"
+        return str(self.salary)
+
     def compare_salary(self, other):
         """
         Сравнивает зарплату текущей вакансии с другой вакансией.
@@ -73,8 +106,15 @@ class Vacancy:
 
 
 class VacancyFilter:
-    def __init__(self):
+    def __init__(self, dimensions: Optional[VacancyDimensions] = None):
+        """
+        Инициализирует объект VacancyFilter.
+
+        Аргументы:
+            dimensions (Optional[VacancyDimensions]): Таблицы измерений работодателей, городов и валют.
+        """
         self.sort_params = {}
+        self.dimensions = dimensions or VacancyDimensions()
 
     def sort_top_salary_vacancies(self, api: dict):
         """
@@ -83,13 +123,7 @@ class VacancyFilter:
         Аргументы:
             api (dict): Информация об API.
         """
-        if api.get('name') == 'Head Hunter':
-            param = {'order_by': 'salary_desc'}
-        if api.get('name') == 'Super Job':
-            param = {'order_field': 'payment',
-                     'order_direction': 'desc'}
-
-        self._update_sort_params(param)
+        self._update_sort_params(get_platform(api).sort_params['salary'])
 
     def sort_top_last_published_vacancies(self, api: dict):
         """
@@ -98,9 +132,7 @@ class VacancyFilter:
         Аргументы:
             api (dict): Информация об API.
         """
-        if api.get('name') == 'Head Hunter':
-            param = {'order_by': 'publication_time'}
-            self._update_sort_params(param)
+        self._update_sort_params(get_platform(api).sort_params['date'])
 
     def sort_with_keyword(self, keyword: str, api: dict):
         """
@@ -110,11 +142,18 @@ class VacancyFilter:
             keyword (str): Ключевое слово для фильтрации.
             api (dict): Информация об API.
         """
-        if api.get('name') == 'Head Hunter':
-            param = {'text': keyword}
-        if api.get('name') == 'Super Job':
-            param = {'keyword': keyword}
-        self._update_sort_params(param)
+        self._update_sort_params({get_platform(api).keyword_param: keyword})
+
+    def sort_with_region(self, region: str, api: dict, index: 'RegionIndex'):
+        """
+        Добавляет ограничение поиска регионом на стороне API.
+
+        Аргументы:
+            region (str): Идентификатор или название региона.
+            api (dict): Информация об API.
+            index (RegionIndex): Индекс регионов.
+        """
+        self._update_sort_params(index.upstream_params(region, get_platform(api).slug))
 
     def _update_sort_params(self, param: dict):
         """
@@ -138,47 +177,182 @@ class VacancyFilter:
         """
         return api.get('api_class').get_data(self.sort_params)
 
-    def remove_bad_vacancies(self, vacancies: dict):
+    def remove_bad_vacancies(self, vacancies: dict, seen: Optional[set] = None):
         """
         Удаляет дублирующиеся вакансии и те, у которых отсутствует зарплата.
 
         Аргументы:
             vacancies (dict): Информация о вакансиях.
+            seen (Optional[set]): Ключи уже встреченных вакансий, общие для нескольких страниц выдачи.
+                Дополняется ключами оставленных вакансий.
 
         Возвращает:
             dict: Уникальные данные вакансий.
         """
         unique_vacancies = {}
-        seen_titles = set()
+        seen_titles = seen if seen is not None else set()
+        without_salary = 0
+
+        with metrics.timer('dedup'):
+            for vacancy_key, vacancy in vacancies.items():
+                title = vacancy["title"]
+                salary = vacancy.get("salary")
+                # Работодатель сравнивается по имени (как в content_key архива), а не по идентификатору
+                # измерения: тот различает работодателей с одинаковым именем и разными ссылками
+                employer_name = (vacancy.get("employer") or {}).get("name")
+                key = (title, salary, employer_name)
+
+                if salary is None or salary == 0:
+                    without_salary += 1
+                elif key not in seen_titles:
+                    seen_titles.add(key)
+                    unique_vacancies[vacancy_key] = vacancy
+
+        metrics.increment('dedup.records_dropped', without_salary, reason='no_salary')
+        metrics.increment('dedup.records_dropped', len(vacancies) - len(unique_vacancies) - without_salary,
+                          reason='duplicate')
+        return unique_vacancies
+
+    def group_by(self, vacancies: dict, field: str) -> Dict[int, List[str]]:
+        """
+        Группирует вакансии по идентификатору измерения.
+
+        Аргументы:
+            vacancies (dict): Информация о вакансиях.
+            field (str): Измерение ('employer', 'city' или 'currency').
 
+        Возвращает:
+            Dict[int, List[str]]: Идентификатор значения -> ключи вакансий.
+        """
+        id_key = DIMENSION_FIELDS[field]
+        groups: Dict[int, List[str]] = {}
         for vacancy_key, vacancy in vacancies.items():
-            title = vacancy["title"]
-            salary = vacancy.get("salary")
-            employer_name = vacancy["employer"]["name"]
-            key = (title, salary, employer_name)
+            if id_key not in vacancy:
+                self.dimensions.intern_vacancy(vacancy)
+            groups.setdefault(vacancy[id_key], []).append(vacancy_key)
+        return groups
 
-            if salary is not None and salary != 0 and key not in seen_titles:
-                seen_titles.add(key)
-                unique_vacancies[vacancy_key] = vacancy
+    def filter_by(self, vacancies: dict, field: str, value: Hashable) -> dict:
+        """
+        Оставляет вакансии с заданным значением измерения. Значение один раз переводится
+        в идентификатор, дальше сравниваются только числа.
+
+        Аргументы:
+            vacancies (dict): Информация о вакансиях.
+            field (str): Измерение ('employer', 'city' или 'currency').
+            value (Hashable): Значение измерения (для работодателя — пара (имя, ссылка)).
+
+        Возвращает:
+            dict: Подходящие вакансии.
+        """
+        value_id = self.dimensions.table(field).find(value)
+        if value_id is None:
+            return {}
+        id_key = DIMENSION_FIELDS[field]
+        return {vacancy_key: vacancy for vacancy_key, vacancy in vacancies.items()
+                if vacancy.get(id_key) == value_id}
+
+    def filter_by_region(self, vacancies: dict, region: str, index: 'RegionIndex') -> dict:
+        """
+        Оставляет вакансии из городов региона. Названия городов региона берутся из индекса
+        и один раз переводятся в идентификаторы измерения городов.
+
+        Аргументы:
+            vacancies (dict): Информация о вакансиях.
+            region (str): Идентификатор или название региона.
+            index (RegionIndex): Индекс регионов.
+
+        Возвращает:
+            dict: Вакансии региона.
+        """
+        cities = self.dimensions.cities
+        city_ids = {cities.find(name) for name in index.cities(region)}
+        result = {}
+        for vacancy_key, vacancy in vacancies.items():
+            if 'city_id' not in vacancy:
+                self.dimensions.intern_vacancy(vacancy)
+            if vacancy['city_id'] in city_ids:
+                result[vacancy_key] = vacancy
+        return result
+
+    def filter_by_salary(self, vacancies: dict, low: Optional[int] = None, high: Optional[int] = None,
+                         guaranteed: Optional[int] = None,
+                         index: Optional[SalaryIntervalIndex] = None) -> dict:
+        """
+        Оставляет вакансии, чья вилка зарплаты пересекается с диапазоном [low, high] и, если задан
+        guaranteed, нижняя граница вилки не меньше guaranteed.
+
+        Аргументы:
+            vacancies (dict): Информация о вакансиях.
+            low (Optional[int]): Нижняя граница диапазона.
+            high (Optional[int]): Верхняя граница диапазона.
+            guaranteed (Optional[int]): Минимальная гарантированная зарплата.
+            index (Optional[SalaryIntervalIndex]): Готовый индекс вилок этих вакансий
+                (по умолчанию строится заново).
+
+        Возвращает:
+            dict: Подходящие вакансии в исходном порядке.
+        """
+        if index is None:
+            index = SalaryIntervalIndex.from_vacancies(vacancies)
+        keys = set(index.overlapping(low, high))
+        if guaranteed is not None:
+            keys.intersection_update(index.guaranteed(guaranteed))
+        return {vacancy_key: vacancy for vacancy_key, vacancy in vacancies.items() if vacancy_key in keys}
 
-        return unique_vacancies
 
 class VacancyOutput:
-    def data_short_output(self, sorted_data: dict, data_top: str):
+    def page_output(self, page: List[Tuple[int, str, dict]]):
         """
-        Выводит короткую информацию о вакансиях.
+        Выводит короткую информацию о вакансиях страницы с их номерами в выдаче.
 
         Аргументы:
-            sorted_data (dict): Отсортированные данные вакансий.
-            data_top (str): Количество вакансий для вывода.
+            page (List[Tuple[int, str, dict]]): Номер вакансии, ключ и данные вакансии.
         """
-        for id, vacancy in enumerate(sorted_data.values(), start=1):
-            print(Fore.YELLOW + f'{id}.' + Style.RESET_ALL + ' ' + vacancy[
-                'title'] + ' — ' + Fore.GREEN + Style.BRIGHT + str(vacancy['salary']) + ' ' + Fore.BLUE + vacancy[
-                      'currency'] + Style.RESET_ALL)
+        with metrics.timer('render'):
+            for position, _, vacancy in page:
+                print(Fore.YELLOW + f'{position}.' + Style.RESET_ALL + ' ' + vacancy[
+                    'title'] + ' — ' + Fore.GREEN + Style.BRIGHT + str(vacancy['salary']) + ' ' + Fore.BLUE + vacancy[
+                          'currency'] + Style.RESET_ALL)
 
-            if id == int(data_top):
-                break
+    def similar_output(self, similar: List[Tuple[int, dict, float]]):
+        """
+        Выводит похожие вакансии с их номерами в выдаче и степенью похожести.
+
+        Аргументы:
+            similar (List[Tuple[int, dict, float]]): Номер вакансии, данные вакансии и похожесть от 0 до 1.
+        """
+        with metrics.timer('render'):
+            for position, vacancy, score in similar:
+                print(Fore.YELLOW + f'{position}.' + Style.RESET_ALL + ' ' + vacancy[
+                    'title'] + ' — ' + Fore.GREEN + Style.BRIGHT + str(vacancy['salary']) + ' ' + Fore.BLUE + vacancy[
+                          'currency'] + Style.RESET_ALL + Fore.MAGENTA + f' (похожесть {round(score * 100)}%)'
+                      + Style.RESET_ALL)
+
+    def comparison_output(self, comparison: 'VacancyComparison'):
+        """
+        Выводит таблицу сравнения группы вакансий.
+
+        Аргументы:
+            comparison (VacancyComparison): Сравнение вакансий.
+        """
+        def cut(text: Optional[str], width: int) -> str:
+            text = text or ''
+            return (text[:width - 1] + '…' if len(text) > width else text).ljust(width)
+
+        with metrics.timer('render'):
+            print(Fore.BLUE + Style.BRIGHT + f"Медианная зарплата группы: {int(comparison.median)}" + Style.RESET_ALL)
+            print(Fore.BLUE + Style.BRIGHT + f"{'№':>4} {'Место':>5}  {cut('Название', 32)} {'Зарплата':>10} "
+                  f"{'От медианы':>11}  {cut('Город', 16)} {'В городе':>12}  {cut('Работодатель', 20)} "
+                  f"{'У работодателя':>14}" + Style.RESET_ALL)
+            for row in comparison.rows():
+                difference = row['median_difference']
+                color = Fore.GREEN if difference > 0 else Fore.RED if difference < 0 else ''
+                print(Fore.YELLOW + f"{row['position']:>4}" + Style.RESET_ALL + f" {row['rank']:>5}  "
+                      + cut(row['title'], 32) + f" {row['salary']:>10} " + color + f"{difference:>+11}"
+                      + Style.RESET_ALL + '  ' + cut(row['city'], 16)
+                      + f" {round(row['city_percentile']):>3}% из {row['city_size']:<4}  " + cut(row['employer'], 20)
+                      + f" {round(row['employer_percentile']):>5}% из {row['employer_size']:<4}")
 
     def data_vacancy_info_output(self, vacancy: Type[Vacancy]):
         """
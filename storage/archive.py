@@ -0,0 +1,739 @@
+import json
+import lzma
+import os
+import struct
+import time
+import zlib
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from metrics.instrumentation import metrics
+from storage.dimensions import DIMENSION_FIELDS
+from storage.external_sort import DEFAULT_MEMORY_BUDGET, ExternalSorter, unique_sorted
+from storage.locking import atomic_write, file_lock
+from storage.salary_index import SalaryIntervalIndex, salary_bounds
+from storage.snapshots import vacancy_identity
+
+ARCHIVE_MAGIC: bytes = b'VARC'
+ARCHIVE_VERSION: int = 2
+
+# Метки записей файла, по которым индекс восстанавливается просмотром архива
+BLOCK_MAGIC: bytes = b'VBLK'
+SEGMENT_MAGIC: bytes = b'VSEG'
+
+# Заголовок файла: MAGIC | версия (uint16) | конец последнего полностью записанного сегмента (uint64)
+HEADER = struct.Struct('<4sHQ')
+COMMIT_OFFSET: int = len(ARCHIVE_MAGIC) + 2
+
+DEFAULT_BLOCK_SIZE: int = 1000
+
+# Форматы экспорта, которые пишутся потоком (колоночный формат собирает колонки целиком в памяти)
+STREAMING_EXPORT_FORMATS: List[str] = ['ndjson', 'csv']
+
+# Кодеки блоков: название -> (сжатие, распаковка)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    'zlib': (lambda data: zlib.compress(data, 9), zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+# Поля идентификаторов измерений зависят от сеанса и в архив не попадают
+SESSION_FIELDS = frozenset(DIMENSION_FIELDS.values())
+
+# Порядок записей сквозного рейтинга архива: название -> ключ сортировки пары (идентичность, вакансия)
+RANK_ORDERS: Dict[str, Callable[[Tuple[str, Dict]], Tuple]] = {
+    # Сначала самые высокие зарплаты
+    'salary': lambda record: (-(record[1].get('salary') or 0), record[0]),
+    # Сначала самые свежие вакансии
+    'date': lambda record: (-date_number(record[1].get('published_at')), record[0]),
+}
+
+
+def published_key(record: Tuple[str, Dict]) -> str:
+    """
+    Возвращает ключ раскладки записи по блокам — дату публикации вакансии.
+    """
+    return record[1].get('published_at') or ''
+
+
+def date_number(value: Optional[str]) -> int:
+    """
+    Превращает дату вида 'YYYY-MM-DD HH:MM:SS' в число с тем же порядком (для сортировки по убыванию).
+    """
+    return int(''.join(char for char in value or '' if char.isdigit()) or 0)
+
+
+def content_key(record: Tuple[str, Dict]) -> Tuple[str, int, str]:
+    """
+    Возвращает ключ дубликатов вакансии: название, зарплата и имя работодателя (как в VacancyFilter.remove_bad_vacancies).
+    """
+    vacancy = record[1]
+    return vacancy.get('title') or '', vacancy.get('salary') or 0, (vacancy.get('employer') or {}).get('name') or ''
+
+
+class VacancyArchive:
+    """
+    Архив вакансий из сжатых блоков с индексом блоков (формат VARC).
+
+    Структура файла:
+        заголовок | сегмент | сегмент | ...
+        заголовок: MAGIC | версия (uint16) | конец последнего записанного сегмента (uint64)
+        сегмент: блок | блок | ... | индекс сегмента
+        блок: BLOCK_MAGIC | длина (uint32) | JSON-заголовок блока | сжатые данные
+        индекс сегмента: SEGMENT_MAGIC | длина (uint32) | сжатый zlib JSON | длина (uint32) | MAGIC
+
+    Блок — JSON-список пар (идентичность вакансии, вакансия), сжатый кодеком блока. Вакансии
+    раскладываются по блокам в порядке даты публикации, а индекс хранит для каждого блока смещение,
+    кодек, число записей и диапазон дат, а для каждой вакансии — номер блока с ее последней версией.
+    Поэтому чтение одной вакансии или диапазона дат распаковывает только нужные блоки.
+    Кроме того, индекс хранит вилки зарплат последних версий вакансий, по которым строится
+    интервальный индекс для запросов по зарплате.
+
+    Каждая дозапись (append) добавляет в конец файла сегмент: новые блоки и индекс только этих
+    блоков со ссылкой на предыдущий сегмент. Уже записанные данные не изменяются, а заголовок
+    переключается на новый сегмент только после того, как тот записан на диск целиком. Поэтому
+    сбой посреди дозаписи оставляет архив в прежнем состоянии, а недописанный хвост отбрасывается
+    следующей дозаписью. Полный индекс собирается из цепочки сегментов; сжатие (compact)
+    переписывает архив в один сегмент. Если индекс все же поврежден, recover восстанавливает
+    его, просматривая блоки по их заголовкам.
+
+    Писатели (append, compact, recover) работают по очереди под блокировкой файла. Читатели
+    блокировку не берут: блоки после записи не изменяются, сжатие заменяет файл атомарно, а каждое
+    чтение идет через один открытый файл, индекс которого сверяется с его inode и заголовком.
+
+    Attributes:
+        filename (str): Имя файла архива.
+        codec (str): Кодек новых блоков ('zlib' или 'lzma').
+        block_size (int): Количество вакансий в блоке.
+    """
+
+    def __init__(self, filename: str, codec: str = 'zlib', block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"Неизвестный кодек: {codec}. Доступные кодеки: {', '.join(CODECS)}.")
+        self.filename = filename
+        self.codec = codec
+        self.block_size = block_size
+        self._footer: Optional[Dict[str, Any]] = None
+        self._inode: Optional[int] = None
+        self._cached_block: Tuple[int, List[List[Any]]] = (-1, [])
+        self._salary_index: Optional[SalaryIntervalIndex] = None
+
+    @property
+    def footer(self) -> Dict[str, Any]:
+        """
+        Возвращает индекс архива, читая его из файла при первом обращении.
+        """
+        if self._footer is None:
+            try:
+                with self._open():
+                    pass
+            except FileNotFoundError:
+                self._footer = self._empty_footer()
+        return self._footer
+
+    @property
+    def blocks(self) -> List[Dict[str, Any]]:
+        return self.footer['blocks']
+
+    def __len__(self) -> int:
+        return len(self.footer['ids'])
+
+    @staticmethod
+    def _empty_footer() -> Dict[str, Any]:
+        return {'version': ARCHIVE_VERSION, 'data_end': HEADER.size, 'segments': 0, 'blocks': [], 'ids': {},
+                'salaries': {}}
+
+    @staticmethod
+    def _new_segment(footer: Dict[str, Any]) -> Dict[str, Any]:
+        return {'previous': footer['data_end'], 'first_block': len(footer['blocks']), 'blocks': [], 'ids': {},
+                'salaries': {}}
+
+    @staticmethod
+    def _merge_segment(footer: Dict[str, Any], segment: Dict[str, Any], end: int) -> None:
+        """
+        Добавляет индекс сегмента, заканчивающегося в позиции end, к полному индексу архива.
+        """
+        if segment['first_block'] != len(footer['blocks']):
+            raise ValueError('Индекс сегмента не продолжает индекс архива.')
+        footer['blocks'].extend(segment['blocks'])
+        footer['ids'].update(segment['ids'])
+        salaries = footer['salaries']
+        for identity, bounds in segment['salaries'].items():
+            if bounds is None:
+                salaries.pop(identity, None)
+            else:
+                salaries[identity] = bounds
+        footer['data_end'] = end
+        footer['segments'] += 1
+
+    def _load_footer(self, file, attempts: int = 5) -> None:
+        """
+        Читает индекс из открытого файла архива. Если индекс уже прочитан из этого же файла,
+        дочитываются только сегменты, дописанные с тех пор. Если чтение не удалось (например,
+        сжатие как раз заменило файл), оно повторяется через короткую паузу.
+        """
+        file.seek(0)
+        if file.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+            raise ValueError(f"Файл {self.filename} не является архивом формата VARC.")
+        for attempt in range(attempts):
+            try:
+                inode = os.fstat(file.fileno()).st_ino
+                if inode != self._inode:
+                    self._footer = None
+                    self._cached_block = (-1, [])
+                file.seek(0)
+                _, version, committed_end = HEADER.unpack(file.read(HEADER.size))
+                if version == ARCHIVE_VERSION:
+                    self._load_segments(file, committed_end)
+                else:
+                    self._load_v1_footer(file)
+                self._inode = inode
+                return
+            except (ValueError, OSError, struct.error, zlib.error) as error:
+                if attempt == attempts - 1:
+                    raise ValueError(f'Не удалось прочитать индекс архива {self.filename}: {error}. '
+                                     f'Индекс можно восстановить командой recover.') from error
+                time.sleep(0.01)
+
+    def _load_segments(self, file, committed_end: int) -> None:
+        """
+        Собирает индекс из цепочки сегментов, начиная с последнего записанного.
+        """
+        footer = self._footer if self._footer is not None and self._footer['version'] == ARCHIVE_VERSION else None
+        if footer is not None and footer['data_end'] == committed_end:
+            return
+
+        segments = []
+        end = committed_end
+        while end > HEADER.size and (footer is None or end != footer['data_end']):
+            file.seek(end - 8)
+            length, magic = struct.unpack('<I4s', file.read(8))
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f'нет индекса сегмента в позиции {end}')
+            file.seek(end - 8 - length)
+            segment = json.loads(zlib.decompress(file.read(length)))
+            segments.append((segment, end))
+            end = segment['previous']
+        if footer is None or end != footer['data_end']:
+            # Индекс перестроен на месте (recover), поэтому собирается заново
+            footer = self._empty_footer()
+            self._cached_block = (-1, [])
+        for segment, end in reversed(segments):
+            self._merge_segment(footer, segment, end)
+        self._footer = footer
+        self._salary_index = None
+
+    def _load_v1_footer(self, file) -> None:
+        """
+        Читает индекс архива версии 1, в котором единственный футер записан в конце файла.
+        """
+        file.seek(-8, 2)
+        footer_length, magic = struct.unpack('<I4s', file.read(8))
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError('нет футера в конце файла')
+        file.seek(-8 - footer_length, 2)
+        if self._footer is None:
+            self._footer = json.loads(zlib.decompress(file.read(footer_length)))
+            self._footer.setdefault('segments', 1)
+            self._salary_index = None
+
+    def _open(self, mode: str = 'rb'):
+        """
+        Открывает файл архива и дочитывает индекс: заново, если файл был заменен сжатием,
+        или только новые сегменты, если архив был дописан.
+        """
+        file = open(self.filename, mode)
+        try:
+            self._load_footer(file)
+        except BaseException:
+            file.close()
+            raise
+        return file
+
+    def _create(self) -> None:
+        """
+        Создает пустой архив из одного заголовка.
+        """
+        with open(self.filename, 'wb') as file:
+            file.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, HEADER.size))
+        self._footer = None
+        self._inode = None
+
+    @staticmethod
+    def _write_segment(file, segment: Dict[str, Any]) -> int:
+        """
+        Записывает индекс сегмента с текущей позиции файла и отбрасывает все, что было записано после.
+
+        Returns:
+            int: Позиция конца сегмента.
+        """
+        index_bytes = zlib.compress(json.dumps(segment, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        file.write(SEGMENT_MAGIC + struct.pack('<I', len(index_bytes)))
+        file.write(index_bytes)
+        file.write(struct.pack('<I', len(index_bytes)) + ARCHIVE_MAGIC)
+        end = file.tell()
+        file.truncate()
+        return end
+
+    @staticmethod
+    def _commit(file, end: int) -> None:
+        """
+        Сбрасывает сегмент на диск и только затем переключает на него заголовок.
+        """
+        file.flush()
+        os.fsync(file.fileno())
+        file.seek(COMMIT_OFFSET)
+        file.write(struct.pack('<Q', end))
+        file.flush()
+        os.fsync(file.fileno())
+
+    def _encode_blocks(self, records: Iterable[Tuple[str, Dict]], file, segment: Dict[str, Any],
+                       crawled_at: str, presorted: bool = False) -> int:
+        """
+        Записывает записи блоками с текущей позиции файла и добавляет блоки в индекс сегмента.
+        Записи, уже упорядоченные по дате публикации (presorted), читаются потоком по одному блоку.
+
+        Returns:
+            int: Количество записанных блоков.
+        """
+        compress = CODECS[self.codec][0]
+        if not presorted:
+            records = sorted(records, key=published_key)
+        records = iter(records)
+        written = 0
+        while True:
+            chunk = list(islice(records, self.block_size))
+            if not chunk:
+                break
+            payload = json.dumps([[identity, vacancy] for identity, vacancy in chunk],
+                                 ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            data = compress(payload)
+            block_number = segment['first_block'] + len(segment['blocks'])
+            block = {
+                'length': len(data),
+                'codec': self.codec,
+                'count': len(chunk),
+                'min_published_at': chunk[0][1].get('published_at'),
+                'max_published_at': chunk[-1][1].get('published_at'),
+                'crawled_at': crawled_at,
+            }
+            header = json.dumps(block, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            file.write(BLOCK_MAGIC + struct.pack('<I', len(header)))
+            file.write(header)
+            segment['blocks'].append({'offset': file.tell(), **block})
+            file.write(data)
+            self._index_records(segment, block_number, chunk)
+            metrics.increment('archive.bytes_written', len(data))
+            metrics.increment('archive.bytes_raw', len(payload))
+            written += 1
+        return written
+
+    @staticmethod
+    def _index_records(segment: Dict[str, Any], block_number: int, records: Iterable[Tuple[str, Dict]]) -> None:
+        """
+        Отмечает в индексе сегмента, что последние версии вакансий лежат в блоке block_number.
+        Вилка зарплаты None означает, что у новой версии вакансии зарплаты нет.
+        """
+        for identity, vacancy in records:
+            segment['ids'][identity] = block_number
+            salary_from, salary_to = salary_bounds(vacancy)
+            if salary_from is None and salary_to is None:
+                segment['salaries'][identity] = None
+            else:
+                segment['salaries'][identity] = [salary_from, salary_to]
+
+    def append(self, vacancies: Dict[str, Dict], crawled_at: Optional[str] = None) -> int:
+        """
+        Дописывает вакансии в архив новым сегментом. Более поздняя версия вакансии
+        с той же идентичностью заменяет прежнюю в индексе. Записывается только индекс
+        новых блоков, поэтому время дозаписи не зависит от размера архива.
+
+        Parameters:
+            vacancies (Dict[str, Dict]): Вакансии в кратком формате.
+            crawled_at (Optional[str]): Время обхода (по умолчанию текущее).
+
+        Returns:
+            int: Количество записанных блоков.
+        """
+        crawled_at = crawled_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        records = [(vacancy_identity(vacancy),
+                    {key: value for key, value in vacancy.items() if key not in SESSION_FIELDS})
+                   for vacancy in vacancies.values()]
+        if not records:
+            return 0
+
+        with metrics.timer('archive.append'), file_lock(self.filename):
+            if not os.path.exists(self.filename):
+                self._create()
+            # Другой процесс мог дописать архив, поэтому индекс дочитывается под блокировкой
+            with self._open() as file:
+                pass
+            if self._footer['version'] != ARCHIVE_VERSION:
+                # Архив версии 1 один раз переписывается в текущий формат
+                self._compact_locked()
+
+            with self._open('r+b') as file:
+                footer = self._footer
+                segment = self._new_segment(footer)
+                # Хвост недописанного при сбое сегмента перезаписывается
+                file.seek(footer['data_end'])
+                written = self._encode_blocks(records, file, segment, crawled_at)
+                end = self._write_segment(file, segment)
+                self._commit(file, end)
+            self._merge_segment(footer, segment, end)
+            self._salary_index = None
+        return written
+
+    def recover(self) -> Dict[str, int]:
+        """
+        Восстанавливает поврежденный индекс: просматривает файл от начала по заголовкам блоков,
+        распаковывает каждый целый блок и записывает по ним новый индекс. Блоки дописи, прерванной
+        сбоем, тоже попадают в индекс, если записаны целиком; все, что лежит после последнего
+        целого блока, отбрасывается.
+
+        Returns:
+            Dict[str, int]: Количество восстановленных блоков и вакансий и отброшенных байт.
+        """
+        with metrics.timer('archive.recover'), file_lock(self.filename), open(self.filename, 'r+b') as file:
+            magic, version, _ = HEADER.unpack(file.read(HEADER.size))
+            if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+                raise ValueError(f'Восстановление поддерживается только для архивов версии {ARCHIVE_VERSION}.')
+            size = os.fstat(file.fileno()).st_size
+            footer = self._empty_footer()
+            segment = self._new_segment(footer)
+            position = good_end = HEADER.size
+            while position + 8 <= size:
+                file.seek(position)
+                tag, length = struct.unpack('<4sI', file.read(8))
+                if tag == SEGMENT_MAGIC:
+                    # Прежние индексы сегментов пропускаются: индекс строится заново по блокам
+                    position += 8 + length + 8
+                    if position > size:
+                        break
+                    good_end = position
+                    continue
+                if tag != BLOCK_MAGIC:
+                    break
+                try:
+                    block = json.loads(file.read(length))
+                    offset = position + 8 + length
+                    if offset + block['length'] > size:
+                        break
+                    records = json.loads(CODECS[block['codec']][1](file.read(block['length'])))
+                except (ValueError, KeyError, TypeError, zlib.error, lzma.LZMAError):
+                    break
+                block_number = len(segment['blocks'])
+                segment['blocks'].append({'offset': offset, **block})
+                self._index_records(segment, block_number, records)
+                position = good_end = offset + block['length']
+
+            segment['salaries'] = {identity: bounds for identity, bounds in segment['salaries'].items()
+                                   if bounds is not None}
+            file.seek(good_end)
+            end = self._write_segment(file, segment)
+            self._commit(file, end)
+
+        self._footer = None
+        self._inode = None
+        self._cached_block = (-1, [])
+        self._salary_index = None
+        metrics.increment('archive.recovered')
+        return {'blocks': len(segment['blocks']), 'vacancies': len(segment['ids']), 'bytes_dropped': size - good_end}
+
+    def read_block(self, block_number: int, file=None) -> List[List[Any]]:
+        """
+        Распаковывает один блок архива.
+
+        Parameters:
+            block_number (int): Номер блока.
+            file: Открытый методом _open файл архива (по умолчанию открывается заново).
+
+        Returns:
+            List[List[Any]]: Пары (идентичность, вакансия) блока.
+        """
+        if file is None:
+            with self._open() as file:
+                return self.read_block(block_number, file)
+        if self._cached_block[0] == block_number:
+            return self._cached_block[1]
+
+        block = self.blocks[block_number]
+        with metrics.timer('archive.read_block'):
+            file.seek(block['offset'])
+            records = json.loads(CODECS[block['codec']][1](file.read(block['length'])))
+        metrics.increment('archive.blocks_read')
+        self._cached_block = (block_number, records)
+        return records
+
+    def get(self, identity: str) -> Optional[Dict]:
+        """
+        Возвращает последнюю версию вакансии, распаковывая только ее блок.
+
+        Parameters:
+            identity (str): Идентичность вакансии (площадка:id).
+
+        Returns:
+            Optional[Dict]: Вакансия или None, если ее нет в архиве.
+        """
+        with self._open() as file:
+            block_number = self.footer['ids'].get(identity)
+            if block_number is None:
+                return None
+            for record_identity, vacancy in self.read_block(block_number, file):
+                if record_identity == identity:
+                    return vacancy
+        return None
+
+    def read_range(self, start: Optional[str] = None, end: Optional[str] = None,
+                   latest_only: bool = True) -> Iterator[Dict]:
+        """
+        Возвращает вакансии, опубликованные в диапазоне дат, распаковывая только
+        блоки, чей диапазон дат пересекается с запрошенным.
+
+        Parameters:
+            start (Optional[str]): Начало диапазона ('YYYY-MM-DD' или 'YYYY-MM-DD HH:MM:SS').
+            end (Optional[str]): Конец диапазона включительно (в том же формате).
+            latest_only (bool): Пропускать устаревшие версии вакансий.
+
+        Returns:
+            Iterator[Dict]: Вакансии диапазона.
+        """
+        # Дата без времени в конце диапазона включает весь день
+        if end is not None and len(end) == 10:
+            end += ' 23:59:59'
+
+        with self._open() as file:
+            ids = self.footer['ids']
+            for block_number, block in enumerate(self.blocks):
+                if start is not None and (block['max_published_at'] or '') < start:
+                    continue
+                if end is not None and (block['min_published_at'] or '') > end:
+                    continue
+                records = self.read_block(block_number, file)
+                if latest_only:
+                    # Если вакансия попала в один блок дважды, последней версией считается последняя запись
+                    records = dict(records).items()
+                for identity, vacancy in records:
+                    published_at = vacancy.get('published_at') or ''
+                    if (start is None or published_at >= start) and (end is None or published_at <= end) \
+                            and (not latest_only or ids.get(identity) == block_number):
+                        yield vacancy
+
+    @property
+    def salary_index(self) -> SalaryIntervalIndex:
+        """
+        Возвращает интервальный индекс вилок зарплат последних версий вакансий.
+        Архивы, записанные до появления вилок в индексе, один раз просматриваются целиком.
+        """
+        with self._open():
+            if self._salary_index is None:
+                salaries = self.footer.get('salaries')
+                if salaries is None:
+                    salaries = {}
+                    for vacancy in self.read_range():
+                        bounds = salary_bounds(vacancy)
+                        if bounds != (None, None):
+                            salaries[vacancy_identity(vacancy)] = bounds
+                self._salary_index = SalaryIntervalIndex.from_dict(salaries)
+        return self._salary_index
+
+    def find_by_salary(self, low: Optional[int] = None, high: Optional[int] = None,
+                       guaranteed: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Возвращает вакансии, чья вилка зарплаты пересекается с диапазоном [low, high] и, если
+        задан guaranteed, нижняя граница вилки не меньше guaranteed. Подходящие вакансии
+        находятся по интервальному индексу, и распаковываются только их блоки.
+
+        Parameters:
+            low (Optional[int]): Нижняя граница диапазона.
+            high (Optional[int]): Верхняя граница диапазона.
+            guaranteed (Optional[int]): Минимальная гарантированная зарплата.
+
+        Returns:
+            Iterator[Dict]: Подходящие вакансии в порядке блоков.
+        """
+        index = self.salary_index
+        identities = set(index.overlapping(low, high))
+        if guaranteed is not None:
+            identities.intersection_update(index.guaranteed(guaranteed))
+
+        with self._open() as file:
+            ids = self.footer['ids']
+            by_block: Dict[int, set] = {}
+            for identity in identities:
+                block_number = ids.get(identity)
+                if block_number is not None:
+                    by_block.setdefault(block_number, set()).add(identity)
+            for block_number in sorted(by_block):
+                wanted = by_block[block_number]
+                for identity, vacancy in self.read_block(block_number, file):
+                    if identity in wanted:
+                        yield vacancy
+
+    def compact(self, expire_before: Optional[str] = None, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                temp_dir: Optional[str] = None) -> Dict[str, int]:
+        """
+        Переписывает архив: удаляет устаревшие версии вакансий и вакансии, опубликованные
+        раньше expire_before, и заново раскладывает оставшиеся по полным блокам.
+        Новый файл записывается рядом и атомарно заменяет старый. Записи упорядочиваются
+        по дате публикации внешней сортировкой, поэтому памяти нужно не больше memory_budget,
+        каким бы большим ни был архив.
+
+        Parameters:
+            expire_before (Optional[str]): Граница устаревания по дате публикации.
+            memory_budget (int): Память под буфер сортировки в байтах.
+            temp_dir (Optional[str]): Каталог временных файлов сортировки.
+
+        Returns:
+            Dict[str, int]: Количество записей и размер файла до и после.
+        """
+        with metrics.timer('archive.compact'), file_lock(self.filename):
+            return self._compact_locked(expire_before, memory_budget, temp_dir)
+
+    def _compact_locked(self, expire_before: Optional[str] = None, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                        temp_dir: Optional[str] = None) -> Dict[str, int]:
+        """
+        Выполняет compact; блокировку файла держит вызывающий.
+        """
+        with ExternalSorter(published_key, memory_budget, temp_dir) as sorter:
+            total = 0
+            with self._open() as source:
+                ids = self.footer['ids']
+                for block_number in range(len(self.blocks)):
+                    records = self.read_block(block_number, source)
+                    total += len(records)
+                    for identity, vacancy in dict(records).items():
+                        if ids.get(identity) != block_number:
+                            continue
+                        if expire_before is not None and (vacancy.get('published_at') or '') < expire_before:
+                            continue
+                        sorter.add((identity, vacancy))
+                size_before = os.fstat(source.fileno()).st_size
+            self._cached_block = (-1, [])
+
+            segment = self._new_segment(self._empty_footer())
+            with atomic_write(self.filename, 'w+b') as file:
+                file.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, HEADER.size))
+                crawled_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                self._encode_blocks(sorter.sorted(), file, segment, crawled_at, presorted=True)
+                segment['salaries'] = {identity: bounds for identity, bounds in segment['salaries'].items()
+                                       if bounds is not None}
+                self._commit(file, self._write_segment(file, segment))
+
+        self._footer = None
+        self._inode = None
+        self._cached_block = (-1, [])
+        self._salary_index = None
+        return {'records_before': total, 'records_after': sorter.records,
+                'bytes_before': size_before, 'bytes_after': os.path.getsize(self.filename),
+                'sort_runs': sorter.runs}
+
+    def ranked(self, order: str = 'salary', dedup: bool = True, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+               temp_dir: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Возвращает последние версии всех вакансий архива в сквозном порядке order. При dedup
+        вакансии без зарплаты отбрасываются, а из вакансий с одинаковыми названием, зарплатой
+        и работодателем (например, опубликованных заново) остается самая свежая.
+
+        Архив может не помещаться в память: дубликаты находятся внешней сортировкой по ключу
+        дубликатов, а рейтинг — второй внешней сортировкой. Каждой сортировке нужно не больше
+        memory_budget байт под буфер, остальное хранится во временных файлах.
+
+        Parameters:
+            order (str): Порядок ('salary' — по убыванию зарплаты, 'date' — сначала свежие).
+            dedup (bool): Убрать вакансии без зарплаты и дубликаты.
+            memory_budget (int): Память под буфер каждой сортировки в байтах.
+            temp_dir (Optional[str]): Каталог временных файлов сортировки.
+
+        Returns:
+            Iterator[Tuple[str, Dict]]: Пары (идентичность, вакансия) в порядке рейтинга.
+        """
+        if order not in RANK_ORDERS:
+            raise ValueError(f"Неизвестный порядок: {order}. Доступные порядки: {', '.join(RANK_ORDERS)}.")
+        records = ((vacancy_identity(vacancy), vacancy) for vacancy in self.read_range())
+
+        with metrics.timer('archive.rank'), ExternalSorter(RANK_ORDERS[order], memory_budget, temp_dir) as ranking:
+            if dedup:
+                # Внутри группы дубликатов записи упорядочены по дате публикации, последняя — самая свежая
+                with ExternalSorter(lambda record: (*content_key(record), published_key(record)), memory_budget,
+                                    temp_dir) as contents:
+                    contents.extend(record for record in records if record[1].get('salary'))
+                    ranking.extend(unique_sorted(contents.sorted(), content_key))
+                metrics.increment('archive.rank_dropped', contents.records - ranking.records, reason='duplicate')
+            else:
+                ranking.extend(records)
+            yield from ranking.sorted()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Командная строка архива: сведения об архиве, восстановление индекса, сжатие, поиск по зарплате и выгрузка рейтинга.
+    """
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Архив вакансий формата VARC.')
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    info_parser = commands.add_parser('info', help='показать сведения об архиве')
+    info_parser.add_argument('archive')
+
+    recover_parser = commands.add_parser('recover', help='восстановить поврежденный индекс архива по блокам')
+    recover_parser.add_argument('archive')
+
+    compact_parser = commands.add_parser('compact', help='переписать архив, удалив устаревшие вакансии')
+    compact_parser.add_argument('archive')
+    compact_parser.add_argument('--before', help='удалить вакансии, опубликованные раньше этой даты (YYYY-MM-DD)')
+    compact_parser.add_argument('--codec', choices=list(CODECS), default='zlib', help='кодек новых блоков')
+    compact_parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE, help='вакансий в блоке')
+
+    salary_parser = commands.add_parser('salary', help='найти вакансии по вилке зарплаты (NDJSON)')
+    salary_parser.add_argument('archive')
+    salary_parser.add_argument('--min', type=int, help='нижняя граница диапазона зарплаты')
+    salary_parser.add_argument('--max', type=int, help='верхняя граница диапазона зарплаты')
+    salary_parser.add_argument('--guaranteed', type=int, help='минимальная гарантированная зарплата')
+
+    export_parser = commands.add_parser('export', help='выгрузить архив в сквозном порядке, без дубликатов')
+    export_parser.add_argument('archive')
+    export_parser.add_argument('--output', required=True, help='имя файла экспорта')
+    export_parser.add_argument('--format', choices=STREAMING_EXPORT_FORMATS, default='ndjson',
+                               help='формат экспорта (потоковый, чтобы не держать архив в памяти)')
+    export_parser.add_argument('--order', choices=list(RANK_ORDERS), default='salary',
+                               help='порядок: по убыванию зарплаты или сначала свежие')
+    export_parser.add_argument('--no-dedup', dest='dedup', action='store_false',
+                               help='оставить вакансии без зарплаты и дубликаты')
+    export_parser.add_argument('--limit', type=int, help='выгрузить только первые N вакансий рейтинга')
+
+    for parser in (compact_parser, export_parser):
+        parser.add_argument('--memory-budget', type=int, default=DEFAULT_MEMORY_BUDGET // 2 ** 20,
+                            help='память под буфер сортировки, МБ')
+        parser.add_argument('--temp-dir', help='каталог временных файлов сортировки')
+
+    args = arg_parser.parse_args(argv)
+    if args.command == 'export':
+        from storage.exporters import get_exporter
+
+        ranked = VacancyArchive(args.archive).ranked(args.order, args.dedup, args.memory_budget * 2 ** 20,
+                                                     args.temp_dir)
+        if args.limit is not None:
+            ranked = islice(ranked, args.limit)
+        exported = get_exporter(args.format).export(ranked, args.output)
+        print(json.dumps({'exported': exported, 'output': args.output}, ensure_ascii=False, indent=2))
+        return
+    if args.command == 'salary':
+        for vacancy in VacancyArchive(args.archive).find_by_salary(args.min, args.max, args.guaranteed):
+            print(json.dumps(vacancy, ensure_ascii=False))
+        return
+    if args.command == 'info':
+        archive = VacancyArchive(args.archive)
+        result: Dict[str, Any] = {'vacancies': len(archive), 'blocks': len(archive.blocks),
+                                  'segments': archive.footer['segments'], 'bytes': os.path.getsize(args.archive)}
+    elif args.command == 'recover':
+        result = VacancyArchive(args.archive).recover()
+    else:
+        result = VacancyArchive(args.archive, args.codec, args.block_size).compact(
+            args.before, args.memory_budget * 2 ** 20, args.temp_dir)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from metrics.instrumentation import metrics
+from storage.locking import atomic_write
+
+DEFAULT_CACHE_DIR: str = os.path.join('cache', 'details')
+
+# Сколько секунд описание считается свежим. Площадки не отдают в выдаче время изменения вакансии,
+# а дата публикации при правке описания меняется не всегда, поэтому записи устаревают по возрасту
+DEFAULT_MAX_AGE: float = 24 * 60 * 60
+
+
+class DetailCache:
+    """
+    Дисковый кэш полных описаний вакансий, адресуемый по содержимому.
+
+    Ключ записи — SHA-256 от площадки, идентификатора вакансии и времени ее последнего изменения,
+    поэтому обновленная вакансия получает новый ключ, а старая запись просто перестает читаться.
+    Временем изменения служит дата публикации, которая при правке вакансии меняется не всегда,
+    поэтому запись старше max_age тоже считается отсутствующей и загружается заново.
+    Записи раскладываются по подкаталогам по первым двум символам ключа и пишутся атомарно.
+
+    Attributes:
+        directory (str): Каталог кэша.
+        max_age (float): Сколько секунд запись считается свежей.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_age: float = DEFAULT_MAX_AGE) -> None:
+        self.directory = directory
+        self.max_age = max_age
+
+    @staticmethod
+    def make_key(platform: str, vacancy_id: str, modified_at: Optional[str]) -> str:
+        """
+        Вычисляет ключ записи кэша.
+
+        Parameters:
+            platform (str): Короткое имя площадки.
+            vacancy_id (str): Идентификатор вакансии.
+            modified_at (Optional[str]): Время последнего изменения вакансии.
+
+        Returns:
+            str: Ключ записи (hex SHA-256).
+        """
+        return hashlib.sha256(f'{platform}\x00{vacancy_id}\x00{modified_at or ""}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    def get(self, platform: str, vacancy_id: str, modified_at: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает сохраненное описание вакансии или None, если его нет в кэше или запись устарела.
+
+        Parameters:
+            platform (str): Короткое имя площадки.
+            vacancy_id (str): Идентификатор вакансии.
+            modified_at (Optional[str]): Время последнего изменения вакансии.
+
+        Returns:
+            Optional[Dict[str, Any]]: Ответ API с описанием вакансии.
+        """
+        try:
+            with open(self._path(self.make_key(platform, vacancy_id, modified_at)), 'r', encoding='utf-8') as file:
+                if time.time() - os.fstat(file.fileno()).st_mtime > self.max_age:
+                    metrics.increment('cache.expired', cache='details', platform=platform)
+                    raise ValueError('запись кэша устарела')
+                body = json.load(file)
+        except (OSError, ValueError):
+            metrics.increment('cache.misses', cache='details', platform=platform)
+            return None
+
+        metrics.increment('cache.hits', cache='details', platform=platform)
+        return body
+
+    def put(self, platform: str, vacancy_id: str, modified_at: Optional[str], body: Dict[str, Any]) -> None:
+        """
+        Сохраняет описание вакансии в кэш.
+
+        Parameters:
+            platform (str): Короткое имя площадки.
+            vacancy_id (str): Идентификатор вакансии.
+            modified_at (Optional[str]): Время последнего изменения вакансии.
+            body (Dict[str, Any]): Ответ API с описанием вакансии.
+        """
+        # Запись во временный файл и замена, чтобы параллельные читатели не увидели половину файла
+        with atomic_write(self._path(self.make_key(platform, vacancy_id, modified_at))) as file:
+            json.dump(body, file, ensure_ascii=False)
@@ -0,0 +1,187 @@
+from typing import Any, Dict, Hashable, List, Optional
+
+# Поля краткого формата вакансии, которые выносятся в таблицы измерений: поле -> ключ идентификатора
+DIMENSION_FIELDS: Dict[str, str] = {
+    'employer': 'employer_id',
+    'city': 'city_id',
+    'currency': 'currency_id',
+}
+
+
+class DimensionTable:
+    """
+    Таблица измерения: каждому уникальному значению присваивается целочисленный идентификатор,
+    а само значение хранится в таблице в единственном экземпляре.
+
+    Attributes:
+        values (List[Hashable]): Значения по идентификаторам.
+    """
+
+    def __init__(self, values: Optional[List[Hashable]] = None) -> None:
+        self.values: List[Hashable] = []
+        self._ids: Dict[Hashable, int] = {}
+        for value in values or []:
+            self.intern(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: Hashable) -> int:
+        """
+        Возвращает идентификатор значения, добавляя значение в таблицу при первой встрече.
+
+        Parameters:
+            value (Hashable): Значение измерения.
+
+        Returns:
+            int: Идентификатор значения.
+        """
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def find(self, value: Hashable) -> Optional[int]:
+        """
+        Возвращает идентификатор значения или None, если значения нет в таблице.
+
+        Parameters:
+            value (Hashable): Значение измерения.
+
+        Returns:
+            Optional[int]: Идентификатор значения.
+        """
+        return self._ids.get(value)
+
+    def value(self, value_id: int) -> Hashable:
+        """
+        Возвращает значение по идентификатору.
+
+        Parameters:
+            value_id (int): Идентификатор значения.
+
+        Returns:
+            Hashable: Значение измерения.
+        """
+        return self.values[value_id]
+
+
+class VacancyDimensions:
+    """
+    Таблицы измерений вакансий: работодатели (пара имя и ссылка), города и валюты.
+
+    Вакансии в кратком формате хранят идентификаторы измерений рядом со строками, причем строки
+    берутся из таблиц, поэтому одинаковые значения разделяются всеми вакансиями. В файле вакансии
+    хранятся только с идентификаторами, а таблицы записываются рядом с ними.
+
+    Attributes:
+        employers (DimensionTable): Работодатели, значения — кортежи (имя, ссылка).
+        cities (DimensionTable): Города.
+        currencies (DimensionTable): Валюты.
+    """
+
+    def __init__(self) -> None:
+        self.employers = DimensionTable()
+        self.cities = DimensionTable()
+        self.currencies = DimensionTable()
+
+    def table(self, field: str) -> DimensionTable:
+        """
+        Возвращает таблицу измерения по полю краткого формата ('employer', 'city' или 'currency').
+
+        Parameters:
+            field (str): Поле вакансии.
+
+        Returns:
+            DimensionTable: Таблица измерения.
+        """
+        if field not in DIMENSION_FIELDS:
+            raise ValueError(f"Неизвестное измерение: {field}. "
+                             f"Доступные измерения: {', '.join(DIMENSION_FIELDS)}.")
+        return {'employer': self.employers, 'city': self.cities, 'currency': self.currencies}[field]
+
+    def intern_vacancy(self, vacancy: Dict) -> Dict:
+        """
+        Добавляет вакансии идентификаторы измерений и заменяет ее строки экземплярами из таблиц.
+        Вакансия изменяется на месте.
+
+        Parameters:
+            vacancy (Dict): Вакансия в кратком формате.
+
+        Returns:
+            Dict: Та же вакансия.
+        """
+        employer: Dict = vacancy.get('employer') or {}
+        employer_id = self.employers.intern((employer.get('name'), employer.get('url')))
+        name, url = self.employers.values[employer_id]
+        vacancy['employer'] = {'name': name, 'url': url}
+        vacancy['employer_id'] = employer_id
+
+        for field in ('city', 'currency'):
+            table = self.table(field)
+            value_id = table.intern(vacancy.get(field))
+            vacancy[field] = table.values[value_id]
+            vacancy[DIMENSION_FIELDS[field]] = value_id
+        return vacancy
+
+    def encode(self, vacancy: Dict) -> Dict:
+        """
+        Возвращает запись вакансии для хранения: строки измерений заменены идентификаторами.
+
+        Parameters:
+            vacancy (Dict): Вакансия в кратком формате.
+
+        Returns:
+            Dict: Вакансия без строк измерений.
+        """
+        if 'employer_id' not in vacancy:
+            vacancy = self.intern_vacancy(dict(vacancy))
+        return {key: value for key, value in vacancy.items() if key not in DIMENSION_FIELDS}
+
+    def decode(self, record: Dict, source: Optional['VacancyDimensions'] = None) -> Dict:
+        """
+        Восстанавливает вакансию в кратком формате из записи хранения.
+
+        Parameters:
+            record (Dict): Вакансия с идентификаторами измерений.
+            source (Optional[VacancyDimensions]): Таблицы, на которые ссылается запись
+                (по умолчанию эти же). Идентификаторы переводятся в идентификаторы этих таблиц.
+
+        Returns:
+            Dict: Вакансия в кратком формате.
+        """
+        source = source or self
+        vacancy = dict(record)
+        name, url = source.employers.value(record['employer_id'])
+        vacancy['employer'] = {'name': name, 'url': url}
+        vacancy['city'] = source.cities.value(record['city_id'])
+        vacancy['currency'] = source.currencies.value(record['currency_id'])
+        return self.intern_vacancy(vacancy) if source is not self else vacancy
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """
+        Возвращает таблицы в виде, пригодном для JSON.
+        """
+        return {
+            'employers': [list(value) for value in self.employers.values],
+            'cities': list(self.cities.values),
+            'currencies': list(self.currencies.values),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[Any]]) -> 'VacancyDimensions':
+        """
+        Восстанавливает таблицы из результата to_dict.
+
+        Parameters:
+            data (Dict[str, List[Any]]): Таблицы измерений.
+
+        Returns:
+            VacancyDimensions: Таблицы измерений.
+        """
+        dimensions = cls()
+        dimensions.employers = DimensionTable([tuple(value) for value in data.get('employers', [])])
+        dimensions.cities = DimensionTable(data.get('cities', []))
+        dimensions.currencies = DimensionTable(data.get('currencies', []))
+        return dimensions
@@ -0,0 +1,256 @@
+import csv
+import json
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Плоская схема вакансии, общая для всех форматов экспорта: (имя колонки, тип).
+EXPORT_FIELDS: List[Tuple[str, str]] = [
+    ('key', 'str'),
+    ('id', 'str'),
+    ('platform', 'str'),
+    ('title', 'str'),
+    ('url', 'str'),
+    ('currency', 'str'),
+    ('salary', 'int64'),
+    ('salary_from', 'int64'),
+    ('salary_to', 'int64'),
+    ('description', 'str'),
+    ('city', 'str'),
+    ('published_at', 'str'),
+    ('employer_name', 'str'),
+    ('employer_url', 'str'),
+]
+
+COLUMNAR_MAGIC: bytes = b'VCOL'
+COLUMNAR_VERSION: int = 1
+
+VacancyItems = Union[Dict[str, Dict], Iterable[Tuple[str, Dict]]]
+
+
+def iter_vacancy_items(vacancies: VacancyItems) -> Iterator[Tuple[str, Dict]]:
+    """
+    Возвращает итератор пар (ключ, вакансия) для словаря или уже готового потока пар.
+
+    Parameters:
+        vacancies (VacancyItems): Словарь вакансий или итерируемый объект пар.
+
+    Returns:
+        Iterator[Tuple[str, Dict]]: Поток пар (ключ, вакансия).
+    """
+    if isinstance(vacancies, dict):
+        return iter(vacancies.items())
+    return iter(vacancies)
+
+
+def flatten_vacancy(key: str, vacancy: Dict) -> Dict[str, Any]:
+    """
+    Разворачивает вакансию в плоскую строку по схеме EXPORT_FIELDS.
+
+    Parameters:
+        key (str): Ключ вакансии в наборе ("vacancy N").
+        vacancy (Dict): Вакансия в кратком формате.
+
+    Returns:
+        Dict[str, Any]: Плоская запись вакансии.
+    """
+    employer: Dict = vacancy.get('employer') or {}
+    return {
+        'key': key,
+        'id': vacancy.get('id'),
+        'platform': vacancy.get('platform'),
+        'title': vacancy.get('title'),
+        'url': vacancy.get('url'),
+        'currency': vacancy.get('currency'),
+        'salary': vacancy.get('salary'),
+        'salary_from': vacancy.get('salary_from'),
+        'salary_to': vacancy.get('salary_to'),
+        'description': vacancy.get('description'),
+        'city': vacancy.get('city'),
+        'published_at': vacancy.get('published_at'),
+        'employer_name': employer.get('name'),
+        'employer_url': employer.get('url'),
+    }
+
+
+class AbstractExporter(ABC):
+    """
+    Базовый класс экспортера вакансий в машиночитаемый формат.
+    """
+    extension: str = ''
+
+    @abstractmethod
+    def export(self, vacancies: VacancyItems, filename: str) -> int:
+        """
+        Абстрактный метод для экспорта вакансий в файл.
+
+        Parameters:
+            vacancies (VacancyItems): Словарь вакансий или поток пар (ключ, вакансия).
+            filename (str): Имя файла.
+
+        Returns:
+            int: Количество записанных вакансий.
+        """
+        pass
+
+
+class NDJSONExporter(AbstractExporter):
+    """
+    Экспорт в NDJSON: одна плоская вакансия на строку, запись идет потоково.
+    """
+    extension = 'ndjson'
+
+    def export(self, vacancies: VacancyItems, filename: str) -> int:
+        count: int = 0
+        with open(filename, 'w', encoding='utf-8') as file:
+            for key, vacancy in iter_vacancy_items(vacancies):
+                file.write(json.dumps(flatten_vacancy(key, vacancy), ensure_ascii=False))
+                file.write('\n')
+                count += 1
+        return count
+
+
+class CSVExporter(AbstractExporter):
+    """
+    Экспорт в CSV с заголовком, запись идет потоково.
+    """
+    extension = 'csv'
+
+    def export(self, vacancies: VacancyItems, filename: str) -> int:
+        count: int = 0
+        with open(filename, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=[name for name, _ in EXPORT_FIELDS])
+            writer.writeheader()
+            for key, vacancy in iter_vacancy_items(vacancies):
+                writer.writerow(flatten_vacancy(key, vacancy))
+                count += 1
+        return count
+
+
+class ColumnarExporter(AbstractExporter):
+    """
+    Экспорт в бинарный колоночный формат VCOL (по аналогии с Parquet).
+
+    Структура файла:
+        MAGIC | сжатые zlib блоки колонок | JSON-футер со схемой | длина футера (uint32) | MAGIC
+
+    Каждая колонка хранит маску пустых значений (1 байт на строку) и данные:
+    для int64 — массив чисел, для str — смещения (int64, строк + 1) и общий UTF-8 буфер.
+    """
+    extension = 'vcol'
+
+    def export(self, vacancies: VacancyItems, filename: str) -> int:
+        columns: Dict[str, List[Any]] = {name: [] for name, _ in EXPORT_FIELDS}
+        count: int = 0
+        for key, vacancy in iter_vacancy_items(vacancies):
+            row = flatten_vacancy(key, vacancy)
+            for name, _ in EXPORT_FIELDS:
+                columns[name].append(row[name])
+            count += 1
+
+        footer: Dict[str, Any] = {'version': COLUMNAR_VERSION, 'rows': count, 'columns': []}
+        with open(filename, 'wb') as file:
+            file.write(COLUMNAR_MAGIC)
+            for name, kind in EXPORT_FIELDS:
+                chunk = zlib.compress(self._encode_column(columns[name], kind))
+                footer['columns'].append({'name': name, 'type': kind,
+                                          'offset': file.tell(), 'length': len(chunk)})
+                file.write(chunk)
+            footer_bytes = json.dumps(footer).encode('utf-8')
+            file.write(footer_bytes)
+            file.write(struct.pack('<I', len(footer_bytes)))
+            file.write(COLUMNAR_MAGIC)
+        return count
+
+    @staticmethod
+    def _encode_column(values: List[Any], kind: str) -> bytes:
+        """
+        Кодирует значения одной колонки в байты.
+
+        Parameters:
+            values (List[Any]): Значения колонки.
+            kind (str): Тип колонки ('int64' или 'str').
+
+        Returns:
+            bytes: Маска пустых значений и данные колонки.
+        """
+        nulls = bytes(1 if value is None else 0 for value in values)
+        if kind == 'int64':
+            data = array('q', (0 if value is None else int(value) for value in values))
+            return nulls + data.tobytes()
+
+        offsets = array('q', [0])
+        buffer = bytearray()
+        for value in values:
+            if value is not None:
+                buffer += str(value).encode('utf-8')
+            offsets.append(len(buffer))
+        return nulls + offsets.tobytes() + bytes(buffer)
+
+
+def read_columnar(filename: str, columns: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+    """
+    Читает файл формата VCOL, распаковывая только запрошенные колонки.
+
+    Parameters:
+        filename (str): Имя файла.
+        columns (Optional[List[str]]): Нужные колонки (по умолчанию все).
+
+    Returns:
+        Dict[str, List[Any]]: Значения колонок по именам.
+    """
+    with open(filename, 'rb') as file:
+        file.seek(-8, 2)
+        footer_length, magic = struct.unpack('<I4s', file.read(8))
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError(f"Файл {filename} не является файлом формата VCOL.")
+        file.seek(-8 - footer_length, 2)
+        footer: Dict[str, Any] = json.loads(file.read(footer_length))
+
+        rows: int = footer['rows']
+        result: Dict[str, List[Any]] = {}
+        for column in footer['columns']:
+            if columns is not None and column['name'] not in columns:
+                continue
+            file.seek(column['offset'])
+            raw = zlib.decompress(file.read(column['length']))
+            nulls, body = raw[:rows], raw[rows:]
+
+            if column['type'] == 'int64':
+                data = array('q')
+                data.frombytes(body)
+                values: List[Any] = list(data)
+            else:
+                offsets = array('q')
+                offsets.frombytes(body[:8 * (rows + 1)])
+                buffer = body[8 * (rows + 1):]
+                values = [buffer[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(rows)]
+
+            result[column['name']] = [None if nulls[i] else values[i] for i in range(rows)]
+    return result
+
+
+EXPORTERS: Dict[str, AbstractExporter] = {
+    'ndjson': NDJSONExporter(),
+    'csv': CSVExporter(),
+    'columnar': ColumnarExporter(),
+}
+
+
+def get_exporter(export_format: str) -> AbstractExporter:
+    """
+    Возвращает экспортер по названию формата.
+
+    Parameters:
+        export_format (str): Название формата ('ndjson', 'csv' или 'columnar').
+
+    Returns:
+        AbstractExporter: Экспортер для указанного формата.
+    """
+    try:
+        return EXPORTERS[export_format]
+    except KeyError:
+        raise ValueError(f"Неизвестный формат экспорта: {export_format}. "
+                         f"Доступные форматы: {', '.join(EXPORTERS)}.") from None
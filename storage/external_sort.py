@@ -0,0 +1,210 @@
+import heapq
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import deque
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from metrics.instrumentation import metrics
+
+# Память под буфер сортируемых записей по умолчанию, байты
+DEFAULT_MEMORY_BUDGET: int = 64 * 2 ** 20
+
+# Сколько серий сливается за один проход (столько файлов открыто одновременно)
+DEFAULT_FAN_IN: int = 64
+
+# Накладные расходы на запись в буфере сверх строки и ключа: пара (ключ, строка) и ссылка в списке, байты
+RECORD_OVERHEAD: int = 64
+
+# Буфер чтения одного файла серии при слиянии, байты
+RUN_READ_BUFFER: int = 64 * 1024
+
+
+class ExternalSorter:
+    """
+    Внешняя сортировка записей, которые не помещаются в память.
+
+    Записи сериализуются в JSON-строки и копятся в буфере. Когда буфер превышает бюджет памяти,
+    он сортируется и сбрасывается во временный файл — отсортированную серию. В конце серии
+    сливаются k-путевым слиянием (heapq.merge), при необходимости в несколько проходов, чтобы
+    одновременно было открыто не больше fan_in файлов. Если все записи уместились в буфер,
+    диск не используется. Сортировка устойчива: записи с равными ключами выходят в порядке добавления.
+
+    Ключ сортировки должен сохранять порядок после JSON-сериализации: кортежи из строк и чисел
+    без None (кортеж становится списком, а списки сравниваются так же).
+
+    Пример:
+        with ExternalSorter(key=lambda record: record['salary']) as sorter:
+            sorter.extend(records)
+            for record in sorter.sorted():
+                ...
+
+    Attributes:
+        key (Callable[[Any], Any]): Ключ сортировки записи.
+        memory_budget (int): Наибольший размер буфера записей в байтах.
+        directory (Optional[str]): Каталог временных файлов (по умолчанию системный).
+        fan_in (int): Сколько серий сливается за один проход.
+        records (int): Количество добавленных записей.
+        runs (int): Количество записанных серий (включая промежуточные серии слияния).
+        spilled_bytes (int): Объем записанных на диск серий в байтах.
+        merge_passes (int): Количество промежуточных проходов слияния.
+    """
+
+    def __init__(self, key: Callable[[Any], Any], memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 directory: Optional[str] = None, fan_in: int = DEFAULT_FAN_IN) -> None:
+        if fan_in < 2:
+            raise ValueError('Слияние возможно не меньше чем из двух серий.')
+        self.key = key
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.fan_in = fan_in
+        self.records = 0
+        self.runs = 0
+        self.spilled_bytes = 0
+        self.merge_passes = 0
+        self._buffer: List[Tuple[Any, str]] = []
+        self._buffer_bytes = 0
+        self._run_files: List[str] = []
+        self._temp_dir: Optional[str] = None
+
+    def __enter__(self) -> 'ExternalSorter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def add(self, record: Any) -> None:
+        """
+        Добавляет запись.
+
+        Parameters:
+            record (Any): Запись (любое значение, сериализуемое в JSON).
+        """
+        key = self.key(record)
+        line = json.dumps([key, record], ensure_ascii=False, separators=(',', ':'))
+        self._buffer.append((key, line))
+        key_bytes = sys.getsizeof(key)
+        if isinstance(key, tuple):
+            key_bytes += sum(sys.getsizeof(part) for part in key)
+        self._buffer_bytes += sys.getsizeof(line) + key_bytes + RECORD_OVERHEAD
+        self.records += 1
+        if self._buffer_bytes >= self.memory_budget:
+            self._spill()
+
+    def extend(self, records: Iterable[Any]) -> None:
+        """
+        Добавляет записи.
+
+        Parameters:
+            records (Iterable[Any]): Записи.
+        """
+        for record in records:
+            self.add(record)
+
+    def _new_run(self) -> str:
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix='vacancy-sort-', dir=self.directory)
+        self.runs += 1
+        return os.path.join(self._temp_dir, f'run-{self.runs:06d}.jsonl')
+
+    def _spill(self) -> None:
+        """
+        Сортирует буфер и записывает его в файл новой серии.
+        """
+        if not self._buffer:
+            return
+        with metrics.timer('external_sort.spill'):
+            self._buffer.sort(key=itemgetter(0))
+            filename = self._new_run()
+            with open(filename, 'w', encoding='utf-8') as file:
+                for _, line in self._buffer:
+                    file.write(line)
+                    file.write('\n')
+                self.spilled_bytes += file.tell()
+        metrics.increment('external_sort.runs')
+        self._run_files.append(filename)
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    @staticmethod
+    def _read_run(filename: str) -> Iterator[List[Any]]:
+        with open(filename, encoding='utf-8', buffering=RUN_READ_BUFFER) as file:
+            for line in file:
+                yield json.loads(line)
+
+    def _merge_runs(self, filenames: List[str]) -> Iterator[List[Any]]:
+        return heapq.merge(*(self._read_run(filename) for filename in filenames), key=itemgetter(0))
+
+    def sorted(self) -> Iterator[Any]:
+        """
+        Возвращает все добавленные записи в порядке ключа. Вызывается один раз, после добавления записей.
+
+        Returns:
+            Iterator[Any]: Записи в порядке ключа.
+        """
+        if not self._run_files:
+            # Все записи уместились в памяти. Буфер разворачивается и разбирается с конца,
+            # чтобы выданные записи сразу освобождали память
+            self._buffer.sort(key=itemgetter(0))
+            self._buffer.reverse()
+            buffer, self._buffer, self._buffer_bytes = self._buffer, [], 0
+            while buffer:
+                yield json.loads(buffer.pop()[1])[1]
+            return
+
+        self._spill()
+        # Промежуточные проходы: каждые fan_in соседних серий сливаются в одну, поэтому
+        # порядок серий (и устойчивость сортировки) сохраняется
+        while len(self._run_files) > self.fan_in:
+            with metrics.timer('external_sort.merge_pass'):
+                merged_runs = []
+                for start in range(0, len(self._run_files), self.fan_in):
+                    group = self._run_files[start:start + self.fan_in]
+                    if len(group) == 1:
+                        merged_runs.append(group[0])
+                        continue
+                    filename = self._new_run()
+                    with open(filename, 'w', encoding='utf-8') as file:
+                        for key, record in self._merge_runs(group):
+                            file.write(json.dumps([key, record], ensure_ascii=False, separators=(',', ':')))
+                            file.write('\n')
+                        self.spilled_bytes += file.tell()
+                    for merged in group:
+                        os.remove(merged)
+                    merged_runs.append(filename)
+                self._run_files = merged_runs
+            self.merge_passes += 1
+            metrics.increment('external_sort.merge_passes')
+
+        for _, record in self._merge_runs(self._run_files):
+            yield record
+
+    def close(self) -> None:
+        """
+        Удаляет временные файлы серий.
+        """
+        self._buffer = []
+        self._run_files = []
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+
+def unique_sorted(records: Iterable[Any], key: Callable[[Any], Any]) -> Iterator[Any]:
+    """
+    Убирает дубликаты из потока записей, упорядоченного по ключу key: из каждой группы записей
+    с равным ключом остается последняя. Памяти нужно на одну запись.
+
+    Parameters:
+        records (Iterable[Any]): Записи, упорядоченные так, что дубликаты идут подряд.
+        key (Callable[[Any], Any]): Ключ дубликатов.
+
+    Returns:
+        Iterator[Any]: Уникальные записи.
+    """
+    for _, group in groupby(records, key=key):
+        yield deque(group, maxlen=1)[0]
@@ -1,124 +1,193 @@
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Optional
 
-from dateutil import parser
+from api.platforms import PlatformSpec, get_platform
+from lazy_import import lazy_import
+from metrics.instrumentation import metrics
+from storage.dimensions import VacancyDimensions
+from storage.locking import atomic_write
+
+# dateutil нужен только для дат в нестандартном формате, поэтому импортируется при первом обращении
+parser = lazy_import('dateutil.parser')
+
+# Формат даты публикации в ответах Head Hunter, например 2023-11-15T13:37:34+0300
+HH_DATE_FORMAT: str = '%Y-%m-%dT%H:%M:%S%z'
+
+# Формат даты публикации в кратком формате вакансии
+SHORT_DATE_FORMAT: str = '%Y-%m-%d %H:%M:%S'
+
+# Курсы валют к рублю
+EXCHANGE_RATES: Dict[str, float] = {
+    'AZN': 52.25,
+    'BYR': 26.98,
+    'EUR': 97.16,
+    'GEL': 32.84,
+    'KGS': 0.99,
+    'KZT': 0.19,
+    'USD': 88.8,
+    'UZS': 0.0072,
+    'UAH': 2.44
+}
+
+
+def parse_hh_date(value: str) -> datetime:
+    """
+    Разбирает дату публикации Head Hunter. Стандартный формат разбирается через strptime,
+    остальные варианты — через dateutil.
+
+    Parameters:
+        value (str): Дата публикации.
+
+    Returns:
+        datetime: Дата публикации.
+    """
+    try:
+        return datetime.strptime(value, HH_DATE_FORMAT)
+    except ValueError:
+        return parser.parse(value)
+
+
+def format_iso_date(value: str) -> str:
+    """
+    Переводит дату ISO 8601 (2023-11-15T13:37:34+0300) в краткий формат (2023-11-15 13:37:34).
+    Дата в стандартном формате не разбирается, а собирается из срезов строки.
+
+    Parameters:
+        value (str): Дата публикации.
+
+    Returns:
+        str: Дата публикации в кратком формате.
+    """
+    if len(value) >= 19 and value[4] == '-' and value[7] == '-' and value[10] == 'T' \
+            and value[13] == ':' and value[16] == ':':
+        return value[:10] + ' ' + value[11:19]
+    return parse_hh_date(value).strftime(SHORT_DATE_FORMAT)
+
+
+def format_timestamp_date(value: int) -> str:
+    """
+    Переводит unix-время (UTC) в краткий формат даты.
+
+    Parameters:
+        value (int): Дата публикации в секундах.
+
+    Returns:
+        str: Дата публикации в кратком формате.
+    """
+    return datetime.fromtimestamp(value, timezone.utc).strftime(SHORT_DATE_FORMAT)
+
+
+DATE_FORMATTERS = {'iso': format_iso_date, 'timestamp': format_timestamp_date}
+
 
 class Converter:
-    def convert_vacancy_in_short_format(self, vacancy_data: Dict, api: Dict) -> Dict:
+    def __init__(self, dimensions: Optional[VacancyDimensions] = None) -> None:
+        """
+        Инициализирует конвертер.
+
+        Parameters:
+            dimensions (Optional[VacancyDimensions]): Таблицы измерений, в которые заносятся
+                работодатели, города и валюты вакансий.
+        """
+        self.dimensions = dimensions or VacancyDimensions()
+
+    def convert_vacancy_in_short_format(self, vacancy_data: Dict, api: Dict, start: int = 1) -> Dict:
         """
         Конвертирует данные вакансий в краткий формат для отображения.
 
         Parameters:
             vacancy_data (Dict): Данные вакансий от API.
             api (Dict): Информация об API, из которого получены данные.
+            start (int): Номер первой вакансии в ключах "vacancy N" (для следующих страниц выдачи).
 
         Returns:
             Dict: Словарь с адаптированными данными вакансий.
         """
-        if api.get('name') == 'Head Hunter':
-            return self._adapt_headhunter_vacancy(vacancy_data)
-        elif api.get('name') == 'Super Job':
-            return self._adapt_superjob_vacancy(vacancy_data)
+        spec = get_platform(api)
+        with metrics.timer('convert', platform=spec.slug):
+            return self._adapt_vacancies(vacancy_data, spec, start)
 
-    def _adapt_headhunter_vacancy(self, vacancy_data: Dict) -> Dict:
+    def _adapt_vacancies(self, vacancy_data: Dict, spec: PlatformSpec, start: int = 1) -> Dict:
         """
-        Адаптирует данные вакансий от Head Hunter в краткий формат.
+        Адаптирует данные вакансий площадки в краткий формат через скомпилированный экстрактор полей.
 
         Parameters:
-            vacancy_data (Dict): Данные вакансий от Head Hunter API.
+            vacancy_data (Dict): Данные вакансий от API.
+            spec (PlatformSpec): Описание площадки.
+            start (int): Номер первой вакансии в ключах "vacancy N".
 
         Returns:
             Dict: Словарь с адаптированными данными вакансий.
         """
+        extract = spec.extract
+        format_date = DATE_FORMATTERS[spec.date_kind]
+        convertible = spec.convertible_currencies
+        employers = self.dimensions.employers
+        cities = self.dimensions.cities
+        rub_id = self.dimensions.currencies.intern('RUB')
+        items = vacancy_data.get(spec.items_key) or []
+
         result_vacancies = {}
-        for id, data in enumerate(vacancy_data['items'], start=1):
-            try:
-                # Обработка данных о зарплате
-                currency: str = 'RUB'
-                active_salary: float = 0
-                if data['salary']['to'] is not None:
-                    active_salary = data['salary']['to']
-                elif data['salary']['from'] is not None:
-                    active_salary = data['salary']['from']
-
-                # Конвертация зарплаты в рубли, если в другой валюте
-                if data['salary']['currency'] in ['AZN', 'BYR', 'EUR', 'GEL', 'KGS', 'KZT', 'USD', 'UAH', 'UZS']:
-                    salary_value: float = active_salary
-                    salary_in_rubles: int = self.convert_to_rubles(salary_value, data['salary']['currency'])
-                else:
-                    salary_in_rubles = active_salary
-
-                # Формирование данных вакансии
-                date: str = parser.parse(data['published_at']).strftime("%Y-%m-%d %H:%M:%S")
-                vacancy: Dict = {
-                    "title": data['name'],
-                    "url": data['alternate_url'],
-                    "currency": currency,
-                    "salary": salary_in_rubles,
-                    "description": data['snippet']['requirement'],
-                    "city": data['area']['name'],
-                    "published_at": date,
-                    "employer": {
-                        "name": data['employer']['name'],
-                        "url": data['employer']['alternate_url']
-                    }
-                }
-            except Exception:
-                continue
+        for id, data in enumerate(items, start=start):
+            (vacancy_id, title, url, salary_from, salary_to, currency, description,
+             city, published_at, employer_name, employer_url) = extract(data)
 
-            result_vacancies.update({f"vacancy {id}": vacancy})
+            # Вакансии без обязательных полей отбрасываются
+            if None in (title, url, currency, city, published_at, employer_name, employer_url):
+                continue
 
-        return result_vacancies
+            # Обработка данных о зарплате: для сортировки и показа выбирается одно значение
+            # по исходным данным площадки, как и раньше
+            if salary_to is not None:
+                active_salary = salary_to
+            elif salary_from is not None:
+                active_salary = salary_from
+            else:
+                active_salary = 0
 
-    def _adapt_superjob_vacancy(self, vacancy_data: Dict) -> Dict:
-        """
-        Адаптирует данные вакансий от Super Job в краткий формат.
+            # Обе границы вилки сохраняются отдельно (Super Job передает отсутствующую границу нулем)
+            salary_from = salary_from or None
+            salary_to = salary_to or None
 
-        Parameters:
-            vacancy_data (Dict): Данные вакансий от Super Job API.
+            # Конвертация зарплаты в рубли, если в другой валюте
+            currency = currency.upper()
+            if currency in convertible:
+                active_salary = self.convert_to_rubles(active_salary, currency)
+                if salary_from is not None:
+                    salary_from = self.convert_to_rubles(salary_from, currency)
+                if salary_to is not None:
+                    salary_to = self.convert_to_rubles(salary_to, currency)
 
-        Returns:
-            Dict: Словарь с адаптированными данными вакансий.
-        """
-        result_vacancies = {}
-        for id, data in enumerate(vacancy_data['objects'], start=1):
-            try:
-                # Обработка данных о зарплате
-                currency: str = 'RUB'
-                date: str = datetime.utcfromtimestamp(data['date_published']).strftime('%Y-%m-%d %H:%M:%S')
-                active_salary: float = 0
-                if data['payment_to'] is not None:
-                    active_salary = data['payment_to']
-                elif data['payment_from'] is not None:
-                    active_salary = data['payment_from']
-
-                # Конвертация зарплаты в рубли, если в другой валюте
-                if data['currency'].upper() in ['UAH', 'UZS']:
-                    salary_value: float = active_salary
-                    salary_in_rubles: int = self.convert_to_rubles(salary_value, data['currency'].upper())
-                else:
-                    salary_in_rubles = active_salary
-
-                # Формирование данных вакансии
-                vacancy: Dict = {
-                    "title": data['profession'],
-                    "url": data['link'],
-                    "currency": currency,
-                    "salary": salary_in_rubles,
-                    "description": data['candidat'],
-                    "city": data['town']['title'],
-                    "published_at": date,
-                    "employer": {
-                        "name": data['client']['title'],
-                        "url": data['client']['link']
-                    }
-                }
-            except Exception:
-                continue
+            # Работодатель и город заносятся в таблицы измерений, строки берутся из таблиц
+            employer_id = employers.intern((employer_name, employer_url))
+            employer_name, employer_url = employers.values[employer_id]
+            city_id = cities.intern(city)
 
-            result_vacancies.update({f"vacancy {id}": vacancy})
+            # Формирование данных вакансии
+            result_vacancies[f"vacancy {id}"] = {
+                "id": None if vacancy_id is None else str(vacancy_id),
+                "platform": spec.slug,
+                "title": title,
+                "url": url,
+                "currency": 'RUB',
+                "salary": active_salary,
+                "salary_from": salary_from,
+                "salary_to": salary_to,
+                "description": description,
+                "city": cities.values[city_id],
+                "published_at": format_date(published_at),
+                "employer": {
+                    "name": employer_name,
+                    "url": employer_url
+                },
+                "employer_id": employer_id,
+                "city_id": city_id,
+                "currency_id": rub_id
+            }
 
+        metrics.increment('convert.records_in', len(items), platform=spec.slug)
+        metrics.increment('convert.records_dropped', len(items) - len(result_vacancies), platform=spec.slug)
         return result_vacancies
 
     def convert_to_rubles(self, amount: float, currency: str) -> Optional[int]:
@@ -132,20 +201,8 @@ class Converter:
         Returns:
             Optional[int]: Сумма в рублях или None, если валюта не поддерживается.
         """
-        exchange_rates: Dict[str, float] = {
-            'AZN': 52.25,
-            'BYR': 26.98,
-            'EUR': 97.16,
-            'GEL': 32.84,
-            'KGS': 0.99,
-            'KZT': 0.19,
-            'USD': 88.8,
-            'UZS': 0.0072,
-            'UAH': 2.44
-        }
-
-        if currency in exchange_rates:
-            rate: float = exchange_rates[currency]
+        if currency in EXCHANGE_RATES:
+            rate: float = EXCHANGE_RATES[currency]
             rubles: int = amount * rate
 
             return int(rubles)
@@ -153,26 +210,28 @@ class Converter:
             return None
 
 class JSONHandler:
-    def save_to_file(self, data, filename: str) -> None:
+    def __init__(self, dimensions: Optional[VacancyDimensions] = None) -> None:
         """
-        Сохраняет данные в файл в формате JSON.
+        Инициализирует обработчик JSON-файлов.
 
         Parameters:
-            data: Данные для сохранения.
-            filename (str): Имя файла.
+            dimensions (Optional[VacancyDimensions]): Таблицы измерений, с которыми сохраняются
+                и загружаются вакансии.
         """
-        with open(filename, 'w') as file:
-            json.dump(data, file, ensure_ascii=False, indent=2)
+        self.dimensions = dimensions or VacancyDimensions()
 
-    def clear_json_file(self, filename: str) -> None:
+    def save_to_file(self, data, filename: str) -> None:
         """
-        Очищает содержимое JSON-файла.
+        Сохраняет данные в файл в формате JSON. Файл заменяется атомарно, поэтому
+        параллельные читатели не видят его наполовину записанным.
 
         Parameters:
+            data: Данные для сохранения.
             filename (str): Имя файла.
         """
-        with open(filename, 'w') as file:
-            file.truncate(0)
+        with metrics.timer('storage.save'), atomic_write(filename) as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+            metrics.increment('storage.bytes_written', file.tell())
 
     def load_from_file(self, filename: str) -> Dict:
         """
@@ -184,5 +243,39 @@ class JSONHandler:
         Returns:
             Dict: Данные, загруженные из файла.
         """
-        with open(filename, 'r') as file:
+        with metrics.timer('storage.load'), open(filename, 'r', encoding='utf-8') as file:
             return json.load(file)
+
+    def save_vacancies(self, vacancies: Dict[str, Dict], filename: str) -> None:
+        """
+        Сохраняет вакансии в файл: вакансии хранят только идентификаторы работодателя, города
+        и валюты, а таблицы измерений записываются в тот же файл рядом с ними. В файл попадают
+        только значения, на которые ссылаются сохраняемые вакансии: идентификаторы переводятся
+        в собственные таблицы файла, а не берутся из таблиц всего сеанса.
+
+        Parameters:
+            vacancies (Dict[str, Dict]): Вакансии в кратком формате.
+            filename (str): Имя файла.
+        """
+        saved = VacancyDimensions()
+        records = {key: saved.encode(saved.intern_vacancy(dict(vacancy))) for key, vacancy in vacancies.items()}
+        self.save_to_file({'dimensions': saved.to_dict(), 'vacancies': records}, filename)
+
+    def load_vacancies(self, filename: str) -> Dict[str, Dict]:
+        """
+        Загружает вакансии, сохраненные save_vacancies, и восстанавливает краткий формат.
+        Идентификаторы измерений из файла переводятся в идентификаторы текущих таблиц.
+        Файлы без таблиц измерений (прежний формат) читаются как есть.
+
+        Parameters:
+            filename (str): Имя файла.
+
+        Returns:
+            Dict[str, Dict]: Вакансии в кратком формате.
+        """
+        data = self.load_from_file(filename)
+        if 'dimensions' not in data:
+            return {key: self.dimensions.intern_vacancy(vacancy) for key, vacancy in data.items()}
+
+        source = VacancyDimensions.from_dict(data['dimensions'])
+        return {key: self.dimensions.decode(record, source) for key, record in data['vacancies'].items()}
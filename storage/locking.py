@@ -0,0 +1,147 @@
+import glob
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+from metrics.instrumentation import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_RESULTS_DIR: str = 'results'
+
+# Сколько последних файлов результатов сеансов хранится в каталоге results
+SESSION_FILES_KEEP: int = 20
+
+# Файлы результатов моложе этого возраста (секунды) не удаляются: их сеансы могут быть еще открыты
+SESSION_FILES_MIN_AGE: float = 3600.0
+
+
+def _new_file_mode() -> int:
+    """
+    Возвращает права, с которыми open() создал бы новый файл (0o666 с учетом umask).
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', encoding: str = 'utf-8') -> Iterator[IO]:
+    """
+    Открывает временный файл рядом с path и после успешной записи атомарно заменяет им path.
+    Читатели видят либо прежнее содержимое файла, либо новое целиком и не ждут писателя.
+    Новый файл получает права прежнего файла, а если его не было — обычные права нового файла
+    (mkstemp создает временный файл с правами 0600).
+
+    Parameters:
+        path (str): Имя файла.
+        mode (str): Режим открытия временного файла ('w' или 'wb').
+        encoding (str): Кодировка для текстового режима.
+
+    Returns:
+        Iterator[IO]: Временный файл для записи.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, mode, **({} if 'b' in mode else {'encoding': encoding})) as file:
+            yield file
+        try:
+            file_mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            file_mode = _new_file_mode()
+        os.chmod(temp_path, file_mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Берет межпроцессную исключительную блокировку файла path на время блока with.
+    Блокировка ставится на отдельный файл <path>.lock, поэтому не мешает атомарной замене path.
+    Нужна только писателям, которые читают и изменяют общий файл; читатели ее не берут.
+
+    Parameters:
+        path (str): Имя защищаемого файла.
+    """
+    lock_path = f'{path}.lock'
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    started = time.perf_counter()
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        metrics.observe('storage.lock_wait', time.perf_counter() - started)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def session_filename(directory: str = DEFAULT_RESULTS_DIR, prefix: str = 'session') -> str:
+    """
+    Возвращает уникальное имя файла результатов для сеанса приложения, чтобы параллельные
+    сеансы не перезаписывали результаты друг друга.
+
+    Parameters:
+        directory (str): Каталог файлов результатов.
+        prefix (str): Префикс имени файла.
+
+    Returns:
+        str: Имя файла.
+    """
+    return os.path.join(directory, f'{prefix}-{os.getpid()}-{uuid.uuid4().hex[:8]}.json')
+
+
+def prune_session_files(directory: str = DEFAULT_RESULTS_DIR, prefix: str = 'session',
+                        keep: int = SESSION_FILES_KEEP, min_age: float = SESSION_FILES_MIN_AGE) -> int:
+    """
+    Удаляет старые файлы результатов сеансов (см. session_filename): остаются keep последних
+    файлов и все файлы моложе min_age секунд, чтобы не удалить результаты еще открытых сеансов.
+
+    Parameters:
+        directory (str): Каталог файлов результатов.
+        prefix (str): Префикс имени файла.
+        keep (int): Сколько последних файлов оставить.
+        min_age (float): Возраст в секундах, начиная с которого файл можно удалить.
+
+    Returns:
+        int: Количество удаленных файлов.
+    """
+    files = []
+    for filename in glob.glob(os.path.join(directory, f'{prefix}-*.json')):
+        try:
+            files.append((os.path.getmtime(filename), filename))
+        except OSError:
+            continue
+    files.sort(reverse=True)
+
+    removed = 0
+    expired = time.time() - min_age
+    for modified, filename in files[keep:]:
+        if modified > expired:
+            continue
+        try:
+            os.remove(filename)
+            removed += 1
+        except OSError:
+            continue
+    metrics.increment('storage.session_files_pruned', removed)
+    return removed
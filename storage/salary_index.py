@@ -0,0 +1,210 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from metrics.instrumentation import metrics
+
+# Вилка зарплаты в рублях: (от, до); неизвестная граница — None
+SalaryBounds = Tuple[Optional[int], Optional[int]]
+
+# Верхняя граница вилки "от X" без указанного максимума
+UNBOUNDED: float = float('inf')
+
+
+def salary_bounds(vacancy: Dict) -> SalaryBounds:
+    """
+    Возвращает вилку зарплаты вакансии. У вакансий прежнего формата сохранено только одно
+    значение зарплаты, поэтому вилка вырождается в точку.
+
+    Parameters:
+        vacancy (Dict): Вакансия в кратком формате.
+
+    Returns:
+        SalaryBounds: Нижняя и верхняя граница вилки.
+    """
+    if 'salary_from' in vacancy or 'salary_to' in vacancy:
+        return vacancy.get('salary_from') or None, vacancy.get('salary_to') or None
+    salary = vacancy.get('salary') or None
+    return salary, salary
+
+
+class SalaryIntervalIndex:
+    """
+    Индекс вилок зарплат на отсортированных массивах концов интервалов.
+
+    Вилка "от X" считается интервалом [X, +inf), вилка "до Y" — интервалом [0, Y].
+    Интервал [lo, hi] пересекается с запросом [low, high], если lo <= high и hi >= low.
+    Вакансии с lo <= high образуют префикс массива нижних концов, вакансии с hi >= low —
+    суффикс массива верхних концов, поэтому оба множества находятся двоичным поиском,
+    а проверяется только меньшее из них. Количество пересечений считается без перебора:
+    все вакансии минус те, что целиком выше запроса, и те, что целиком ниже.
+
+    Массивы перестраиваются лениво — при первом запросе после изменений.
+
+    Attributes:
+        bounds (Dict[str, SalaryBounds]): Ключ вакансии -> вилка зарплаты.
+    """
+
+    def __init__(self, bounds: Optional[Dict[str, SalaryBounds]] = None) -> None:
+        self.bounds: Dict[str, SalaryBounds] = {}
+        self._lo_values: List[float] = []
+        self._lo_keys: List[str] = []
+        self._lo_others: List[float] = []
+        self._hi_values: List[float] = []
+        self._hi_keys: List[str] = []
+        self._hi_others: List[float] = []
+        self._from_values: List[int] = []
+        self._from_keys: List[str] = []
+        self._dirty = False
+        for key, (salary_from, salary_to) in (bounds or {}).items():
+            self.add(key, salary_from, salary_to)
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Dict[str, Dict]) -> 'SalaryIntervalIndex':
+        """
+        Строит индекс по вакансиям в кратком формате.
+
+        Parameters:
+            vacancies (Dict[str, Dict]): Ключ вакансии -> вакансия.
+
+        Returns:
+            SalaryIntervalIndex: Индекс вилок.
+        """
+        index = cls()
+        for key, vacancy in vacancies.items():
+            index.add(key, *salary_bounds(vacancy))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.bounds)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.bounds
+
+    def add(self, key: str, salary_from: Optional[int], salary_to: Optional[int]) -> None:
+        """
+        Добавляет или заменяет вилку вакансии. Вакансии без зарплаты в индекс не попадают.
+
+        Parameters:
+            key (str): Ключ вакансии.
+            salary_from (Optional[int]): Нижняя граница вилки.
+            salary_to (Optional[int]): Верхняя граница вилки.
+        """
+        if salary_from is None and salary_to is None:
+            self.remove(key)
+            return
+        if salary_from is not None and salary_to is not None and salary_from > salary_to:
+            salary_from, salary_to = salary_to, salary_from
+        self.bounds[key] = (salary_from, salary_to)
+        self._dirty = True
+
+    def remove(self, key: str) -> None:
+        """
+        Удаляет вилку вакансии из индекса.
+
+        Parameters:
+            key (str): Ключ вакансии.
+        """
+        if self.bounds.pop(key, None) is not None:
+            self._dirty = True
+
+    def _build(self) -> None:
+        """
+        Пересобирает отсортированные массивы концов интервалов.
+        """
+        with metrics.timer('salary_index.build'):
+            intervals = [(salary_from or 0, UNBOUNDED if salary_to is None else salary_to, key)
+                         for key, (salary_from, salary_to) in self.bounds.items()]
+            lows = sorted(intervals)
+            highs = sorted(intervals, key=lambda interval: interval[1])
+            guaranteed = sorted((salary_from, key) for key, (salary_from, _) in self.bounds.items()
+                                if salary_from is not None)
+        # Рядом с каждым массивом концов хранится второй конец интервала, чтобы кандидаты
+        # проверялись без обращений к словарю
+        self._lo_values = [lo for lo, _, _ in lows]
+        self._lo_others = [hi for _, hi, _ in lows]
+        self._lo_keys = [key for _, _, key in lows]
+        self._hi_values = [hi for _, hi, _ in highs]
+        self._hi_others = [lo for lo, _, _ in highs]
+        self._hi_keys = [key for _, _, key in highs]
+        self._from_values = [value for value, _ in guaranteed]
+        self._from_keys = [key for _, key in guaranteed]
+        self._dirty = False
+
+    def _ensure_built(self) -> None:
+        if self._dirty:
+            self._build()
+
+    def count_overlapping(self, low: Optional[int] = None, high: Optional[int] = None) -> int:
+        """
+        Возвращает количество вилок, пересекающихся с диапазоном [low, high], за O(log n).
+
+        Parameters:
+            low (Optional[int]): Нижняя граница диапазона (None — без ограничения).
+            high (Optional[int]): Верхняя граница диапазона (None — без ограничения).
+
+        Returns:
+            int: Количество вилок.
+        """
+        self._ensure_built()
+        if low is not None and high is not None and low > high:
+            return 0
+        above = 0 if high is None else len(self._lo_values) - bisect_right(self._lo_values, high)
+        below = 0 if low is None else bisect_left(self._hi_values, low)
+        return len(self.bounds) - above - below
+
+    def overlapping(self, low: Optional[int] = None, high: Optional[int] = None) -> List[str]:
+        """
+        Возвращает ключи вакансий, чья вилка пересекается с диапазоном [low, high].
+
+        Parameters:
+            low (Optional[int]): Нижняя граница диапазона (None — без ограничения).
+            high (Optional[int]): Верхняя граница диапазона (None — без ограничения).
+
+        Returns:
+            List[str]: Ключи вакансий.
+        """
+        self._ensure_built()
+        if low is not None and high is not None and low > high:
+            return []
+
+        # Префикс по нижним концам: lo <= high; суффикс по верхним концам: hi >= low
+        lo_end = len(self._lo_keys) if high is None else bisect_right(self._lo_values, high)
+        hi_start = 0 if low is None else bisect_left(self._hi_values, low)
+        metrics.increment('salary_index.queries', kind='overlap')
+
+        if lo_end <= len(self._hi_keys) - hi_start:
+            candidates = lo_end
+            if low is None:
+                result = self._lo_keys[:lo_end]
+            else:
+                result = [key for key, hi in zip(self._lo_keys[:lo_end], self._lo_others[:lo_end]) if hi >= low]
+        else:
+            candidates = len(self._hi_keys) - hi_start
+            if high is None:
+                result = self._hi_keys[hi_start:]
+            else:
+                result = [key for key, lo in zip(self._hi_keys[hi_start:], self._hi_others[hi_start:]) if lo <= high]
+        metrics.increment('salary_index.candidates', candidates)
+        return result
+
+    def guaranteed(self, minimum: int) -> List[str]:
+        """
+        Возвращает ключи вакансий, где гарантировано не меньше minimum: нижняя граница вилки
+        указана и не меньше minimum. Вилки "до Y" ничего не гарантируют.
+
+        Parameters:
+            minimum (int): Минимальная гарантированная зарплата.
+
+        Returns:
+            List[str]: Ключи вакансий по возрастанию нижней границы.
+        """
+        self._ensure_built()
+        metrics.increment('salary_index.queries', kind='guaranteed')
+        return self._from_keys[bisect_left(self._from_values, minimum):]
+
+    def to_dict(self) -> Dict[str, List[Optional[int]]]:
+        return {key: list(bounds) for key, bounds in self.bounds.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Iterable[Optional[int]]]) -> 'SalaryIntervalIndex':
+        return cls({key: tuple(bounds) for key, bounds in data.items()})
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics.instrumentation import metrics
+from storage.exporters import flatten_vacancy
+from storage.locking import atomic_write, file_lock
+
+DEFAULT_SNAPSHOT_DIR: str = 'snapshots'
+
+# Поля зарплаты: значение для сортировки и обе границы вилки
+SALARY_FIELDS: Tuple[str, ...] = ('salary', 'salary_from', 'salary_to')
+
+# Поля вакансии, от которых зависит ее хэш содержимого
+HASHED_FIELDS: Tuple[str, ...] = ('title', 'url', 'currency', 'salary', 'salary_from', 'salary_to', 'description',
+                                  'city', 'published_at')
+
+# Те же поля без зарплаты: по ним видно, изменилось ли что-то кроме зарплаты
+DETAIL_FIELDS: Tuple[str, ...] = tuple(field for field in HASHED_FIELDS if field not in SALARY_FIELDS)
+
+# Поля хэша в снимках, записанных до появления хэша без зарплаты
+LEGACY_HASHED_FIELDS: Tuple[str, ...] = ('title', 'url', 'currency', 'salary', 'description', 'city', 'published_at')
+
+# Виды изменений в ленте
+CHANGE_KINDS: Tuple[str, ...] = ('new', 'removed', 'salary_changed', 'updated')
+
+# Снимок: идентичность вакансии -> [хэш содержимого, зарплата, хэш содержимого без зарплаты,
+# нижняя граница вилки, верхняя граница вилки] (в снимках прежних форматов есть только первые два или три элемента)
+Snapshot = Dict[str, List[Any]]
+
+
+def vacancy_identity(vacancy: Dict) -> str:
+    """
+    Возвращает устойчивый между запусками идентификатор вакансии: площадка и id,
+    а для вакансий без id — ссылка на вакансию.
+
+    Parameters:
+        vacancy (Dict): Вакансия в кратком формате.
+
+    Returns:
+        str: Идентичность вакансии.
+    """
+    if vacancy.get('id') is not None:
+        return f"{vacancy.get('platform')}:{vacancy['id']}"
+    return f"url:{vacancy.get('url')}"
+
+
+def content_hash(vacancy: Dict, fields: Tuple[str, ...] = HASHED_FIELDS) -> str:
+    """
+    Вычисляет хэш содержимого вакансии. Идентификаторы измерений и полное описание не учитываются:
+    первые зависят от сеанса, второе подгружается отдельно.
+
+    Parameters:
+        vacancy (Dict): Вакансия в кратком формате.
+        fields (Tuple[str, ...]): Поля вакансии, входящие в хэш (кроме работодателя, который входит всегда).
+
+    Returns:
+        str: Хэш содержимого (hex).
+    """
+    employer: Dict = vacancy.get('employer') or {}
+    values = [vacancy.get(field) for field in fields] + [employer.get('name'), employer.get('url')]
+    return hashlib.blake2b(json.dumps(values, ensure_ascii=False).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def diff_snapshot(previous: Snapshot, vacancies: Dict[str, Dict]) -> Tuple[Snapshot, List[Dict[str, Any]]]:
+    """
+    За один проход по текущим вакансиям строит новый снимок и список изменений относительно прошлого.
+    Изменение зарплаты или любой границы вилки дает salary_changed, изменение остальных полей — updated;
+    если изменилось и то, и другое, в ленту попадают оба изменения.
+
+    Parameters:
+        previous (Snapshot): Прошлый снимок.
+        vacancies (Dict[str, Dict]): Текущие вакансии в кратком формате.
+
+    Returns:
+        Tuple[Snapshot, List[Dict[str, Any]]]: Новый снимок и изменения (новые, измененные, затем снятые).
+    """
+    remaining = dict(previous)
+    snapshot: Snapshot = {}
+    changes: List[Dict[str, Any]] = []
+
+    for key, vacancy in vacancies.items():
+        identity = vacancy_identity(vacancy)
+        digest = content_hash(vacancy)
+        detail_digest = content_hash(vacancy, DETAIL_FIELDS)
+        salary, salary_from, salary_to = (vacancy.get(field) for field in SALARY_FIELDS)
+        snapshot[identity] = [digest, salary, detail_digest, salary_from, salary_to]
+
+        old = remaining.pop(identity, None)
+        if old is None:
+            changes.append({'op': 'new', 'key': identity, 'vacancy': flatten_vacancy(key, vacancy)})
+        elif len(old) < 5 or old[0] != digest:
+            # В снимках прежних форматов границ вилки нет, и сравнивается только зарплата
+            old_from, old_to = old[3:5] if len(old) >= 5 else (salary_from, salary_to)
+            salary_changed = old[1] != salary or old_from != salary_from or old_to != salary_to
+            if len(old) > 2:
+                details_changed = old[2] != detail_digest
+            else:
+                # Снимок без хэша без зарплаты не позволяет отличить изменение одной зарплаты
+                # от изменения нескольких полей, поэтому для него остается только salary_changed
+                details_changed = not salary_changed and old[0] != content_hash(vacancy, LEGACY_HASHED_FIELDS)
+            if salary_changed:
+                changes.append({'op': 'salary_changed', 'key': identity, 'old_salary': old[1], 'salary': salary,
+                                'old_salary_from': old_from, 'salary_from': salary_from,
+                                'old_salary_to': old_to, 'salary_to': salary_to})
+            if details_changed:
+                changes.append({'op': 'updated', 'key': identity, 'vacancy': flatten_vacancy(key, vacancy)})
+
+    changes.extend({'op': 'removed', 'key': identity} for identity in remaining)
+    return snapshot, changes
+
+
+class SnapshotStore:
+    """
+    Хранит снимки результатов поиска и ленты изменений между запусками.
+
+    Для каждого поиска (площадка и параметры запроса) в каталоге лежат два файла:
+    <имя>.snapshot.json — хэши содержимого и зарплаты вакансий последнего запуска,
+    <имя>.deltas.ndjson — лента изменений, в которую каждый запуск дописывает только отличия.
+
+    Attributes:
+        directory (str): Каталог снимков.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SNAPSHOT_DIR) -> None:
+        self.directory = directory
+
+    @staticmethod
+    def snapshot_name(platform: str, params: Dict[str, Any]) -> str:
+        """
+        Возвращает имя снимка для поиска.
+
+        Parameters:
+            platform (str): Короткое имя площадки.
+            params (Dict[str, Any]): Параметры запроса к API.
+
+        Returns:
+            str: Имя снимка.
+        """
+        digest = hashlib.blake2b(json.dumps(params, sort_keys=True, ensure_ascii=False).encode('utf-8'),
+                                 digest_size=6).hexdigest()
+        return f'{platform}-{digest}'
+
+    def snapshot_path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.snapshot.json')
+
+    def deltas_path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.deltas.ndjson')
+
+    def load(self, name: str) -> Snapshot:
+        """
+        Загружает снимок или возвращает пустой, если поиск еще не выполнялся.
+
+        Parameters:
+            name (str): Имя снимка.
+
+        Returns:
+            Snapshot: Снимок.
+        """
+        try:
+            with open(self.snapshot_path(name), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, name: str, snapshot: Snapshot) -> None:
+        """
+        Атомарно заменяет снимок.
+
+        Parameters:
+            name (str): Имя снимка.
+            snapshot (Snapshot): Снимок.
+        """
+        with atomic_write(self.snapshot_path(name)) as file:
+            json.dump(snapshot, file, ensure_ascii=False, separators=(',', ':'))
+
+    def compare(self, name: str, vacancies: Dict[str, Dict]) -> List[Dict[str, Any]]:
+        """
+        Сравнивает вакансии с прошлым снимком, не изменяя ни снимок, ни ленту (например, для неполного
+        результата, который не должен попасть в снимок).
+
+        Parameters:
+            name (str): Имя снимка.
+            vacancies (Dict[str, Dict]): Текущие вакансии в кратком формате.
+
+        Returns:
+            List[Dict[str, Any]]: Изменения относительно прошлого снимка.
+        """
+        with metrics.timer('snapshot.diff'):
+            return diff_snapshot(self.load(name), vacancies)[1]
+
+    def record(self, name: str, vacancies: Dict[str, Dict]) -> List[Dict[str, Any]]:
+        """
+        Сравнивает вакансии с прошлым снимком, дописывает изменения в ленту и сохраняет новый снимок.
+        Параллельные запуски одного поиска выполняют это по очереди под блокировкой снимка.
+
+        Parameters:
+            name (str): Имя снимка.
+            vacancies (Dict[str, Dict]): Текущие вакансии в кратком формате.
+
+        Returns:
+            List[Dict[str, Any]]: Изменения этого запуска.
+        """
+        with file_lock(self.snapshot_path(name)):
+            with metrics.timer('snapshot.diff'):
+                snapshot, changes = diff_snapshot(self.load(name), vacancies)
+
+            if changes:
+                # Лента пишется одним вызовом write, чтобы строки не перемешались с чужими
+                run_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                lines = ''.join(json.dumps({'run_at': run_at, **change}, ensure_ascii=False) + '\n'
+                                for change in changes)
+                with open(self.deltas_path(name), 'a', encoding='utf-8') as file:
+                    file.write(lines)
+            self.save(name, snapshot)
+
+        counts = Counter(change['op'] for change in changes)
+        for kind in CHANGE_KINDS:
+            metrics.increment('snapshot.changes', counts[kind], kind=kind)
+        return changes
+
+    def read_deltas(self, name: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Читает ленту изменений поиска.
+
+        Parameters:
+            name (str): Имя снимка.
+            since (Optional[str]): Вернуть только изменения запусков позже этого времени (ISO 8601, UTC).
+
+        Returns:
+            List[Dict[str, Any]]: Изменения в порядке записи.
+        """
+        try:
+            with open(self.deltas_path(name), 'r', encoding='utf-8') as file:
+                changes = [json.loads(line) for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
+        return [change for change in changes if since is None or change['run_at'] > since]
@@ -0,0 +1,15 @@
+from typing import Dict
+
+# Тексты сообщений встроены в модуль, чтобы не читать их с диска при запуске приложения.
+TEXT_MESSAGES: Dict[str, str] = {
+    'greetings': "Приветствую, ты находишься в программе \"Поиск вакансий\"!",
+    'platform_selection': "Выберете цифру соответствено той на какой площадке \nвы хотите найти вакансии:",
+    'keyword_selection': "Хотите ли вы искать вакансии по ключевому слову?",
+    'keyword_write': "Введите ключевое слово (По этому слову мы отстортируем вакансии):",
+    'sort_selection': "Выберете цифру соответствено той, какую сортировку \nвы хотите получить:",
+    'top_selection': "Сколько вакансий показывать на одной странице? (от 2 до 100)",
+    'num_view_vacancy': "Введите номер интересующей вас вакансии\n(> — следующая страница, < — предыдущая, "
+                        "= — сравнить страницу, =1-30 — сравнить выбранные):",
+    'menu_selection': "Выберите опцию:",
+    'num_second_view_vacancy': "Введите номер вакансии c которой ты хочешь сравнить эту вакансию\n(> — следующая страница, < — предыдущая):",
+}